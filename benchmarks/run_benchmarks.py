@@ -0,0 +1,236 @@
+'''
+Micro- and macro-benchmarks for the board, piece and game hot paths
+
+Every benchmark reports the best time per operation over several repeats.
+Results are written as JSON so runs can be compared between commits, and
+--compare fails (exit status 1) when anything got slower than allowed.
+
+Usage:
+    python benchmarks/run_benchmarks.py --output bench.json
+    python benchmarks/run_benchmarks.py --compare bench.json --threshold 0.25
+'''
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from unittest import mock
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.board import Board
+from tetris.game import Game
+from tetris.tetromino import Tetromino
+from tetris.sim import simulate, make_policy
+
+
+class FakeWindow:
+    """Curses window stand-in that accepts and discards all drawing"""
+
+    def getmaxyx(self):
+        return 40, 80
+
+    def addstr(self, y, x, text, attributes=0):
+        pass
+
+    def clear(self):
+        pass
+
+    def noutrefresh(self):
+        pass
+
+
+def time_calls(func, number, repeat=5):
+    '''
+    Best time per call of func() in nanoseconds
+
+    Args:
+        func (callable): Called with no arguments
+        number (int): Calls per timed repeat
+        repeat (int): Number of repeats (the fastest one counts)
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e9
+
+
+def time_prepared(make_input, func, number, repeat=5):
+    '''
+    Like time_calls, for operations that consume their input (e.g. clearing
+    lines): the inputs are built before the clock starts
+
+    Args:
+        make_input (callable): Builds one fresh input
+        func (callable): Called as func(input)
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        inputs = [make_input() for _ in range(number)]
+        start = time.perf_counter()
+        for item in inputs:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best / number * 1e9
+
+
+def filled_board(complete_rows=0):
+    '''
+    A board with a ragged stack in the bottom 12 rows and the given number
+    of complete rows at the very bottom
+    '''
+    board = Board()
+    for y in range(board.height - 12, board.height):
+        board.grid[y] = [0 if (x * 7 + y * 3) % 5 == 0 else 1 for x in range(board.width)]
+    for y in range(board.height - complete_rows, board.height):
+        board.grid[y] = [1] * board.width
+    board.get_complete_lines()  # Rebuild the row masks outside the timed code
+    return board
+
+
+def bench_has_collision_empty():
+    board = Board()
+    piece = Tetromino('T')
+    piece.y = 10
+    return time_calls(lambda: board.has_collision(piece), 100000)
+
+
+def bench_has_collision_filled():
+    board = filled_board()
+    piece = Tetromino('T')
+    piece.y = 6
+    return time_calls(lambda: board.has_collision(piece), 100000)
+
+
+def make_bench_clear_lines(complete_rows):
+    def bench():
+        return time_prepared(lambda: filled_board(complete_rows), Board.clear_lines, 2000)
+    return bench
+
+
+def bench_tetromino_blocks():
+    piece = Tetromino('L')
+    return time_calls(lambda: piece.blocks, 100000)
+
+
+def bench_tetromino_rotate():
+    piece = Tetromino('L')
+    return time_calls(piece.rotate_clockwise, 100000)
+
+
+def bench_game_hard_drop():
+    def make_game():
+        game = Game()
+        game.board = filled_board()
+        return game
+    return time_prepared(make_game, Game.hard_drop, 2000)
+
+
+def bench_game_render():
+    game = Game()
+    game.stdscr = FakeWindow()
+    moves = [game.move_left, game.move_right]
+    state = {'turn': 0}
+
+    def render_after_move():
+        # Alternate left/right so every frame has something to redraw
+        state['turn'] ^= 1
+        moves[state['turn']]()
+        game.render()
+
+    with mock.patch('tetris.renderer.curses.doupdate'):
+        return time_calls(render_after_move, 5000)
+
+
+def bench_headless_game():
+    seeds = iter(range(10 ** 9))
+    return time_calls(lambda: simulate(next(seeds), policy=make_policy('greedy')), 10, repeat=3)
+
+
+# name -> benchmark function (takes no arguments, returns ns per operation)
+BENCHMARKS = {
+    'board.has_collision[empty]': bench_has_collision_empty,
+    'board.has_collision[filled]': bench_has_collision_filled,
+    'board.clear_lines[0]': make_bench_clear_lines(0),
+    'board.clear_lines[1]': make_bench_clear_lines(1),
+    'board.clear_lines[2]': make_bench_clear_lines(2),
+    'board.clear_lines[3]': make_bench_clear_lines(3),
+    'board.clear_lines[4]': make_bench_clear_lines(4),
+    'tetromino.blocks': bench_tetromino_blocks,
+    'tetromino.rotate_clockwise': bench_tetromino_rotate,
+    'game.hard_drop': bench_game_hard_drop,
+    'game.render[curses]': bench_game_render,
+    'sim.greedy_game': bench_headless_game,
+}
+
+
+def run(selected=None):
+    ''' Run the benchmarks (all, or those whose name contains a filter) '''
+    results = {}
+    for name, bench in BENCHMARKS.items():
+        if selected and not any(part in name for part in selected):
+            continue
+        ns_per_op = bench()
+        results[name] = {'ns_per_op': ns_per_op, 'ops_per_sec': 1e9 / ns_per_op}
+        print(f"{name:<32} {ns_per_op:>14,.0f} ns/op {1e9 / ns_per_op:>14,.1f} ops/s")
+    return results
+
+
+def compare(results, baseline, threshold):
+    '''
+    Find benchmarks that got slower than the baseline by more than threshold
+
+    Returns:
+        list: (name, baseline ns, current ns, relative change) for each regression
+    '''
+    regressions = []
+    for name, current in results.items():
+        if name not in baseline:
+            continue
+        before = baseline[name]['ns_per_op']
+        change = current['ns_per_op'] / before - 1
+        if change > threshold:
+            regressions.append((name, before, current['ns_per_op'], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Tetris benchmarks")
+    parser.add_argument('filters', nargs='*', help="only run benchmarks whose name contains one of these")
+    parser.add_argument('--output', help="write results as JSON to this file")
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON results of an earlier run")
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help="allowed slowdown vs the baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    results = run(args.filters)
+
+    if args.output:
+        report = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'timestamp': time.time(),
+            'results': results,
+        }
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2, sort_keys=True)
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after, change in regressions:
+            print(f"REGRESSION {name}: {before:,.0f} -> {after:,.0f} ns/op (+{change:.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,5 +5,8 @@ setup(
     version="0.2.0",  # Update from 0.1.0 to 0.2.0
     packages=["tetris"],
     package_dir={"": "src"},
-    python_requires=">=3.6",
+    python_requires=">=3.7",
+    extras_require={
+        "batch": ["numpy"],  # Vectorized multi-board engine (tetris.batch)
+    },
 )
@@ -1,14 +1,76 @@
+import argparse
 import curses
+import random
+import sys
 from .game import Game
+from .highscores import DEFAULT_PATH, HighScoreStore, format_scores, score_from_game
+from .profiling import LatencyProbe, Profiler
+from .replay import ReplayRecorder
+from .rng import SplitMix64
 
-def main(stdscr):
+def main(stdscr, seed=None, record_path=None, profile=False, profile_path=None, scores=None,
+         latency=False, latency_path=None):
     """Main entry point for the Tetris game with curses"""
 
     # Create and run the game with the curses window
-    game = Game(stdscr)
+    game = Game(stdscr, rng=SplitMix64(seed))
+    if record_path:
+        game.recorder = ReplayRecorder(seed)
+    if profile or profile_path:
+        Profiler().attach(game)
+    if latency or latency_path:
+        LatencyProbe().attach(game)
     game.run()
+    if record_path:
+        game.recorder.save(record_path)
+    if profile_path:
+        game.profiler.dump(profile_path)
+    if latency_path:
+        game.latency.dump(latency_path)
+    if scores is not None and game.game_over:
+        # Only finished games count: quitting mid-game records nothing
+        scores.submit(score_from_game(game, seed))
+
+def parse_args(argv=None):
+    """Parse the command line options"""
+    parser = argparse.ArgumentParser(prog="python -m tetris", description="Terminal Tetris")
+    parser.add_argument('--seed', type=int, default=None, help="seed for the piece sequence")
+    parser.add_argument('--record', metavar='FILE', default=None,
+                        help="save a replay of the game (see python -m tetris.replay)")
+    parser.add_argument('--profile', action='store_true',
+                        help="show p50/p99 timings of input, update, render and locking")
+    parser.add_argument('--profile-out', metavar='FILE', default=None,
+                        help="write a timing report to FILE when the game ends")
+    parser.add_argument('--latency', action='store_true',
+                        help="show key-to-screen latency and dropped/coalesced keys")
+    parser.add_argument('--latency-out', metavar='FILE', default=None,
+                        help="write a key-to-screen latency report to FILE when the game ends")
+    parser.add_argument('--scores', metavar='FILE', default=DEFAULT_PATH,
+                        help="high-score file (default: %(default)s)")
+    parser.add_argument('--no-scores', action='store_true', help="don't record the score")
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
+    args = parse_args()
+    seed = args.seed
+    scores = None
+    if not args.no_scores:
+        try:
+            scores = HighScoreStore(args.scores)
+        except (ValueError, OSError) as e:
+            # A foreign or unreadable score file shouldn't stop the game
+            print(f"Not recording scores: {e}", file=sys.stderr)
+    if seed is None and (args.record or scores is not None):
+        # A replay needs a known seed to reproduce the pieces
+        seed = random.SystemRandom().randrange(2 ** 32)
+
     # curses.wrapper handles curses initialization and cleanup automatically
     # Call the main function and pass the stdscr window
-    curses.wrapper(main)
\ No newline at end of file
+    try:
+        curses.wrapper(main, seed, args.record, args.profile, args.profile_out, scores,
+                       args.latency, args.latency_out)
+    finally:
+        if scores is not None:
+            scores.close()
+    if scores is not None:
+        print(format_scores(scores.top(5)), end="")
@@ -0,0 +1,248 @@
+'''
+Vectorized engine that steps many games in lockstep
+
+All boards live in one (N, BOARD_HEIGHT, BOARD_WIDTH) uint8 array of cell
+colours, and every per-game value (piece, rotation, position, score, ...)
+is an array of length N. Moves, gravity, collision checks, locking and line
+clears are applied to all lanes at once with NumPy operations.
+
+Each lane follows exactly the rules of a headless tetris.sim.Simulation
+with the same seed: same piece sequence, same tick-based gravity and the
+same scoring as Game._calculate_score / Game._update_level.
+
+NumPy is an optional dependency (pip install terminal-tetris[batch]).
+'''
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the batch engine
+    np = None
+
+from .config import BOARD_HEIGHT, BOARD_WIDTH, COLORS, GRAVITY_FRAMES, TETROMINOS
+from .game import ACTIONS
+from .rng import SplitMix64
+from .tetromino import ROTATIONS
+from .timing import frames_per_row
+
+# Piece indexes follow the order of config.TETROMINOS ('I', 'O', 'T', ...)
+PIECE_NAMES = tuple(TETROMINOS)
+
+# Action codes used by BatchEngine.step: 0 = no input, then one per action
+NO_ACTION = 0
+ACTION_CODES = {action: code for code, action in enumerate(ACTIONS, start=1)}
+
+# Classic NES line scores indexed by lines cleared (mirrors Game._calculate_score)
+LINE_SCORES = (0, 40, 100, 300, 1200)
+
+# Highest level with its own speed - every level above falls at the same rate
+_MAX_SPEED_LEVEL = len(GRAVITY_FRAMES)
+
+
+def encode_actions(actions):
+    '''
+    Convert a list of action names (or None) into an array of action codes
+
+    Args:
+        actions (list): One entry per lane, a name from game.ACTIONS or None
+
+    Returns:
+        numpy.ndarray: int8 array of action codes
+    '''
+    return np.array([ACTION_CODES[a] if a is not None else NO_ACTION for a in actions],
+                    dtype=np.int8)
+
+
+class BatchEngine:
+    '''
+    N independent Tetris games advanced together one tick per step()
+
+    Attributes:
+        boards (ndarray): (N, H, W) uint8 cell colours (0 = empty)
+        piece, rotation, x, y (ndarray): Current piece of every lane
+        next_piece (ndarray): Index of the next piece of every lane
+        score, lines, level, pieces (ndarray): Per-lane game statistics
+        game_over (ndarray): bool flag per lane; finished lanes stop changing
+        tick (int): Number of ticks stepped so far
+    '''
+
+    def __init__(self, seeds):
+        '''
+        Start one game per seed
+
+        Args:
+            seeds (list): Seeds for the piece generators (one lane per seed)
+
+        Raises:
+            ImportError: if NumPy is not installed
+        '''
+        if np is None:
+            raise ImportError("The batch engine needs NumPy: pip install numpy")
+
+        self.seeds = list(seeds)
+        n = len(self.seeds)
+        self.size = n
+        self.tick = 0
+
+        # Piece tables: block offsets per (piece, rotation) and piece colours
+        self._offsets = np.array(
+            [[state.offsets for state in ROTATIONS[name]] for name in PIECE_NAMES],
+            dtype=np.int64)  # (7, 4, 4, 2) as (dx, dy)
+        self._colors = np.array([COLORS[name] for name in PIECE_NAMES], dtype=np.uint8)
+        self._line_scores = np.array(LINE_SCORES, dtype=np.int64)
+        self._gravity_ticks = np.array(
+            [0] + [frames_per_row(level) for level in range(1, _MAX_SPEED_LEVEL + 1)],
+            dtype=np.int64)
+
+        self.boards = np.zeros((n, BOARD_HEIGHT, BOARD_WIDTH), dtype=np.uint8)
+        self.rotation = np.zeros(n, dtype=np.int64)
+        self.x = np.full(n, BOARD_WIDTH // 2 - 2, dtype=np.int64)
+        self.y = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.lines = np.zeros(n, dtype=np.int64)
+        self.level = np.ones(n, dtype=np.int64)
+        self.pieces = np.zeros(n, dtype=np.int64)
+        self.game_over = np.zeros(n, dtype=bool)
+        self._ticks_since_drop = np.zeros(n, dtype=np.int64)
+
+        # Draw the first two pieces exactly like Game.__init__ does
+        self._rngs = [SplitMix64(seed) for seed in self.seeds]
+        self.piece = np.array([self._draw(lane) for lane in range(n)], dtype=np.int64)
+        self.next_piece = np.array([self._draw(lane) for lane in range(n)], dtype=np.int64)
+
+    def _draw(self, lane):
+        ''' Draw the next piece index from a lane's RNG (same call as Game) '''
+        return PIECE_NAMES.index(self._rngs[lane].choice(PIECE_NAMES))
+
+    def _collides(self, lanes, piece, rotation, x, y):
+        '''
+        Vectorized Board.has_collision for a subset of lanes
+
+        Args:
+            lanes (ndarray): Lane indexes to check
+            piece, rotation, x, y (ndarray): Piece placement for each of those lanes
+
+        Returns:
+            ndarray: bool per lane, True if the placement collides
+        '''
+        offsets = self._offsets[piece, rotation]  # (n, 4, 2)
+        block_x = x[:, None] + offsets[..., 0]
+        block_y = y[:, None] + offsets[..., 1]
+
+        outside = (block_x < 0) | (block_x >= BOARD_WIDTH) | (block_y >= BOARD_HEIGHT)
+        on_board = ~outside & (block_y >= 0)
+        cells = self.boards[lanes[:, None],
+                            np.clip(block_y, 0, BOARD_HEIGHT - 1),
+                            np.clip(block_x, 0, BOARD_WIDTH - 1)]
+        return (outside | (on_board & (cells != 0))).any(axis=1)
+
+    def _try_move(self, lanes, drotation, dx, dy):
+        '''
+        Move the current piece of each lane, undoing moves that collide
+
+        Returns:
+            ndarray: bool per lane, True where the move was blocked
+        '''
+        rotation = (self.rotation[lanes] + drotation) % 4
+        x = self.x[lanes] + dx
+        y = self.y[lanes] + dy
+        blocked = self._collides(lanes, self.piece[lanes], rotation, x, y)
+
+        moved = lanes[~blocked]
+        self.rotation[moved] = rotation[~blocked]
+        self.x[moved] = x[~blocked]
+        self.y[moved] = y[~blocked]
+        return blocked
+
+    def _drop(self, lanes):
+        ''' Game.drop for every lane: move down one row or lock '''
+        if lanes.size:
+            blocked = self._try_move(lanes, 0, 0, 1)
+            self._lock(lanes[blocked])
+
+    def _hard_drop(self, lanes):
+        ''' Game.hard_drop for every lane: fall until blocked, then lock '''
+        falling = lanes
+        while falling.size:
+            blocked = self._try_move(falling, 0, 0, 1)
+            falling = falling[~blocked]
+        self._lock(lanes)
+
+    def _lock(self, lanes):
+        ''' Game._lock_piece for every lane: lock, clear, score and spawn '''
+        if not lanes.size:
+            return
+
+        # Paint the pieces onto their boards (blocks above the top are dropped)
+        piece = self.piece[lanes]
+        offsets = self._offsets[piece, self.rotation[lanes]]
+        block_x = self.x[lanes][:, None] + offsets[..., 0]
+        block_y = self.y[lanes][:, None] + offsets[..., 1]
+        lane_index = np.broadcast_to(lanes[:, None], block_x.shape)
+        visible = block_y >= 0
+        self.boards[lane_index[visible], block_y[visible], block_x[visible]] = \
+            np.broadcast_to(self._colors[piece][:, None], block_x.shape)[visible]
+
+        # Clear complete rows: a stable sort moves full rows to the top,
+        # keeping the order of the rest, then the moved rows are emptied
+        full = (self.boards[lanes] != 0).all(axis=2)  # (n, H)
+        cleared = full.sum(axis=1)
+        clearing = cleared > 0
+        if clearing.any():
+            clear_lanes = lanes[clearing]
+            order = np.argsort(~full[clearing], axis=1, kind='stable')
+            boards = np.take_along_axis(self.boards[clear_lanes], order[:, :, None], axis=1)
+            boards[np.arange(BOARD_HEIGHT)[None, :] < cleared[clearing][:, None]] = 0
+            self.boards[clear_lanes] = boards
+
+        # Score at the current level, then level up (Game._update_level)
+        self.score[lanes] += self._line_scores[cleared] * self.level[lanes]
+        self.lines[lanes] += cleared
+        self.level[lanes] = self.lines[lanes] // 10 + 1
+        self.pieces[lanes] += 1
+
+        # Next piece becomes current, draw a new next piece
+        self.piece[lanes] = self.next_piece[lanes]
+        for lane in lanes.tolist():
+            self.next_piece[lane] = self._draw(lane)
+        self.rotation[lanes] = 0
+        self.x[lanes] = BOARD_WIDTH // 2 - 2
+        self.y[lanes] = 0
+
+        # Game over when the new piece collides immediately
+        self.game_over[lanes] |= self._collides(
+            lanes, self.piece[lanes], self.rotation[lanes], self.x[lanes], self.y[lanes])
+
+    def step(self, actions=None):
+        '''
+        Advance every running lane by one tick: apply its action, then gravity
+
+        Args:
+            actions: Array (or list) of action codes, one per lane, or None
+                     for no input anywhere. Use encode_actions() for names.
+
+        Returns:
+            ndarray: bool per lane, True while that game is still running
+        '''
+        if actions is not None:
+            actions = np.asarray(actions)
+            running = ~self.game_over
+            for code, drotation, dx in ((ACTION_CODES['left'], 0, -1),
+                                        (ACTION_CODES['right'], 0, 1),
+                                        (ACTION_CODES['rotate'], 1, 0)):
+                lanes = np.flatnonzero(running & (actions == code))
+                if lanes.size:
+                    self._try_move(lanes, drotation, dx, 0)
+            self._drop(np.flatnonzero(running & (actions == ACTION_CODES['drop'])))
+            hard = np.flatnonzero(running & (actions == ACTION_CODES['hard_drop']))
+            if hard.size:
+                self._hard_drop(hard)
+
+        # Gravity, counted in ticks exactly like Game.tick
+        self.tick += 1
+        running = ~self.game_over
+        self._ticks_since_drop[running] += 1
+        gravity = self._gravity_ticks[np.minimum(self.level, _MAX_SPEED_LEVEL)]
+        due = np.flatnonzero(running & (self._ticks_since_drop >= gravity))
+        self._drop(due)
+        self._ticks_since_drop[due] = 0
+
+        return ~self.game_over
@@ -1,94 +1,487 @@
+from collections import namedtuple
+from itertools import chain
+
 from .config import BOARD_HEIGHT, BOARD_WIDTH
+from .rng import SplitMix64
+from .tetromino import UNIQUE_ROTATIONS
+
+# A resting position for a piece and how many lines locking it there clears
+Placement = namedtuple('Placement', ['rotation', 'x', 'y', 'lines_cleared'])
+
+# Immutable, hashable copy of a board: row bitmasks, one byte per cell
+# colour and the board's Zobrist hash
+BoardState = namedtuple('BoardState', ['rows', 'colors', 'zobrist'])
+
+
+def _make_zobrist_keys(seed=0x7E7215):
+    '''
+    One random 64-bit key per board cell, indexed as keys[y][x]
+
+    The fixed seed makes hashes identical across processes and runs, so
+    they can be shared between workers or stored.
+    '''
+    rng = SplitMix64(seed)
+    return tuple(tuple(rng.getrandbits(64) for _ in range(BOARD_WIDTH))
+                 for _ in range(BOARD_HEIGHT))
+
+
+def _make_row_hashes(keys):
+    '''
+    Zobrist hash of every possible row, indexed as table[y][mask]
+
+    Bit x of mask set means cell (x, y) is filled, so hashing a row costs
+    one lookup instead of one XOR per filled cell.
+    '''
+    tables = []
+    for row_keys in keys:
+        table = [0]
+        for key in row_keys:
+            # Masks with bit x set follow the ones without it
+            table += [value ^ key for value in table]
+        tables.append(tuple(table))
+    return tuple(tables)
+
+
+ZOBRIST_KEYS = _make_zobrist_keys()
+_zobrist_rows = None  # _make_row_hashes(ZOBRIST_KEYS), built by _row_hashes()
+
+
+def _row_hashes():
+    '''
+    The per-row hash tables, built on first use
+
+    They hold about 1 MB of ints, so processes that never read a board's
+    hash (the interactive game, most simulations) don't build them.
+    '''
+    global _zobrist_rows
+    if _zobrist_rows is None:
+        _zobrist_rows = _make_row_hashes(ZOBRIST_KEYS)
+    return _zobrist_rows
+
+
+class _Row(list):
+    '''
+    One row of the board's colour layer.
+
+    Behaves exactly like a plain list, but writing a cell through it
+    (e.g. board.grid[5][5] = 1) marks the owning board's bitmasks as stale
+    so they get rebuilt before the next collision or line check.
+    '''
+    __slots__ = ('_board',)
+
+    def __init__(self, board, cells):
+        list.__init__(self, cells)
+        self._board = board
+
+    def __setitem__(self, index, value):
+        list.__setitem__(self, index, value)
+        self._board._stale = True
+
+
+class _Grid(list):
+    '''
+    The list of rows behind Board.grid.
+
+    Whole rows assigned from outside (e.g. board.grid[17] = [1] * 10) are
+    wrapped in a _Row so that later cell writes are tracked as well.
+    '''
+    __slots__ = ('_board',)
+
+    def __init__(self, board, rows):
+        list.__init__(self, (_Row(board, row) for row in rows))
+        self._board = board
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            value = [_Row(self._board, row) for row in value]
+        else:
+            value = _Row(self._board, value)
+        list.__setitem__(self, index, value)
+        self._board._stale = True
+
 
 class Board:
     '''
     Represents the Tetris game board - a grid where tetrominos fall and stack.
-    
+
     The board is responsible for:
     - Tracking fixed blocks on the playing field
     - Collision detection for moving tetrominos
     - Line clearing when rows are complete
     - Locking tetrominos in place when they land
-    
+
+    Internally every row is stored twice: as an int bitmask in `rows`
+    (bit x set = column x occupied) which collision and line checks use,
+    and as a list of colours in `grid` which rendering uses.
+
     Attributes:
         width (int): Number of columns (usually 10)
         height (int): Number of rows (usually 20)
-        grid (list): 2D list representing occupied cells
+        grid (list): 2D list with the colour of every cell (0 = empty)
+        rows (list): One occupancy bitmask per row, top row first
+        full_row (int): Bitmask of a completely filled row
+        heights (list): Height of the stack in every column (0 = empty column)
+        zobrist (int): Zobrist hash of the occupied cells (colours ignored)
+        stats: Optional GameStats told about every line clear
     '''
 
     def __init__(self):
         ''' Initialize an empty game board '''
         self.width = BOARD_WIDTH
         self.height = BOARD_HEIGHT
-        self.grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
+        self.full_row = (1 << self.width) - 1
+        self.rows = [0] * self.height
+        self.heights = [0] * self.width
+        # 0 is the empty board's hash; clear_lines sets None to rehash lazily
+        self._zobrist = 0
+        self.stats = None
+        self._grid = _Grid(self, ([0] * self.width for _ in range(self.height)))
+        self._stale = False
+        # Rows changed by locks since the last clear_lines (empty when top > bottom)
+        self._changed_top = self.height
+        self._changed_bottom = -1
+
+    @property
+    def grid(self):
+        ''' 2D list of cell colours, indexed as grid[y][x] '''
+        return self._grid
+
+    @grid.setter
+    def grid(self, rows):
+        self._grid = _Grid(self, rows)
+        self._stale = True
+
+    @property
+    def zobrist(self):
+        '''
+        Zobrist hash of the occupied cells (colours ignored): the XOR of
+        ZOBRIST_KEYS[y][x] over all filled cells
+
+        Locks update it incrementally. A line clear moves most of the stack,
+        so it is only rebuilt, one table lookup per row, when read. Cells
+        written through grid are picked up here as well.
+        '''
+        if self._stale:
+            self._sync_rows()
+        if self._zobrist is None:
+            self._zobrist = self._hash_rows(0, self.height)
+        return self._zobrist
+
+    def _sync_rows(self):
+        ''' Rebuild the row bitmasks after the grid was edited directly '''
+        rows = []
+        for row in self._grid:
+            mask = 0
+            for x, cell in enumerate(row):
+                if cell:
+                    mask |= 1 << x
+            rows.append(mask)
+        self.rows = rows
+        self._stale = False
+        self._update_heights()
+        self._zobrist = None  # Rehashed when next read
+        # Any row may have been edited, so the next clear checks them all
+        self._changed_top = 0
+        self._changed_bottom = self.height - 1
+
+    def _update_heights(self):
+        ''' Recompute the column heights from the row bitmasks '''
+        heights = [0] * self.width
+        # Walk down from the top; the first filled cell of a column sets its height
+        remaining = self.full_row
+        for y, row in enumerate(self.rows):
+            found = row & remaining
+            if found:
+                remaining &= ~found
+                for x in range(self.width):
+                    if found >> x & 1:
+                        heights[x] = self.height - y
+                if not remaining:
+                    break
+        self.heights = heights
+
+    def snapshot(self):
+        '''
+        Take a compact immutable copy of the board
+
+        Returns:
+            BoardState: Row bitmasks as a tuple and the colours as bytes
+                        (row by row, so every cell colour must be 0-255)
+        '''
+        if self._stale:
+            self._sync_rows()
+        return BoardState(tuple(self.rows), bytes(chain.from_iterable(self._grid)), self.zobrist)
+
+    def restore(self, state):
+        '''
+        Put the board back into a state returned by snapshot()
+
+        Args:
+            state (BoardState): The snapshot to restore
+        '''
+        width = self.width
+        colors = state.colors
+        self.rows = list(state.rows)
+        self._grid = _Grid(self, (colors[start:start + width]
+                                  for start in range(0, len(colors), width)))
+        self._stale = False
+        self._update_heights()
+        self._zobrist = state.zobrist
+        # Only a board saved with complete rows has anything left to clear
+        if self.full_row in self.rows:
+            self._changed_top = 0
+            self._changed_bottom = self.height - 1
+        else:
+            self._changed_top = self.height
+            self._changed_bottom = -1
+
+    def _hash_rows(self, top, bottom):
+        '''
+        XOR of the Zobrist keys of all filled cells in rows top..bottom-1
+
+        Args:
+            top (int): First row to include
+            bottom (int): Row after the last one to include
+        '''
+        value = 0
+        for table, mask in zip(_row_hashes()[top:bottom], self.rows[top:bottom]):
+            value ^= table[mask]
+        return value
 
     def has_collision(self, tetromino):
         '''
         Check if given tetromino collides with board boundaries or placed blocks
-        
+
         Args:
             tetromino (Tetromino): The tetromino to check for collisions
-        
+
         Returns:
             bool: True if collision detected, False otherwise
         '''
-        for block_x, block_y in tetromino.blocks:
-            # Check if block is outside left/right boundaries
-            if block_x < 0 or block_x >= self.width:
+        if self._stale:
+            self._sync_rows()
+
+        rows = self.rows
+        piece_x = tetromino.x
+        piece_y = tetromino.y
+        for dy, mask in tetromino.row_masks:
+            # Move the piece row mask to the piece's column
+            if piece_x >= 0:
+                mask <<= piece_x
+            elif mask & ((1 << -piece_x) - 1):
+                return True  # A block sticks out past the left wall
+            else:
+                mask >>= -piece_x
+            # Any bit beyond the last column means the right wall was hit
+            if mask > self.full_row:
                 return True
+            y = piece_y + dy
             # Check if block is below the bottom
-            if block_y >= self.height:
+            if y >= self.height:
                 return True
-            # check if block overlaps with already placed blocks
-            if block_y >= 0 and self.grid[block_y][block_x]:
+            # Check if the row overlaps with already placed blocks
+            if y >= 0 and rows[y] & mask:
                 return True
 
         return False
-    
+
 
     def lock_tetromino(self, tetromino):
         '''
         Lock a tetromino onto the board, making it part of the fixed blocks
-        
+
         Args:
             tetromino (Tetromino): The tetromino to lock in place
-            
+
         Raises:
             ValueError: if the tetromino is in an invalid position
         '''
         if self.has_collision(tetromino):
             raise ValueError("Cannot lock tetromino - position would cause collision")
-        
-        # Place each block of the tetromino on the board
+
+        # Set the piece's bits in every row it covers
+        piece_x = tetromino.x
+        for dy, mask in tetromino.row_masks:
+            y = tetromino.y + dy
+            if 0 <= y < self.height:
+                self.rows[y] |= mask << piece_x if piece_x >= 0 else mask >> -piece_x
+                # Remember the rows to check on the next clear_lines
+                if y < self._changed_top:
+                    self._changed_top = y
+                if y > self._changed_bottom:
+                    self._changed_bottom = y
+
+        # Paint the colour layer (bypassing _Row so the masks stay valid),
+        # raise the column heights under the piece and hash in its cells
+        heights = self.heights
+        zobrist = self._zobrist
         for block_x, block_y in tetromino.blocks:
-            if 0 <= block_y < self.height and 0 <= block_x < self.width:
-                self.grid[block_y][block_x] = tetromino.color
+            if 0 <= block_y < self.height:
+                list.__setitem__(self._grid[block_y], block_x, tetromino.color)
+                if self.height - block_y > heights[block_x]:
+                    heights[block_x] = self.height - block_y
+                if zobrist is not None:
+                    zobrist ^= ZOBRIST_KEYS[block_y][block_x]
+        self._zobrist = zobrist
+
+    def drop_distance(self, tetromino):
+        '''
+        How many rows the tetromino can fall before it lands
+
+        Uses the column heights and the piece's per-column bottom profile,
+        so it costs one step per piece column instead of one collision
+        check per row. Only when the piece is below the top of some column
+        (tucked under an overhang) does it fall back to stepping down.
+
+        Args:
+            tetromino (Tetromino): The piece to drop (not modified)
+
+        Returns:
+            int: Rows the piece can move down (0 if it is already resting)
+        '''
+        if self._stale:
+            self._sync_rows()
+        state = tetromino.rotations[tetromino.rotation]
+        return self._drop_distance(state, tetromino.x, tetromino.y)
+
+    def _drop_distance(self, state, piece_x, piece_y):
+        ''' drop_distance for a rotation state at a given position '''
+        heights = self.heights
+        floor = self.height - 1
+        distance = self.height
+        for dx, bottom in state.bottoms:
+            x = piece_x + dx
+            if not 0 <= x < self.width:
+                distance = -1  # Off the board: let the slow path decide
+                break
+            # Free rows between the lowest block and the top of the stack
+            room = floor - heights[x] - (piece_y + bottom)
+            if room < distance:
+                distance = room
+
+        if distance >= 0:
+            return distance
+
+        # Below the top of a column: step down one row at a time
+        shifted = [(dy, mask << piece_x if piece_x >= 0 else mask >> -piece_x)
+                   for dy, mask in state.row_masks]
+        distance = 0
+        while not self._masks_collide(shifted, piece_y + distance + 1):
+            distance += 1
+        return distance
+
 
+    def get_placements(self, tetromino):
+        '''
+        Find every distinct position where the tetromino can come to rest by
+        rotating and shifting it at its current height, then dropping it
+
+        Rotations that only repeat an earlier shape (O, and the second
+        half of I, S and Z) are skipped, so no two placements fill the
+        same cells. The tetromino itself is not modified.
+
+        Args:
+            tetromino (Tetromino): The piece to place (its y is the start height)
+
+        Returns:
+            list: Placement(rotation, x, y, lines_cleared) tuples
+        '''
+        if self._stale:
+            self._sync_rows()
+
+        rows = self.rows
+        full_row = self.full_row
+        start_y = tetromino.y
+        placements = []
+
+        for rotation in UNIQUE_ROTATIONS[tetromino.shape_name]:
+            state = tetromino.rotations[rotation]
+            # Only columns where the whole piece stays between the walls
+            for x in range(-state.min_dx, self.width - state.max_dx):
+                shifted = [(dy, mask << x if x >= 0 else mask >> -x)
+                           for dy, mask in state.row_masks]
+
+                if self._masks_collide(shifted, start_y):
+                    continue  # Can't even rotate/shift into this column
+                y = start_y + self._drop_distance(state, x, start_y)
+
+                lines = 0
+                for dy, mask in shifted:
+                    if 0 <= y + dy and (rows[y + dy] | mask) == full_row:
+                        lines += 1
+                placements.append(Placement(rotation, x, y, lines))
+
+        return placements
+
+    def _masks_collide(self, shifted, y):
+        '''
+        Check already shifted piece row masks against the board at height y
+
+        Args:
+            shifted (list): (dy, mask) pairs already moved to the piece column
+            y (int): Row of the piece's top-left corner
+
+        Returns:
+            bool: True if any row hits the floor or placed blocks
+        '''
+        rows = self.rows
+        for dy, mask in shifted:
+            row_y = y + dy
+            if row_y >= self.height:
+                return True
+            if row_y >= 0 and rows[row_y] & mask:
+                return True
+        return False
 
     def get_complete_lines(self):
         """Find all rows that completely filled with blocks"""
-        complete_lines = []
-        for y in range(self.height):
-            # Check if every cell in this row is filled out (not 0)
-            if all(cell != 0 for cell in self.grid[y]):
-                complete_lines.append(y)
-        return complete_lines
-    
+        if self._stale:
+            self._sync_rows()
+
+        # A row is complete when its mask equals the full-row constant
+        full_row = self.full_row
+        return [y for y, row in enumerate(self.rows) if row == full_row]
+
     def clear_lines(self):
-        """ Clear all complete lines and make blocks above fall down """
-        complete_lines = self.get_complete_lines()
+        """
+        Clear all complete lines and make blocks above fall down
+
+        Only the rows changed by locks since the previous call can have
+        become complete, so just those (at most 4 after a single lock) are
+        checked. The rows above the lowest cleared line are then compacted
+        in one pass.
+        """
+        if self._stale:
+            self._sync_rows()
+
+        rows = self.rows
+        full_row = self.full_row
+        complete_lines = [y for y in range(self._changed_top, self._changed_bottom + 1)
+                          if rows[y] == full_row]
+        self._changed_top = self.height
+        self._changed_bottom = -1
 
         if not complete_lines:
             return 0
-        
-        # Sort from top to bottom for proper clearing
-        complete_lines.sort()
 
-        # Remove each complete line and shift everything down
+        # Stack the runs of rows between cleared lines under one new empty
+        # row per cleared line; rows below the lowest cleared line stay put
+        count = len(complete_lines)
+        if self.stats is not None:
+            self.stats.lines_cleared(count)
+        grid = self._grid
+        new_rows = [0] * count
+        new_grid_rows = [_Row(self, [0] * self.width) for _ in range(count)]
+        start = 0
         for line_y in complete_lines:
-            # Remove the complete line
-            self.grid.pop(line_y)
-            # Add a new empty line at the top
-            self.grid.insert(0, [0] * self.width)
+            new_rows += rows[start:line_y]
+            new_grid_rows += grid[start:line_y]
+            start = line_y + 1
+
+        bottom = complete_lines[-1]
+        rows[:bottom + 1] = new_rows
+        list.__setitem__(grid, slice(0, bottom + 1), new_grid_rows)
+        self._zobrist = None  # Rehashed when next read
+        self._update_heights()
 
-        return len(complete_lines)
\ No newline at end of file
+        return count
@@ -69,3 +69,27 @@ COLORS = {
     'Z': 31, #Red
 }
 
+
+# Timing core - the game advances in fixed logical frames, like the NES
+FRAMES_PER_SECOND = 60
+
+# Frames per row of gravity for each level (level 1 = index 0), from the NES
+# NTSC table for levels 0-29. Levels past the end keep the last entry:
+# one row per frame, 60 rows per second
+GRAVITY_FRAMES = (
+    48, 43, 38, 33, 28, 23, 18, 13, 8, 6,
+    5, 5, 5, 4, 4, 4, 3, 3, 3, 2,
+    2, 2, 2, 2, 2, 2, 2, 2, 2, 1,
+)
+
+# Delayed auto shift: a held left/right key moves the piece once, then after
+# DAS_FRAMES it repeats every ARR_FRAMES (NES values: 16 and 6)
+DAS_FRAMES = 16
+ARR_FRAMES = 6
+
+# Terminals report no key releases, only a stream of autorepeat presses.
+# A key counts as released once its repeats stop for KEY_RELEASE_FRAMES
+# (must stay below ARR_FRAMES so two quick taps never add an extra shift).
+# Events further apart are separate taps, so the terminal's own autorepeat
+# delay makes its first repeat move like a tap
+KEY_RELEASE_FRAMES = 5
@@ -0,0 +1,274 @@
+'''
+Reinforcement-learning environment around the headless game
+
+TetrisEnv follows the classic Gym interface: reset(seed) returns an
+observation, and step(action) returns (observation, reward, done, info).
+Curses is never touched. Two action spaces are available:
+
+    'keys'       one key press (or nothing) per tick, followed by gravity,
+                 with exactly the timing of tetris.sim.Simulation
+    'placement'  one whole piece per step: the action picks a rotation and
+                 the leftmost column, and the piece is hard dropped there.
+                 Only that column at the piece's height is checked, not a
+                 path of moves to it, so the piece may pass over columns
+                 that a real shift would bump into
+
+The observation is a (height, width) memoryview of bytes: 0 = empty,
+1 = locked block, 2 = falling piece. It views a buffer that is updated in
+place from the board's row bitmasks (only the rows that changed are
+rewritten), so no lists are built per step. np.asarray(obs) wraps it
+without copying. Copy it if you need to keep an old frame.
+
+VectorEnv steps many environments per call. All their observations share
+one contiguous (num_envs, height, width) buffer.
+'''
+from .config import BOARD_HEIGHT, BOARD_WIDTH
+from .game import ACTIONS
+from .sim import Simulation
+
+# Action spaces: keys = index into KEYPRESS_ACTIONS (0 = no input);
+# placement = rotation * BOARD_WIDTH + leftmost column
+KEYPRESS_ACTIONS = (None,) + ACTIONS
+PLACEMENT_ACTIONS = 4 * BOARD_WIDTH
+MODES = ('keys', 'placement')
+
+EMPTY, LOCKED, FALLING = 0, 1, 2
+
+# Observation bytes of one row for every possible bitmask
+_ROW_BYTES = tuple(bytes(LOCKED if mask >> x & 1 else EMPTY for x in range(BOARD_WIDTH))
+                   for mask in range(1 << BOARD_WIDTH))
+
+
+class TetrisEnv:
+    '''
+    One game behind a reset/step interface
+
+    Attributes:
+        mode (str): 'keys' or 'placement'
+        action_count (int): Number of discrete actions in this mode
+        game (Game): The current game (replaced by every reset)
+        observation (memoryview): (height, width) view of the board buffer
+    '''
+
+    def __init__(self, mode='placement', randomizer='uniform', preview=1,
+                 max_steps=None, buffer=None):
+        '''
+        Args:
+            mode (str): Action space, one of MODES
+            randomizer (str): Piece randomizer, one of pieces.RANDOMIZERS
+            preview (int): Number of upcoming pieces reported in info
+            max_steps (int): End episodes after this many steps (None = no limit)
+            buffer (memoryview): Writable height * width bytes to hold the
+                                 observation (None = allocate one)
+
+        Raises:
+            ValueError: if the mode is unknown
+        '''
+        if mode not in MODES:
+            raise ValueError(f"Unknown mode: {mode}")
+        self.mode = mode
+        self.action_count = len(KEYPRESS_ACTIONS) if mode == 'keys' else PLACEMENT_ACTIONS
+        self.randomizer = randomizer
+        self.preview = preview
+        self.max_steps = max_steps
+        if buffer is None:
+            buffer = memoryview(bytearray(BOARD_HEIGHT * BOARD_WIDTH))
+        self._buffer = buffer
+        self.observation = buffer.cast('B', (BOARD_HEIGHT, BOARD_WIDTH))
+        self.sim = None
+        self.game = None
+        self.steps = 0
+
+    def reset(self, seed=None):
+        '''
+        Start a new game
+
+        Args:
+            seed: Seed for the piece sequence (same seed = same pieces)
+
+        Returns:
+            memoryview: The first observation
+        '''
+        self.sim = Simulation(seed, self.randomizer, self.preview)
+        self.game = self.sim.game
+        self.steps = 0
+        self._drawn_rows = [None] * BOARD_HEIGHT  # Row masks currently in the buffer
+        self._drawn_piece = ()  # Rows that hold falling piece cells
+        self._refresh()
+        return self.observation
+
+    def legal_actions(self):
+        '''
+        Actions that do something useful right now
+
+        In placement mode these are the distinct non-colliding resting
+        placements of the current piece: rotated and moved to a column at
+        its current height (no path of moves is checked), then dropped.
+        In keys mode every action is legal.
+
+        Returns:
+            list: Action numbers
+        '''
+        if self.mode == 'keys':
+            return list(range(self.action_count))
+        piece = self.game.current_piece
+        return [placement.rotation * BOARD_WIDTH + placement.x
+                + piece.rotations[placement.rotation].min_dx
+                for placement in self.game.board.get_placements(piece)]
+
+    def step(self, action):
+        '''
+        Apply one action
+
+        Args:
+            action (int): Action number in this environment's mode
+
+        Returns:
+            tuple: (observation, reward, done, info) where reward is the
+                   score gained and info holds score, lines, level, pieces,
+                   the upcoming pieces and whether the action was illegal
+
+        Raises:
+            ValueError: if the game has already ended
+        '''
+        game = self.game
+        if game.game_over:
+            raise ValueError("The game is over - call reset() first")
+        score = game.score
+        illegal = False
+
+        if self.mode == 'keys':
+            self.sim.step(KEYPRESS_ACTIONS[action])
+        else:
+            illegal = not self._place(action)
+            game.apply_action('hard_drop')
+
+        self.steps += 1
+        done = game.game_over or (self.max_steps is not None and self.steps >= self.max_steps)
+        self._refresh()
+        info = {
+            'score': game.score,
+            'lines': game.lines_cleared,
+            'level': game.level,
+            'pieces': game.pieces_placed,
+            'preview': game.pieces.preview(),
+            'illegal': illegal,
+        }
+        return self.observation, game.score - score, done, info
+
+    def _place(self, action):
+        '''
+        Move the current piece to the rotation and column of a placement action
+
+        The piece is put there directly. Only the destination is checked for
+        collisions, not the moves that would lead to it.
+
+        Returns:
+            bool: False (and the piece left as it was) if the piece collides there
+        '''
+        rotation, column = divmod(action, BOARD_WIDTH)
+        piece = self.game.current_piece
+        old = (piece.rotation, piece.x)
+        piece.rotation = rotation % 4
+        piece.x = column - piece.rotations[piece.rotation].min_dx
+        if self.game.board.has_collision(piece):
+            piece.rotation, piece.x = old
+            return False
+        return True
+
+    def _refresh(self):
+        ''' Bring the observation buffer up to date with the board and piece '''
+        buffer = self._buffer
+        rows = self.game.board.rows
+        drawn = self._drawn_rows
+        width = BOARD_WIDTH
+
+        # Rows whose blocks changed, or that showed the piece last time
+        dirty = set(self._drawn_piece)
+        for y in range(BOARD_HEIGHT):
+            if rows[y] != drawn[y]:
+                dirty.add(y)
+        for y in dirty:
+            drawn[y] = rows[y]
+            buffer[y * width:(y + 1) * width] = _ROW_BYTES[rows[y]]
+
+        piece_rows = set()
+        if not self.game.game_over:
+            for x, y in self.game.current_piece.blocks:
+                if 0 <= y < BOARD_HEIGHT and 0 <= x < width:
+                    buffer[y * width + x] = FALLING
+                    piece_rows.add(y)
+        self._drawn_piece = piece_rows
+
+
+class VectorEnv:
+    '''
+    Many TetrisEnv stepped together, with one shared observation buffer
+
+    Finished games are reset automatically (their final info is kept under
+    'final_info'), so every call returns a full batch.
+
+    Attributes:
+        envs (list): The wrapped environments
+        observations (memoryview): (num_envs, height, width) view of all boards
+    '''
+
+    def __init__(self, num_envs, mode='placement', randomizer='uniform', preview=1,
+                 max_steps=None):
+        '''
+        Args:
+            num_envs (int): Number of games
+            mode, randomizer, preview, max_steps: Passed to every TetrisEnv
+        '''
+        size = BOARD_HEIGHT * BOARD_WIDTH
+        buffer = memoryview(bytearray(num_envs * size))
+        self.envs = [TetrisEnv(mode, randomizer, preview, max_steps,
+                               buffer[i * size:(i + 1) * size])
+                     for i in range(num_envs)]
+        self.observations = buffer.cast('B', (num_envs, BOARD_HEIGHT, BOARD_WIDTH))
+        self._next_seed = None
+
+    def reset(self, seed=None):
+        '''
+        Start a new game in every environment
+
+        Args:
+            seed (int): Seed of the first game; the others get seed + 1, seed + 2, ...
+                        Later automatic resets continue the count. None = random.
+
+        Returns:
+            memoryview: All observations
+        '''
+        self._next_seed = seed
+        for env in self.envs:
+            env.reset(self._take_seed())
+        return self.observations
+
+    def _take_seed(self):
+        seed = self._next_seed
+        if seed is not None:
+            self._next_seed += 1
+        return seed
+
+    def step(self, actions):
+        '''
+        Apply one action in every environment
+
+        Args:
+            actions (sequence): One action number per environment
+
+        Returns:
+            tuple: (observations, rewards, dones, infos), the last three as lists
+        '''
+        rewards = []
+        dones = []
+        infos = []
+        for env, action in zip(self.envs, actions):
+            _, reward, done, info = env.step(action)
+            if done:
+                info = {'final_info': info}
+                env.reset(self._take_seed())
+            rewards.append(reward)
+            dones.append(done)
+            infos.append(info)
+        return self.observations, rewards, dones, infos
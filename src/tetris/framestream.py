@@ -0,0 +1,280 @@
+'''
+Delta-encoded frame stream for spectators and remote clients
+
+FrameEncoder turns the successive states of a Game into small binary
+frames. Each frame holds only what changed since the previous one. A full
+keyframe is sent first, then every keyframe_interval frames (and on
+request, e.g. when a new spectator joins). FrameDecoder applies the frames
+on the other end and rebuilds the board, the falling piece and the stats.
+
+Frame layout (numbers are varints as in tetris.replay):
+    flags              1 byte, see the F_* constants
+    keyframe:          width, height, then width * height colour bytes
+    F_CELLS:           count, then per changed cell: index gap, colour byte
+    F_PIECE:           piece << 2 | rotation byte, zigzag dx, zigzag dy
+                       (absolute x and y in keyframes)
+    F_NEXT:            piece byte
+    F_STATS:           score, level, lines
+
+A piece moving one cell costs 4 bytes, and an unchanged frame is empty
+(nothing to send). Frames sent over a byte stream are length-prefixed
+with encode_message() and split again by FrameDecoder.feed().
+'''
+from itertools import chain
+
+from .config import COLORS, TETROMINOS
+from .replay import decode_varint, encode_varint, unzigzag, zigzag
+from .tetromino import ROTATIONS
+
+# Piece indexes used on the wire
+PIECE_NAMES = tuple(TETROMINOS)
+PIECE_INDEX = {name: index for index, name in enumerate(PIECE_NAMES)}
+
+# Flag bits of the first byte of a frame
+F_KEYFRAME = 0x01
+F_CELLS = 0x02
+F_PIECE = 0x04
+F_NEXT = 0x08
+F_STATS = 0x10
+F_GAME_OVER = 0x20  # Value of game.game_over, present in every frame
+
+
+class FrameEncoder:
+    '''
+    Encodes one game's states as keyframes and deltas
+
+    Attributes:
+        keyframe_interval (int): Frames between two keyframes
+        frames (int): Frames produced so far (empty ones not counted)
+    '''
+
+    def __init__(self, keyframe_interval=100):
+        '''
+        Args:
+            keyframe_interval (int): Send a keyframe at least this often
+        '''
+        self.keyframe_interval = keyframe_interval
+        self.frames = 0
+        self._since_keyframe = None  # None until the first keyframe
+        self._cells = None
+        self._piece = None
+        self._next = None
+        self._stats = None
+        self._game_over = False
+
+    def request_keyframe(self):
+        ''' Make the next frame a keyframe (for a spectator that just joined) '''
+        self._since_keyframe = None
+
+    def encode(self, game):
+        '''
+        Encode the game's current state relative to the last frame
+
+        Args:
+            game (Game): The game to encode
+
+        Returns:
+            bytes: The frame, or b'' when nothing changed
+        '''
+        board = game.board
+        piece = game.current_piece
+        cells = bytes(chain.from_iterable(board.grid))
+        piece_state = (PIECE_INDEX[piece.shape_name], piece.rotation, piece.x, piece.y)
+        next_piece = PIECE_INDEX[game.next_piece.shape_name]
+        stats = (game.score, game.level, game.lines_cleared)
+        game_over = F_GAME_OVER if game.game_over else 0
+
+        out = bytearray(1)
+        if self._since_keyframe is None or self._since_keyframe >= self.keyframe_interval:
+            flags = F_KEYFRAME | F_PIECE | F_NEXT | F_STATS
+            encode_varint(board.width, out)
+            encode_varint(board.height, out)
+            out += cells
+            out.append(piece_state[0] << 2 | piece_state[1])
+            encode_varint(zigzag(piece_state[2]), out)
+            encode_varint(zigzag(piece_state[3]), out)
+            self._since_keyframe = 0
+        else:
+            flags = 0
+            if cells != self._cells:
+                flags |= F_CELLS
+                self._encode_cells(cells, out)
+            if piece_state != self._piece:
+                flags |= F_PIECE
+                out.append(piece_state[0] << 2 | piece_state[1])
+                encode_varint(zigzag(piece_state[2] - self._piece[2]), out)
+                encode_varint(zigzag(piece_state[3] - self._piece[3]), out)
+            if next_piece != self._next:
+                flags |= F_NEXT
+            if stats != self._stats:
+                flags |= F_STATS
+            if not flags and game_over == self._game_over:
+                return b''
+
+        if flags & F_NEXT:
+            out.append(next_piece)
+        if flags & F_STATS:
+            for value in stats:
+                encode_varint(value, out)
+        out[0] = flags | game_over
+
+        self._cells = cells
+        self._piece = piece_state
+        self._next = next_piece
+        self._stats = stats
+        self._game_over = game_over
+        self._since_keyframe += 1
+        self.frames += 1
+        return bytes(out)
+
+    def _encode_cells(self, cells, out):
+        ''' Append the changed cells as (index gap, colour) pairs '''
+        last = self._cells
+        changed = [index for index in range(len(cells)) if cells[index] != last[index]]
+        encode_varint(len(changed), out)
+        previous = 0
+        for index in changed:
+            encode_varint(index - previous, out)
+            out.append(cells[index])
+            previous = index
+
+
+def encode_message(frame):
+    ''' Length-prefix a frame for sending over a byte stream '''
+    out = bytearray()
+    encode_varint(len(frame), out)
+    return bytes(out + frame)
+
+
+class FrameDecoder:
+    '''
+    Rebuilds a game view from FrameEncoder frames
+
+    Attributes:
+        width, height (int): Board size (0 until the first keyframe)
+        cells (bytearray): Colour of every board cell, row by row
+        piece (str): Shape name of the falling piece
+        rotation, x, y (int): Placement of the falling piece
+        next_piece (str): Shape name of the next piece
+        score, level, lines (int): Game statistics
+        game_over (bool): Whether the game has ended
+    '''
+
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.cells = bytearray()
+        self.piece = None
+        self.rotation = 0
+        self.x = 0
+        self.y = 0
+        self.next_piece = None
+        self.score = 0
+        self.level = 1
+        self.lines = 0
+        self.game_over = False
+        self._buffer = bytearray()
+
+    def apply(self, frame):
+        '''
+        Apply one frame
+
+        Args:
+            frame (bytes): A frame from FrameEncoder.encode
+
+        Raises:
+            ValueError: if a delta arrives before any keyframe, or the frame is malformed
+        '''
+        if not frame:
+            return
+        flags = frame[0]
+        pos = 1
+        if flags & F_KEYFRAME:
+            self.width, pos = decode_varint(frame, pos)
+            self.height, pos = decode_varint(frame, pos)
+            size = self.width * self.height
+            self.cells = bytearray(frame[pos:pos + size])
+            if len(self.cells) != size:
+                raise ValueError("Truncated keyframe")
+            pos += size
+        elif self.piece is None:
+            raise ValueError("Delta frame before the first keyframe")
+
+        if flags & F_CELLS:
+            count, pos = decode_varint(frame, pos)
+            index = 0
+            for _ in range(count):
+                gap, pos = decode_varint(frame, pos)
+                index += gap
+                self.cells[index] = frame[pos]
+                pos += 1
+
+        if flags & F_PIECE:
+            packed = frame[pos]
+            x, pos = decode_varint(frame, pos + 1)
+            y, pos = decode_varint(frame, pos)
+            self.piece = PIECE_NAMES[packed >> 2]
+            self.rotation = packed & 3
+            if flags & F_KEYFRAME:
+                self.x, self.y = unzigzag(x), unzigzag(y)
+            else:
+                self.x += unzigzag(x)
+                self.y += unzigzag(y)
+
+        if flags & F_NEXT:
+            self.next_piece = PIECE_NAMES[frame[pos]]
+            pos += 1
+
+        if flags & F_STATS:
+            self.score, pos = decode_varint(frame, pos)
+            self.level, pos = decode_varint(frame, pos)
+            self.lines, pos = decode_varint(frame, pos)
+
+        self.game_over = bool(flags & F_GAME_OVER)
+
+    def feed(self, data):
+        '''
+        Apply every complete length-prefixed frame in a chunk of stream data
+
+        Incomplete trailing data is kept until the next call.
+
+        Args:
+            data (bytes): Bytes received from the stream
+
+        Returns:
+            int: Number of frames applied
+        '''
+        buffer = self._buffer
+        buffer += data
+        applied = 0
+        pos = 0
+        while pos < len(buffer):
+            try:
+                length, start = decode_varint(buffer, pos)
+            except ValueError:
+                break  # Length prefix not complete yet
+            if start + length > len(buffer):
+                break
+            self.apply(bytes(buffer[start:start + length]))
+            pos = start + length
+            applied += 1
+        del buffer[:pos]
+        return applied
+
+    @property
+    def grid(self):
+        ''' Locked cells as a list of rows of colours (like Board.grid) '''
+        width = self.width
+        return [list(self.cells[y * width:(y + 1) * width]) for y in range(self.height)]
+
+    def view(self):
+        ''' The grid with the falling piece drawn in, ready to render '''
+        grid = self.grid
+        if self.piece is None:
+            return grid
+        color = COLORS[self.piece]
+        for dx, dy in ROTATIONS[self.piece][self.rotation].offsets:
+            x, y = self.x + dx, self.y + dy
+            if 0 <= y < self.height and 0 <= x < self.width:
+                grid[y][x] = color
+        return grid
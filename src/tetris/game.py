@@ -1,9 +1,38 @@
 from .board import Board
 from .tetromino import Tetromino
-from .config import BOARD_WIDTH, BOARD_HEIGHT
-import random
+from .config import BOARD_WIDTH, BOARD_HEIGHT, FRAMES_PER_SECOND
+from .renderer import AnsiRenderer, CursesRenderer
+from .rng import SplitMix64
+from .pieces import PieceQueue
+from .timing import MAX_CATCH_UP_FRAMES, AutoShift, FrameClock, frames_per_row
 import time
 import curses
+from collections import namedtuple
+
+# Player actions understood by Game.apply_action
+ACTIONS = ('left', 'right', 'rotate', 'drop', 'hard_drop')
+
+# Keyboard bindings for the actions
+KEY_ACTIONS = {
+    curses.KEY_LEFT: 'left',
+    curses.KEY_RIGHT: 'right',
+    curses.KEY_DOWN: 'drop',
+    curses.KEY_UP: 'rotate',
+    ord(' '): 'hard_drop',  # Spacebar for hard drop
+    ord('r'): 'rotate',
+    ord('R'): 'rotate',
+}
+
+# Immutable, hashable copy of everything needed to resume a game
+GameState = namedtuple('GameState', [
+    'board',           # BoardState
+    'piece', 'rotation', 'x', 'y',  # Current piece
+    'next_piece',      # Shape name of the next piece
+    'score', 'level', 'lines_cleared', 'pieces_placed', 'game_over',
+    'gravity_frames', 'gravity_counter',
+    'rng_state',       # self.rng.getstate()
+    'piece_queue',     # self.pieces.getstate()
+])
 
 class Game:
     """
@@ -14,26 +43,45 @@ class Game:
     2. Update game state (gravity, collisions, scoring)
     3. Render the game display
     4. Repeat until game over
+
+    Game time advances in 60 Hz frames (see tick()). Gravity and held
+    left/right keys are counted in frames, never in wall-clock deltas.
     """
     stdscr: 'curses._CursesWindow' # type: ignore 
 
-    def __init__(self, stdscr=None):
+    def __init__(self, stdscr=None, rng=None, randomizer=None, preview=1):
         """
         Initialize a new Tetris game
         
         Args:
             stdscr: curses window object (None for testing)
+            rng (random.Random): Source of random pieces (None for an unseeded SplitMix64)
+            randomizer: Piece randomizer from tetris.pieces (None for uniform)
+            preview (int): Number of upcoming pieces to keep in the queue
         """
         self.stdscr = stdscr  # Store the curses window
+        self.renderer = None  # Created on the first curses render
+        self.text_renderer = None  # Created on the first render without curses
+        self.recorder = None  # Optional ReplayRecorder that logs every action
+        self.profiler = None  # Set by Profiler.attach when timing is enabled
+        self.latency = None  # Set by LatencyProbe.attach to measure key-to-screen time
+        self.stats = None  # Optional GameStats, told about every locked piece
+        self.rng = rng if rng is not None else SplitMix64()
         self.board = Board()
+        self.pieces = PieceQueue(self.rng, randomizer, preview)
         self.current_piece = self._create_new_piece()
-        self.next_piece = self._create_new_piece()
+        self.next_piece = Tetromino(self.pieces.peek())
         self.score = 0
         self.level = 1
         self.game_over = False
         self.lines_cleared = 0
-        self.last_drop_time = time.time()
-        self.drop_interval = 1.0  # Pieces fall every 1 second initially
+        self.pieces_placed = 0
+        self.frame = 0  # Frames simulated so far
+        self.gravity_frames = frames_per_row(self.level)  # Frames per row of gravity
+        self.gravity_counter = 0  # Frames since the last gravity drop
+        self.frame_clock = FrameClock()  # Wall clock -> frame numbers for live play
+        self.autoshift = AutoShift()  # Delayed auto shift for held left/right keys
+        self.needs_redraw = True  # Set when the screen must be redrawn regardless of state
         
         # Initialize curses if we have a window
         if self.stdscr:
@@ -67,15 +115,60 @@ class Game:
             self.stdscr.addstr(2, 0, f'Current: {width}x{height}')
             self.stdscr.addstr(3, 0, 'Please resize your terminal and restart.')
             self.stdscr.refresh()
+            if self.renderer:
+                self.renderer.invalidate()
             return False
         
         return True
 
+    def snapshot(self):
+        """
+        Capture the full game state (board, pieces, score and RNG)
+
+        With the default SplitMix64 RNG a snapshot is a few hundred bytes,
+        hashable, and never shares mutable data with the game.
+
+        Returns:
+            GameState: The captured state
+        """
+        piece = self.current_piece
+        return GameState(
+            self.board.snapshot(),
+            piece.shape_name, piece.rotation, piece.x, piece.y,
+            self.next_piece.shape_name,
+            self.score, self.level, self.lines_cleared, self.pieces_placed, self.game_over,
+            self.gravity_frames, self.gravity_counter,
+            self.rng.getstate(),
+            self.pieces.getstate(),
+        )
+
+    def restore(self, state):
+        """
+        Return the game to a state captured by snapshot()
+
+        Args:
+            state (GameState): The state to restore
+        """
+        self.board.restore(state.board)
+        piece = self.current_piece
+        piece.reset(state.piece)
+        piece.rotation = state.rotation
+        piece.x = state.x
+        piece.y = state.y
+        self.next_piece.reset(state.next_piece)
+        self.score = state.score
+        self.level = state.level
+        self.lines_cleared = state.lines_cleared
+        self.pieces_placed = state.pieces_placed
+        self.game_over = state.game_over
+        self.gravity_frames = state.gravity_frames
+        self.gravity_counter = state.gravity_counter
+        self.rng.setstate(state.rng_state)
+        self.pieces.setstate(state.piece_queue)
+
     def _create_new_piece(self):
-        """Create a new random tetromino at the top center"""
-        shapes = ['I', 'O', 'T', 'L', 'J', 'S', 'Z']
-        shape = random.choice(shapes)
-        tetromino = Tetromino(shape)
+        """Take the next tetromino from the piece queue, at the top center"""
+        tetromino = Tetromino(self.pieces.pop())
         # Center the piece at the top
         tetromino.x = BOARD_WIDTH // 2 - 2  # Rough center for 4x4 pieces
         tetromino.y = 0
@@ -112,19 +205,42 @@ class Game:
         """
         Drop the piece all the way to the bottom instantly
         """
-        # Keep dropping until we hit something
-        while not self.board.has_collision(self.current_piece):
-            self.current_piece.y += 1
-        
-        # We went one step too far, so go back one
-        self.current_piece.y -= 1
+        # Jump straight to the landing row
+        self.current_piece.y += self.board.drop_distance(self.current_piece)
         # Lock the piece in place
         self._lock_piece()
     
 
+    def apply_action(self, action):
+        """
+        Apply one named player action to the current piece
+
+        Args:
+            action (str): One of ACTIONS ('left', 'right', 'rotate', 'drop', 'hard_drop')
+
+        Raises:
+            ValueError: if the action name is unknown
+        """
+        if action == 'left':
+            self.move_left()
+        elif action == 'right':
+            self.move_right()
+        elif action == 'rotate':
+            self.rotate()
+        elif action == 'drop':
+            self.drop()
+        elif action == 'hard_drop':
+            self.hard_drop()
+        else:
+            raise ValueError(f"Unknown action: {action}")
+
+        if self.recorder is not None:
+            self.recorder.record(action)
+
     def _lock_piece(self):
         """Lock the current piece and create a new one"""
         self.board.lock_tetromino(self.current_piece)
+        self.pieces_placed += 1
     
         # Clear lines and calculate score
         lines_cleared = self.board.clear_lines()
@@ -132,10 +248,18 @@ class Game:
             points_earned = self._calculate_score(lines_cleared)
             self.score += points_earned
             self._update_level(lines_cleared)
+
+        if self.stats is not None:
+            self.stats.piece_locked(self.board, self.current_piece.shape_name)
     
-        # NEXT PIECE LOGIC: Current becomes next, generate new next piece
+        # NEXT PIECE LOGIC: Current becomes next, the queue moves up one piece.
+        # The locked piece is part of the board now, so its object is reused
+        # as the new next piece instead of allocating one per spawn
+        locked = self.current_piece
         self.current_piece = self.next_piece
-        self.next_piece = self._create_new_piece()
+        self.pieces.pop()  # The front of the queue is the piece now in play
+        locked.reset(self.pieces.peek())
+        self.next_piece = locked
     
         # Reset position for the new current piece
         self.current_piece.x = BOARD_WIDTH // 2 - 2
@@ -146,12 +270,56 @@ class Game:
             self.game_over = True
     
 
-    def _apply_gravity(self):
-        """Make the current piece fall automatically based on time"""
-        current_time = time.time()
-        if current_time - self.last_drop_time > self.drop_interval:
-            self.drop()
-            self.last_drop_time = current_time
+    def gravity_drop(self):
+        """One automatic fall step caused by gravity (recorded apart from soft drops)"""
+        if self.recorder is not None:
+            self.recorder.record('gravity')
+        self.drop()
+
+    @property
+    def drop_interval(self):
+        """Seconds between automatic drops at the current level"""
+        return self.gravity_frames / FRAMES_PER_SECOND
+
+    def tick(self):
+        """
+        Advance the game by one frame: auto shift of a held key, then gravity
+        """
+        if self.game_over:
+            return
+        self.frame += 1
+        if self.autoshift.direction is not None:
+            shift = self.autoshift.tick(self.frame)
+            if shift is not None:
+                x = self.current_piece.x
+                self.apply_action(shift)
+                if self.latency is not None and self.current_piece.x != x:
+                    self.latency.shift_landed()
+            elif self.autoshift.direction is None and self.latency is not None:
+                self.latency.shift_released()
+
+        self.gravity_counter += 1
+        if self.gravity_counter >= self.gravity_frames and not self.game_over:
+            self.gravity_counter = 0
+            self.gravity_drop()
+
+    def press(self, action):
+        """
+        Apply an action from a key event of the interactive game
+
+        Left and right go through delayed auto shift: the terminal's own
+        autorepeats only keep the key held, and tick() does the repeating.
+        The event belongs to the last frame that ran, so call update() first
+        to catch up with the wall clock.
+
+        Args:
+            action (str): One of ACTIONS
+        """
+        if action == 'left' or action == 'right':
+            if self.autoshift.press(action, self.frame):
+                self.apply_action(action)
+        else:
+            self.apply_action(action)
     
     def handle_input(self):
         """
@@ -164,28 +332,42 @@ class Game:
             return True  # No input handling without curses
             
         try:
-            # Get the pressed key (non-blocking)
+            # Get the pressed key (waits at most the window's timeout)
             key = self.stdscr.getch()
             
             # If no key was pressed, getch returns -1
             if key == -1:
                 return True
+            latency = self.latency
+            read_at = latency.clock() if latency is not None else 0.0
+
+            # The terminal was resized: the whole screen has to be redrawn
+            if key == curses.KEY_RESIZE:
+                self.needs_redraw = True
+                return True
                 
             # Handle different keys
             if key == ord('q') or key == ord('Q'):
                 return False  # Quit game
-            elif key == curses.KEY_LEFT:
-                self.move_left()
-            elif key == curses.KEY_RIGHT:
-                self.move_right()
-            elif key == curses.KEY_DOWN:
-                self.drop()
-            elif key == curses.KEY_UP:
-                self.rotate()
-            elif key == ord(' '):  # Spacebar for hard drop
-                self.hard_drop()
-            elif key == ord('r') or key == ord('R'):
-                self.rotate()
+
+            action = KEY_ACTIONS.get(key)
+            if action:
+                # Run the frames that passed while waiting, so the key lands
+                # in the frame it arrived in
+                self.update()
+                if latency is None:
+                    self.press(action)
+                else:
+                    held = self.autoshift.direction
+                    if held is not None and held != action:
+                        latency.shift_released()  # The other direction takes over
+                    before = self._render_state()
+                    self.press(action)
+                    changed = self._render_state() != before
+                    # An autorepeat shows up with the next auto shift, not now
+                    deferred = (not changed and self.autoshift.repeating
+                                and self.autoshift.direction == action)
+                    latency.input_applied(read_at, changed, deferred)
                 
         except Exception as e:
             # If there's an input error, just continue the game
@@ -194,12 +376,17 @@ class Game:
         return True
 
     def update(self):
-        """Update game state - called every frame"""
+        """Run every frame that has started on the wall clock since the last update"""
         if self.game_over:
             return
-        
-        # Apply automatic gravity
-        self._apply_gravity()
+
+        due = self.frame_clock.now() - self.frame
+        if due > MAX_CATCH_UP_FRAMES:
+            # Stalled (e.g. suspended): skip ahead instead of replaying it all
+            self.frame += due - MAX_CATCH_UP_FRAMES
+            due = MAX_CATCH_UP_FRAMES
+        for _ in range(due):
+            self.tick()
     
     def render(self):
         """Render the current game state to terminal"""
@@ -209,66 +396,12 @@ class Game:
             return
         
         try:
-            # Clear the screen
-            self.stdscr.clear()
-        
-            # Simple header that fits in small terminals
-            self._safe_addstr(0, 0, "TETRIS - Q:Quit Arrows:Move R:Rotate Space:Drop")
-        
-            # Calculate minimal board position
-            start_x = 2
-            start_y = 2
-        
-            # Draw top border
-            self._safe_addstr(start_y - 1, start_x - 1, "+" + "-" * self.board.width * 2 + "+")
-        
-            # Create a display grid
-            display_grid = [row[:] for row in self.board.grid]
-        
-            # Add current piece to display
-            for x, y in self.current_piece.blocks:
-                if 0 <= y < self.board.height and 0 <= x < self.board.width:
-                    display_grid[y][x] = 1  # Use simple 1 for current piece
-        
-            # Draw each row
-            for y in range(min(20, self.board.height)):  # Limit to 20 rows max
-                if start_y + y >= curses.LINES - 5:  # Don't draw beyond screen
-                    break
-                
-                self._safe_addstr(start_y + y, start_x - 1, "|")
-                for x in range(self.board.width):
-                    if display_grid[y][x]:
-                        self._safe_addstr(start_y + y, start_x + x * 2, "[]")
-                    else:
-                        self._safe_addstr(start_y + y, start_x + x * 2, "  ")
-                self._safe_addstr(start_y + y, start_x + self.board.width * 2, "|")
-        
-            # Draw bottom border if we have space
-            if start_y + min(20, self.board.height) < curses.LINES - 2:
-                self._safe_addstr(start_y + min(20, self.board.height), start_x - 1, "+" + "-" * self.board.width * 2 + "+")
-        
-            # Simple game info
-            info_line = start_y + min(20, self.board.height) + 2
-            if info_line < curses.LINES:
-                self._safe_addstr(info_line, 0, f"Score:{self.score} Level:{self.level} Lines:{self.lines_cleared}")
-        
-            if self.game_over and info_line + 1 < curses.LINES:
-                self._safe_addstr(info_line + 1, 0, "GAME OVER!")
-
-            # Display next piece preview
-            preview_line = info_line + 3  # Leave some space after game info
-            if preview_line < curses.LINES:
-                self._safe_addstr(preview_line, 0, "Next Piece:")
-    
-            # Display the next piece in a mini preview
-            preview_x = 12  # Position for the preview
-            for y, row in enumerate(self.next_piece.shape):
-                for x, cell in enumerate(row):
-                    if cell:  # If there's a block in the piece
-                        if preview_line + y + 1 < curses.LINES:
-                            self._safe_addstr(preview_line + y + 1, preview_x + x * 2, "██")
-
-            self.stdscr.refresh()
+            # Only the cells that changed since the last frame are redrawn
+            if self.renderer is None:
+                self.renderer = CursesRenderer(self.stdscr)
+            self.renderer.render(self)
+            if self.latency is not None:
+                self.latency.flushed()
         
         except Exception as e:
             # If anything fails, use simple rendering
@@ -278,78 +411,56 @@ class Game:
 
     def _render_simple(self):
         """Fallback rendering without curses (for testing or when curses fails)"""
-        # Simple text-based rendering
-        print("\033[2J\033[H")  # Clear screen and move cursor to top
-    
-        print("🎮 TERMINAL TETRIS 🎮")
-        print("Controls: ← → ↓ Move | ↑/R Rotate | Space Hard Drop | Q Quit")
-        print()
-    
-        # Create a display grid that combines board and current piece
-        display_grid = [row[:] for row in self.board.grid]
-    
-        # Add current piece to display
-        for x, y in self.current_piece.blocks:
-            if 0 <= y < self.board.height and 0 <= x < self.board.width:
-                display_grid[y][x] = self.current_piece.color
-    
-        # Print the board
-        print("+" + "-" * (self.board.width * 2) + "+")
-        for row in display_grid:
-            print("|", end="")
-            for cell in row:
-                if cell:
-                    print("██", end="")  # Block
-                else:
-                    print("  ", end="")  # Empty space
-            print("|")
-        print("+" + "-" * (self.board.width * 2) + "+")
-    
-        # Print game info
-        print(f"Score: {self.score}")
-        print(f"Level: {self.level}") 
-        print(f"Lines: {self.lines_cleared}")
-    
-        if self.game_over:
-            print("GAME OVER!")        
+        # The whole frame goes out in one stdout write, and only changed lines
+        if self.text_renderer is None:
+            self.text_renderer = AnsiRenderer()
+        self.text_renderer.render(self)
+        if self.latency is not None:
+            self.latency.flushed()
 
-        # Print next piece preview
-        print(f"Next Piece: {self.next_piece.shape_name}")
-        # Simple ASCII preview of next piece
-        for row in self.next_piece.shape:
-            line = ""
-            for cell in row:
-                line += "██" if cell else "  "
-            print(line)
 
+    def _ms_until_next_event(self):
+        """Milliseconds until the next frame with a gravity drop or auto shift"""
+        # At least one frame ahead: frames up to self.frame have already run
+        frames = max(1, self.gravity_frames - self.gravity_counter)
+        shift = self.autoshift.frames_until_shift(self.frame)
+        if shift is not None and shift < frames:
+            frames = shift
+        remaining = self.frame_clock.seconds_until(self.frame + frames)
+        # Round up so we don't wake a moment before the deadline
+        return max(0, int(remaining * 1000) + 1)
+
+    def _render_state(self):
+        """Everything the screen shows that can change between frames"""
+        piece = self.current_piece
+        return (piece.x, piece.y, piece.rotation, self.pieces_placed, self.game_over)
 
-    def _safe_addstr(self, y, x, text, attributes=0):
-        """Safely add text to the curses window, handling boundary errors"""
-        if not self.stdscr:
-            return
-        
-        try:
-            max_y, max_x = self.stdscr.getmaxyx()
-            # Check if position is within window bounds and text fits
-            if (0 <= y < max_y and 0 <= x < max_x and 
-                x + len(text) <= max_x):
-                self.stdscr.addstr(y, x, text, attributes)
-                return True
-            return False
-        except curses.error:
-            return False
-    
     def run(self):
-        """Main game loop using curses"""
+        """
+        Main game loop using curses
+
+        Instead of polling on a fixed sleep, every pass blocks in getch()
+        until either a key arrives or the next frame with a gravity drop or
+        auto shift starts, then runs the frames that have started. The
+        screen is only redrawn when something visible changed.
+        """
         try:
             # Try to run with curses
             if self.stdscr:
+                last_state = None
                 while not self.game_over:
+                    self.stdscr.timeout(self._ms_until_next_event())
                     if not self.handle_input():
                         break
                     self.update()
-                    self.render()
-                    time.sleep(0.05)
+
+                    state = self._render_state()
+                    if state != last_state or self.needs_redraw:
+                        if self.needs_redraw and self.renderer:
+                            self.renderer.invalidate()
+                        self.needs_redraw = False
+                        self.render()
+                        last_state = state
             else:
                 # Fallback to simple mode
                 self._run_simple()
@@ -412,5 +523,5 @@ class Game:
         # Level up every 10 lines (classic Tetris progression)
         self.level = (self.lines_cleared // 10) + 1
 
-        # Increase game speed with level (every level = 10% faster)
-        self.drop_interval = max(0.1, 1.0 - (self.level -1) * 0.1)
+        # Increase game speed with level (NES gravity table)
+        self.gravity_frames = frames_per_row(self.level)
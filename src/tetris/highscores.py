@@ -0,0 +1,357 @@
+'''
+High-score store: an append-only record log with an in-memory top-K index
+
+Every finished game is appended to the log as one fixed-size binary record,
+so the log keeps the complete history. The best K scores are kept in a
+min-heap in memory. Compaction writes them, together with the log length
+they cover, to a small checkpoint file next to the log. On startup only
+the checkpoint and the records appended after it are read, never the
+whole history.
+
+Several processes can share one store: appends and compactions hold an
+exclusive flock on the log, and reads hold a shared one (no locking on
+platforms without fcntl). A record torn by a crash mid-append is cut off
+under the exclusive lock before anything else is appended, so records
+never get out of step. submit() only queues the record. A background
+thread does the file work, so recording a score never blocks a frame.
+
+File layout (both files, little-endian):
+    b'TTHS'  version (1 byte)  3 padding bytes
+    log:         records...
+    checkpoint:  covered log size (8 bytes), then the top-K records
+
+Usage:
+    python -m tetris.highscores ~/.tetris_scores --top 10
+'''
+import argparse
+import heapq
+import itertools
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+from collections import namedtuple
+
+try:
+    import fcntl
+except ImportError:  # No flock on this platform: single-process use only
+    fcntl = None
+
+MAGIC = b'TTHS'
+STORE_VERSION = 1
+HEADER = struct.Struct('<4sB3x')
+# score, lines, level, flags (bit 0 = seed present), timestamp, seed.
+# Seeds are stored as unsigned 64-bit values, the same range SplitMix64
+# reduces every integer seed to
+RECORD = struct.Struct('<QIHBxdQ')
+OFFSET = struct.Struct('<Q')
+_HAS_SEED = 0x01
+_MASK64 = (1 << 64) - 1
+
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.tetris_scores')
+
+# One finished game
+HighScore = namedtuple('HighScore', ['score', 'lines', 'level', 'timestamp', 'seed'])
+
+
+def score_from_game(game, seed=None):
+    ''' HighScore for a finished Game, stamped with the current time '''
+    return HighScore(game.score, game.lines_cleared, game.level, time.time(), seed)
+
+
+def pack_record(entry):
+    '''
+    Encode a HighScore as one fixed-size record
+
+    The seed is kept modulo 2**64 (-1 is stored as 2**64 - 1), which
+    seeds SplitMix64 with the same piece sequence.
+    '''
+    flags = _HAS_SEED if entry.seed is not None else 0
+    return RECORD.pack(entry.score, entry.lines, entry.level, flags, entry.timestamp,
+                       entry.seed & _MASK64 if entry.seed is not None else 0)
+
+
+def unpack_records(data):
+    ''' Decode consecutive records (a trailing partial record is ignored) '''
+    end = len(data) - len(data) % RECORD.size
+    for score, lines, level, flags, timestamp, seed in RECORD.iter_unpack(data[:end]):
+        yield HighScore(score, lines, level, timestamp, seed if flags & _HAS_SEED else None)
+
+
+class _Lock:
+    ''' flock held for the duration of a with block (no-op without fcntl) '''
+
+    def __init__(self, file, exclusive):
+        self.file = file
+        self.mode = None
+        if fcntl is not None:
+            self.mode = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+
+    def __enter__(self):
+        if self.mode is not None:
+            fcntl.flock(self.file.fileno(), self.mode)
+        return self.file
+
+    def __exit__(self, *exc_info):
+        if self.mode is not None:
+            fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+
+
+class HighScoreStore:
+    '''
+    Append-only score log with the best K scores indexed in memory
+
+    Attributes:
+        path (str): The log file (the checkpoint is path + '.top')
+        capacity (int): Number of top scores kept (K)
+        compact_every (int): Write a checkpoint after this many appends
+        failed (int): Submitted scores the background writer could not record
+    '''
+
+    def __init__(self, path, capacity=100, compact_every=1000):
+        '''
+        Open (or create) a store and load its top scores
+
+        Args:
+            path (str): Log file path
+            capacity (int): Number of top scores to keep in memory
+            compact_every (int): Appends between automatic checkpoints
+
+        Raises:
+            ValueError: if the file exists but is not a high-score log
+        '''
+        self.path = path
+        self.checkpoint_path = path + '.top'
+        self.capacity = capacity
+        self.compact_every = compact_every
+        self._heap = []  # (score, -timestamp, tiebreak, HighScore), smallest first
+        self._tiebreak = itertools.count()
+        self._since_compact = 0
+        self.failed = 0
+        # Guards the index and every use of self._log: flock is per open
+        # file, so it doesn't keep the writer thread and the caller's
+        # thread apart when they share one
+        self._index_lock = threading.Lock()
+        self._queue = None
+        self._writer = None
+
+        # Append mode: every write lands at the end, whatever other processes did
+        self._log = open(path, 'a+b')
+        try:
+            with _Lock(self._log, exclusive=True) as log:
+                log.seek(0, os.SEEK_END)
+                if log.tell() == 0:
+                    log.write(HEADER.pack(MAGIC, STORE_VERSION))
+                    log.flush()
+                log.seek(0)
+                self._check_header(log.read(HEADER.size))
+                log_size = self._trim_torn_record(log)
+        except ValueError:
+            self._log.close()
+            raise
+
+        self._read_offset = self._load_checkpoint()
+        if self._read_offset > log_size:
+            # The checkpoint belongs to a different (older, longer) log
+            self._heap = []
+            self._read_offset = HEADER.size
+        self.refresh()
+
+    def _check_header(self, data):
+        if len(data) < HEADER.size or HEADER.unpack_from(data)[0] != MAGIC:
+            raise ValueError(f"Not a high-score file: {self.path}")
+        version = HEADER.unpack_from(data)[1]
+        if version != STORE_VERSION:
+            raise ValueError(f"Unsupported high-score file version: {version}")
+
+    @staticmethod
+    def _trim_torn_record(log):
+        '''
+        Cut off a partial record left by a writer that died mid-append, so
+        the next append starts on a record boundary (hold the exclusive lock)
+
+        Returns:
+            int: The log size after trimming
+        '''
+        size = log.seek(0, os.SEEK_END)
+        torn = (size - HEADER.size) % RECORD.size
+        if torn:
+            size -= torn
+            log.truncate(size)
+        return size
+
+    def _load_checkpoint(self):
+        ''' Load the checkpointed top scores, returning the log offset they cover '''
+        try:
+            with open(self.checkpoint_path, 'rb') as checkpoint:
+                data = checkpoint.read()
+        except FileNotFoundError:
+            return HEADER.size
+        try:
+            self._check_header(data)
+            covered, = OFFSET.unpack_from(data, HEADER.size)
+        except (ValueError, struct.error):
+            return HEADER.size  # Unreadable checkpoint: rebuild from the log
+        entries = list(unpack_records(data[HEADER.size + OFFSET.size:]))
+        history = (covered - HEADER.size) // RECORD.size
+        if len(entries) < min(self.capacity, history):
+            return HEADER.size  # Written with a smaller K: it may miss our top scores
+        for entry in entries:
+            self._push(entry)
+        return covered
+
+    def _push(self, entry):
+        item = (entry.score, -entry.timestamp, next(self._tiebreak), entry)
+        if len(self._heap) < self.capacity:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+
+    def refresh(self):
+        '''
+        Index the records appended since the last read (by any process)
+
+        Returns:
+            int: Number of new records read
+        '''
+        count = 0
+        with self._index_lock:
+            with _Lock(self._log, exclusive=False) as log:
+                log.seek(self._read_offset)
+                data = log.read()
+            for entry in unpack_records(data):
+                self._push(entry)
+                count += 1
+            self._read_offset += count * RECORD.size
+        return count
+
+    def add(self, entry):
+        '''
+        Append one score to the log right away (blocks on file I/O)
+
+        Args:
+            entry (HighScore): The score to record
+        '''
+        record = pack_record(entry)
+        with self._index_lock:
+            with _Lock(self._log, exclusive=True) as log:
+                self._trim_torn_record(log)
+                log.write(record)
+                log.flush()
+            self._since_compact += 1
+            due = self._since_compact >= self.compact_every
+        self.refresh()  # Picks up our record and any appended by others
+        if due:
+            self.compact()
+
+    def submit(self, entry):
+        '''
+        Queue a score to be appended by the background writer (never blocks)
+
+        Args:
+            entry (HighScore): The score to record
+        '''
+        if self._writer is None:
+            self._queue = queue.Queue()
+            self._writer = threading.Thread(target=self._write_queued,
+                                            name='highscore-writer', daemon=True)
+            self._writer.start()
+        self._queue.put(entry)
+
+    def _write_queued(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            try:
+                self.add(entry)
+            except Exception as e:
+                # Keep writing the scores queued after this one
+                self.failed += 1
+                print(f"Could not record score {entry.score}: {e}", file=sys.stderr)
+
+    def compact(self):
+        '''
+        Write the current top scores as the checkpoint for future startups
+
+        The checkpoint is written to a temporary file and renamed into place,
+        so readers always see either the old or the new one.
+        '''
+        self.refresh()
+        with self._index_lock:
+            data = bytearray(HEADER.pack(MAGIC, STORE_VERSION))
+            data += OFFSET.pack(self._read_offset)
+            for item in self._heap:
+                data += pack_record(item[3])
+
+            temp_path = f"{self.checkpoint_path}.{os.getpid()}.tmp"
+            with _Lock(self._log, exclusive=True):
+                with open(temp_path, 'wb') as temp:
+                    temp.write(data)
+                os.replace(temp_path, self.checkpoint_path)
+            self._since_compact = 0
+
+    def top(self, count=10):
+        '''
+        The best scores, highest first (includes other processes' new scores)
+
+        Still answers from memory after close().
+
+        Args:
+            count (int): Number of scores to return (at most capacity)
+
+        Returns:
+            list: HighScore entries
+        '''
+        if not self._log.closed:
+            self.refresh()
+        with self._index_lock:
+            items = heapq.nlargest(count, self._heap)
+        return [item[3] for item in items]
+
+    def close(self):
+        ''' Write out queued scores, save a checkpoint and close the log '''
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        self.compact()
+        self._log.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def format_scores(entries):
+    ''' Text table of high scores '''
+    lines = [f"{'#':>3} {'score':>9} {'lines':>6} {'level':>6}  {'date':<16} seed"]
+    for rank, entry in enumerate(entries, start=1):
+        date = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry.timestamp))
+        seed = entry.seed if entry.seed is not None else '-'
+        lines.append(f"{rank:>3} {entry.score:>9} {entry.lines:>6} {entry.level:>6}  {date:<16} {seed}")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv=None):
+    ''' Command line entry point: show the best scores '''
+    parser = argparse.ArgumentParser(description="Show Tetris high scores")
+    parser.add_argument('path', nargs='?', default=DEFAULT_PATH, help="high-score file")
+    parser.add_argument('--top', type=int, default=10, help="number of scores to show")
+    parser.add_argument('--compact', action='store_true',
+                        help="write a fresh checkpoint so the next startup reads less")
+    args = parser.parse_args(argv)
+
+    with HighScoreStore(args.path, capacity=max(args.top, 100)) as store:
+        print(format_scores(store.top(args.top)), end="")
+        if args.compact:
+            store.compact()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
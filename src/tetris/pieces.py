@@ -0,0 +1,162 @@
+'''
+Piece sources: randomizers and the upcoming-piece queue
+
+A randomizer decides which shape comes next, drawing from the game's own
+seeded RNG, so every game has an independent, reproducible stream:
+
+    uniform   every shape equally likely on every draw (the classic game)
+    bag       7-bag: each run of seven pieces holds every shape once
+    nes       NES style: a repeat of the previous shape (or the reroll
+              slot) is rerolled once, making repeats rarer
+
+PieceQueue keeps the next N shapes in a ring buffer. The game takes pieces
+from the front, and renderers and bots can look at the whole preview.
+'''
+from .config import TETROMINOS
+
+# Shape names in draw order (the same list Game has always chosen from)
+SHAPES = tuple(TETROMINOS)
+
+
+class UniformRandomizer:
+    ''' Any shape with equal probability (same draws as rng.choice(SHAPES)) '''
+
+    name = 'uniform'
+
+    def draw(self, rng):
+        return rng.choice(SHAPES)
+
+    def getstate(self):
+        return None
+
+    def setstate(self, state):
+        pass
+
+
+class BagRandomizer:
+    ''' 7-bag: shuffle all seven shapes, deal them out, refill when empty '''
+
+    name = 'bag'
+
+    def __init__(self):
+        self._bag = []
+
+    def draw(self, rng):
+        if not self._bag:
+            self._bag = list(SHAPES)
+            rng.shuffle(self._bag)
+        return self._bag.pop()
+
+    def getstate(self):
+        return tuple(self._bag)
+
+    def setstate(self, state):
+        self._bag = list(state)
+
+
+class NESRandomizer:
+    '''
+    NES reroll: roll one of eight slots, and if it is the eighth slot or
+    the same shape as last time, roll once more among the seven shapes
+    '''
+
+    name = 'nes'
+
+    def __init__(self):
+        self._previous = None
+
+    def draw(self, rng):
+        roll = rng.randrange(len(SHAPES) + 1)
+        if roll == len(SHAPES) or SHAPES[roll] == self._previous:
+            roll = rng.randrange(len(SHAPES))
+        self._previous = SHAPES[roll]
+        return self._previous
+
+    def getstate(self):
+        return self._previous
+
+    def setstate(self, state):
+        self._previous = state
+
+
+# Randomizers available by name to make_randomizer and the command line tools
+RANDOMIZERS = ('uniform', 'bag', 'nes')
+
+
+def make_randomizer(name):
+    '''
+    Build a randomizer by name
+
+    Args:
+        name (str): One of RANDOMIZERS
+
+    Returns:
+        A randomizer with draw(rng), getstate() and setstate()
+
+    Raises:
+        ValueError: if the randomizer name is unknown
+    '''
+    if name == 'uniform':
+        return UniformRandomizer()
+    if name == 'bag':
+        return BagRandomizer()
+    if name == 'nes':
+        return NESRandomizer()
+    raise ValueError(f"Unknown randomizer: {name}")
+
+
+class PieceQueue:
+    '''
+    Ring buffer of the next N shapes
+
+    The buffer is filled when the queue is created. Every pop() hands out
+    the front shape and draws one new shape into the freed slot, so the
+    preview always holds exactly N shapes.
+
+    Attributes:
+        rng (random.Random): The game's RNG that pieces are drawn from
+        randomizer: Decides which shape comes next
+        size (int): Number of shapes in the preview
+    '''
+
+    def __init__(self, rng, randomizer=None, size=1):
+        '''
+        Args:
+            rng (random.Random): Source of randomness (shared with the game)
+            randomizer: A randomizer (None for UniformRandomizer)
+            size (int): Number of upcoming shapes to keep (at least 1)
+        '''
+        self.rng = rng
+        self.randomizer = randomizer if randomizer is not None else UniformRandomizer()
+        self.size = max(1, size)
+        self._ring = [self.randomizer.draw(rng) for _ in range(self.size)]
+        self._head = 0
+
+    def pop(self):
+        ''' Take the front shape and draw a new one at the back '''
+        head = self._head
+        shape = self._ring[head]
+        self._ring[head] = self.randomizer.draw(self.rng)
+        self._head = (head + 1) % self.size
+        return shape
+
+    def peek(self, index=0):
+        ''' The shape index places from the front (0 = the next piece) '''
+        return self._ring[(self._head + index) % self.size]
+
+    def preview(self):
+        ''' All upcoming shapes, next piece first '''
+        head = self._head
+        return tuple(self._ring[head:] + self._ring[:head])
+
+    def getstate(self):
+        ''' Hashable queue state (the RNG state is saved by its owner) '''
+        return (self.preview(), self.randomizer.getstate())
+
+    def setstate(self, state):
+        ''' Restore a state returned by getstate() '''
+        shapes, randomizer_state = state
+        self._ring = list(shapes)
+        self.size = len(self._ring)
+        self._head = 0
+        self.randomizer.setstate(randomizer_state)
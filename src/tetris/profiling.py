@@ -0,0 +1,310 @@
+'''
+Optional per-frame timing of the game loop
+
+A Profiler wraps Game.handle_input, Game.update, Game.render and
+Game._lock_piece on one game instance and records how long every call
+took into fixed-bucket latency histograms. Nothing is wrapped unless
+attach() is called, so a game without a profiler runs exactly the same
+code as before.
+
+A LatencyProbe measures input responsiveness instead: how long each key
+took from being read to reaching the terminal in a flushed frame, and how
+many keys never showed up on their own.
+
+Usage:
+    python -m tetris --profile                 # p50/p99 overlay line
+    python -m tetris --profile-out timings.txt # also write a report on exit
+    python -m tetris --latency-out latency.txt # input-to-screen latency report
+'''
+import time
+
+# Number of sub-buckets per power of two (4 = buckets at most 25% wide)
+_SUB_BUCKETS = 4
+# Highest power of two tracked: 2**26 us = about 67 seconds
+_MAX_POWER = 26
+# Number of log-linear buckets, shared by Histogram and stats.Sketch
+BUCKET_COUNT = (_MAX_POWER + 1) * _SUB_BUCKETS
+
+
+def bucket_index(value):
+    '''
+    Log-linear bucket holding a non-negative integer
+
+    Args:
+        value (int): The value (microseconds for Histogram)
+
+    Returns:
+        int: Bucket index below BUCKET_COUNT
+    '''
+    if value < _SUB_BUCKETS:
+        return value
+    # Keep the top 3 bits: 4..7 scaled by a power of two
+    shift = value.bit_length() - 3
+    return min(BUCKET_COUNT - 1, shift * _SUB_BUCKETS + (value >> shift))
+
+
+def bucket_upper_bound(index):
+    ''' Largest value that falls into a bucket '''
+    if index < _SUB_BUCKETS:
+        return index
+    shift = index // _SUB_BUCKETS - 1
+    mantissa = index % _SUB_BUCKETS + _SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+class Histogram:
+    '''
+    Fixed-memory latency histogram with log-linear buckets
+
+    Recording is one list increment, so it is cheap enough to run on every
+    frame. Percentiles are accurate to the bucket width (at most 25%).
+
+    Attributes:
+        count (int): Number of recorded durations
+        total (float): Sum of all durations in seconds
+        max (float): Longest duration in seconds
+    '''
+
+    def __init__(self):
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds):
+        ''' Record one duration given in seconds '''
+        self.buckets[bucket_index(int(seconds * 1e6))] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent):
+        '''
+        Duration below which the given percentage of samples fall
+
+        Args:
+            percent (float): 0-100, e.g. 99 for p99
+
+        Returns:
+            float: Seconds (upper edge of the bucket), 0.0 when empty
+        '''
+        if not self.count:
+            return 0.0
+        rank = max(1, int(self.count * percent / 100.0 + 0.5))
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return min(bucket_upper_bound(index) / 1e6, self.max)
+        return self.max
+
+    def mean(self):
+        ''' Average duration in seconds '''
+        return self.total / self.count if self.count else 0.0
+
+
+class Profiler:
+    '''
+    Times the main game loop sections of one Game
+
+    Each section's time leaves out the timed sections it calls: the
+    update() that handle_input runs before applying a key, or a piece
+    locked by a hard drop, count only under "upd" and "lock". So the
+    sections add up to the loop's time instead of overlapping.
+
+    Attributes:
+        histograms (dict): Section name -> Histogram
+    '''
+
+    # Game methods that get timed, with the short labels of the overlay
+    SECTIONS = (
+        ('handle_input', 'in'),
+        ('update', 'upd'),
+        ('render', 'rnd'),
+        ('_lock_piece', 'lock'),
+    )
+
+    def __init__(self):
+        self.histograms = {name: Histogram() for name, _ in self.SECTIONS}
+        self._nested = 0.0  # Time spent in timed calls inside the current one
+
+    def attach(self, game):
+        '''
+        Start timing a game by wrapping its methods on that instance only
+
+        Args:
+            game (Game): The game to instrument
+        '''
+        for name, _ in self.SECTIONS:
+            setattr(game, name, self._timed(getattr(game, name), self.histograms[name]))
+        game.profiler = self
+
+    def _timed(self, method, histogram):
+        ''' Wrap a bound method so every call's own time is recorded in histogram '''
+        clock = time.perf_counter
+
+        def timed(*args, **kwargs):
+            outer = self._nested
+            self._nested = 0.0
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                histogram.add(elapsed - self._nested)
+                self._nested = outer + elapsed
+
+        return timed
+
+    def overlay_line(self):
+        ''' One short status line: p50/p99 per section in milliseconds '''
+        parts = []
+        for name, label in self.SECTIONS:
+            histogram = self.histograms[name]
+            parts.append(f"{label} {histogram.percentile(50) * 1e3:.1f}/"
+                         f"{histogram.percentile(99) * 1e3:.1f}")
+        return "p50/p99 ms: " + " ".join(parts)
+
+    def report(self):
+        ''' Multi-line table with count, mean, p50, p99 and max per section '''
+        lines = [f"{'section':<14}{'calls':>9}{'mean ms':>10}{'p50 ms':>9}{'p99 ms':>9}{'max ms':>9}"]
+        for name, _ in self.SECTIONS:
+            histogram = self.histograms[name]
+            lines.append(f"{name:<14}{histogram.count:>9}{histogram.mean() * 1e3:>10.3f}"
+                         f"{histogram.percentile(50) * 1e3:>9.3f}"
+                         f"{histogram.percentile(99) * 1e3:>9.3f}{histogram.max * 1e3:>9.3f}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        ''' Write the report to a file '''
+        with open(path, 'w') as report_file:
+            report_file.write(self.report())
+
+
+class LatencyProbe:
+    '''
+    Input-to-screen latency of the interactive game
+
+    Game.handle_input stamps every key right after getch() returns it.
+    Game.render reports when a frame has been flushed to the terminal
+    (curses.doupdate or the stdout write has returned). Every key whose
+    state change is in that frame gets one latency sample. A held key's
+    autorepeats move nothing by themselves: they wait for the next auto
+    shift that lands and are dropped if the key is released first. The samples
+    cover the game's own share of the latency: waiting in the loop,
+    updating and rendering. The time a key spends in the terminal, the
+    network (SSH) or the tty buffer before getch(), and the time the
+    terminal takes to paint the frame, happen outside the process. To
+    compare those, run the same probe in each setup.
+
+    Attributes:
+        latency (Histogram): Read-to-flush time of every key that changed the screen
+        inputs (int): Keys that mapped to a game action
+        dropped (int): Keys that changed nothing (blocked moves, autorepeats
+                       whose key was released before an auto shift landed)
+        coalesced (int): Keys flushed in the same frame as an earlier key
+    '''
+
+    def __init__(self, clock=time.perf_counter):
+        '''
+        Args:
+            clock (callable): Monotonic clock in seconds
+        '''
+        self.clock = clock
+        self.latency = Histogram()
+        self.inputs = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.frames = 0  # Flushed frames that showed at least one key
+        self._pending = []  # Read stamps of keys not flushed yet
+        self._deferred = []  # Read stamps of autorepeats waiting for an auto shift
+        self.start = clock()
+
+    def attach(self, game):
+        '''
+        Start measuring a game
+
+        Args:
+            game (Game): The game to measure
+        '''
+        game.latency = self
+        self.start = self.clock()
+
+    def input_applied(self, read_at, changed, deferred=False):
+        '''
+        A key was read at read_at and its action applied
+
+        Args:
+            read_at (float): clock() right after the key was read
+            changed (bool): Whether the action changed what the screen shows
+            deferred (bool): The key is an autorepeat that a later auto shift
+                             will show (see shift_landed)
+        '''
+        self.inputs += 1
+        if changed:
+            self._pending.append(read_at)
+        elif deferred:
+            self._deferred.append(read_at)
+        else:
+            self.dropped += 1
+
+    def shift_landed(self):
+        ''' An auto shift moved the piece: the autorepeats before it are on screen next '''
+        self._pending.extend(self._deferred)
+        self._deferred = []
+
+    def shift_released(self):
+        ''' The held key was released: its autorepeats never moved anything '''
+        self.dropped += len(self._deferred)
+        self._deferred = []
+
+    def flushed(self):
+        ''' A frame has been handed to the terminal '''
+        if not self._pending:
+            return
+        now = self.clock()
+        for read_at in self._pending:
+            self.latency.add(now - read_at)
+        self.coalesced += len(self._pending) - 1
+        self.frames += 1
+        self._pending = []
+
+    def rates(self):
+        '''
+        Per-second input counts since the probe was attached
+
+        Returns:
+            dict: inputs, dropped and coalesced keys per second
+        '''
+        elapsed = max(self.clock() - self.start, 1e-9)
+        return {'inputs': self.inputs / elapsed, 'dropped': self.dropped / elapsed,
+                'coalesced': self.coalesced / elapsed}
+
+    def overlay_line(self):
+        ''' One short status line: latency p50/p99 and drop/coalesce rates '''
+        rates = self.rates()
+        return (f"key->screen ms p50 {self.latency.percentile(50) * 1e3:.1f} "
+                f"p99 {self.latency.percentile(99) * 1e3:.1f}  "
+                f"drop/s {rates['dropped']:.1f} coal/s {rates['coalesced']:.1f}")
+
+    def report(self):
+        ''' Multi-line latency distribution and input counts '''
+        latency = self.latency
+        rates = self.rates()
+        lines = [
+            f"Inputs: {self.inputs} ({rates['inputs']:.1f}/s)  "
+            f"Dropped: {self.dropped} ({rates['dropped']:.2f}/s)  "
+            f"Coalesced: {self.coalesced} ({rates['coalesced']:.2f}/s)",
+            f"{'key->screen':<14}{'samples':>9}{'mean ms':>10}{'p50 ms':>9}"
+            f"{'p90 ms':>9}{'p99 ms':>9}{'max ms':>9}",
+            f"{'':<14}{latency.count:>9}{latency.mean() * 1e3:>10.3f}"
+            f"{latency.percentile(50) * 1e3:>9.3f}{latency.percentile(90) * 1e3:>9.3f}"
+            f"{latency.percentile(99) * 1e3:>9.3f}{latency.max * 1e3:>9.3f}",
+        ]
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path):
+        ''' Write the report to a file '''
+        with open(path, 'w') as report_file:
+            report_file.write(self.report())
@@ -0,0 +1,329 @@
+'''
+Terminal renderers for the game
+
+CursesRenderer keeps the text of the last frame and only writes the parts
+of the screen that changed, using noutrefresh()/doupdate() so curses sends
+one batched update per frame instead of clearing and redrawing everything.
+
+AnsiRenderer is the fallback without curses. It builds each frame as text
+with ANSI colour codes and sends it with a single write, optionally with
+only the lines that changed (placed with cursor-positioning escapes).
+'''
+import curses
+import sys
+
+from .config import COLORS
+
+# Screen layout (same positions the game always used)
+HEADER = "TETRIS - Q:Quit Arrows:Move R:Rotate Space:Drop"
+BOARD_TOP = 2   # Screen row of the first board row
+BOARD_LEFT = 2  # Screen column of the first board cell
+PREVIEW_LEFT = 12
+GHOST = "::"  # Where the falling piece would land
+
+
+class CursesRenderer:
+    '''
+    Draws a Game into a curses window, touching only changed screen cells
+
+    A frame is a dict of screen row -> (column, text), one text per row.
+    Rendering compares it with the previous frame and, for every row that
+    differs, writes just the span between the first and last changed
+    character.
+    '''
+
+    def __init__(self, stdscr):
+        '''
+        Args:
+            stdscr: curses window to draw into
+        '''
+        self.stdscr = stdscr
+        self._last_frame = {}
+        self._last_size = None
+
+    def invalidate(self):
+        ''' Forget the last frame so the next render redraws everything '''
+        self._last_frame = {}
+        self._last_size = None
+
+    def build_frame(self, game, max_y):
+        '''
+        Lay out the whole game screen as text
+
+        Args:
+            game (Game): The game to draw
+            max_y (int): Number of rows in the window
+
+        Returns:
+            dict: Screen row -> (column, text)
+        '''
+        board = game.board
+        frame = {0: (0, HEADER)}
+        border = "+" + "-" * board.width * 2 + "+"
+        frame[BOARD_TOP - 1] = (BOARD_LEFT - 1, border)
+
+        # Cells covered by the falling piece and by its landing preview
+        piece = game.current_piece
+        piece_cells = set(piece.blocks)
+        drop = board.drop_distance(piece)
+        ghost_cells = set((x, y + drop) for x, y in piece_cells) if drop else set()
+
+        visible_rows = min(20, board.height)  # Limit to 20 rows max
+        for y in range(visible_rows):
+            if BOARD_TOP + y >= max_y - 5:  # Don't draw beyond screen
+                break
+            row = board.grid[y]
+            cells = []
+            for x in range(board.width):
+                if row[x] or (x, y) in piece_cells:
+                    cells.append("[]")
+                elif (x, y) in ghost_cells:
+                    cells.append(GHOST)
+                else:
+                    cells.append("  ")
+            frame[BOARD_TOP + y] = (BOARD_LEFT - 1, "|" + "".join(cells) + "|")
+
+        # Draw bottom border if we have space
+        if BOARD_TOP + visible_rows < max_y - 2:
+            frame[BOARD_TOP + visible_rows] = (BOARD_LEFT - 1, border)
+
+        # Simple game info
+        info_line = BOARD_TOP + visible_rows + 2
+        frame[info_line] = (0, f"Score:{game.score} Level:{game.level} Lines:{game.lines_cleared}")
+        if game.game_over:
+            frame[info_line + 1] = (0, "GAME OVER!")
+
+        # Next piece preview
+        preview_line = info_line + 3
+        later = game.pieces.preview()[1:]
+        frame[preview_line] = (0, "Next Piece:" + (" then " + " ".join(later) if later else ""))
+        for y, shape_row in enumerate(game.next_piece.shape):
+            text = "".join("██" if cell else "  " for cell in shape_row).rstrip()
+            if text:
+                start = len(text) - len(text.lstrip())
+                frame[preview_line + y + 1] = (PREVIEW_LEFT + start, text.lstrip())
+
+        # Timing overlay when the game is being profiled
+        if game.profiler is not None:
+            frame[preview_line + 6] = (0, game.profiler.overlay_line())
+        if game.latency is not None:
+            frame[preview_line + 7] = (0, game.latency.overlay_line())
+
+        return {y: line for y, line in frame.items() if y < max_y}
+
+    def render(self, game):
+        '''
+        Draw the game, writing only what changed since the previous call
+
+        Args:
+            game (Game): The game to draw
+        '''
+        size = self.stdscr.getmaxyx()
+        if size != self._last_size:
+            # New or resized window: start from a blank screen
+            self.stdscr.clear()
+            self._last_frame = {}
+            self._last_size = size
+
+        frame = self.build_frame(game, size[0])
+        last_frame = self._last_frame
+
+        for y, (x, text) in frame.items():
+            old = last_frame.get(y)
+            if old is None:
+                self._write(y, x, text)
+            elif old != (x, text):
+                self._write_changes(y, old, x, text)
+
+        # Blank out rows that are no longer drawn
+        for y, (x, text) in last_frame.items():
+            if y not in frame:
+                self._write(y, x, " " * len(text))
+
+        self._last_frame = frame
+        self.stdscr.noutrefresh()
+        curses.doupdate()
+
+    def _write_changes(self, y, old, x, text):
+        ''' Rewrite only the differing span between the old and new row text '''
+        old_x, old_text = old
+        if old_x != x:
+            # Content moved sideways: clear the old text, then write the new
+            self._write(y, old_x, " " * len(old_text))
+            self._write(y, x, text)
+            return
+
+        # Pad the shorter text with spaces so leftovers get erased
+        length = max(len(text), len(old_text))
+        new_line = text.ljust(length)
+        old_line = old_text.ljust(length)
+        if new_line == old_line:
+            return
+
+        first = 0
+        while new_line[first] == old_line[first]:
+            first += 1
+        last = length - 1
+        while new_line[last] == old_line[last]:
+            last -= 1
+        self._write(y, x + first, new_line[first:last + 1])
+
+    def _write(self, y, x, text):
+        ''' Write text if it fits in the window, ignoring curses edge errors '''
+        max_y, max_x = self.stdscr.getmaxyx()
+        if 0 <= y < max_y and 0 <= x and x + len(text) <= max_x:
+            try:
+                self.stdscr.addstr(y, x, text)
+            except curses.error:
+                pass
+
+
+# ANSI escape sequences used by AnsiRenderer
+CLEAR_SCREEN = "\033[2J\033[H"
+RESET = "\033[0m"
+ERASE_LINE = "\033[K"  # Erase from the cursor to the end of the line
+BLOCK = "██"
+
+TEXT_HEADER = ("🎮 TERMINAL TETRIS 🎮",
+               "Controls: ← → ↓ Move | ↑/R Rotate | Space Hard Drop | Q Quit",
+               "")
+
+# Escape that switches on each piece colour
+_COLOR_CODES = {color: f"\033[{color}m" for color in COLORS.values()}
+
+# Most distinct row texts AnsiRenderer keeps before starting over
+ROW_CACHE_SIZE = 4096
+
+
+def _move_to(line):
+    ''' Escape that puts the cursor at the start of a screen line (0-based) '''
+    return f"\033[{line + 1};1H"
+
+
+class AnsiRenderer:
+    '''
+    Draws a Game as ANSI text to a stream, one write per frame
+
+    The first frame clears the screen and is written in full. With diff
+    enabled, later frames only contain the lines that changed, each
+    prefixed with a cursor move, and nothing is written when nothing
+    changed. Without diff every frame is a full redraw.
+    '''
+
+    def __init__(self, stream=None, diff=True):
+        '''
+        Args:
+            stream: Text stream to write to (None for sys.stdout)
+            diff (bool): Only send lines that changed since the last frame
+        '''
+        self.stream = stream if stream is not None else sys.stdout
+        self.diff = diff
+        self._last_lines = None
+        self._parts = []  # Reused for every frame, joined once per write
+        self._row_cache = {}  # Row colours -> text, for rows without the piece
+
+    def invalidate(self):
+        ''' Forget the last frame so the next render redraws everything '''
+        self._last_lines = None
+
+    def build_lines(self, game):
+        '''
+        Lay out the whole game screen as ANSI text lines
+
+        Args:
+            game (Game): The game to draw
+
+        Returns:
+            list: One string per screen line
+        '''
+        board = game.board
+        border = "+" + "-" * (board.width * 2) + "+"
+        lines = list(TEXT_HEADER)
+        lines.append(border)
+
+        piece = game.current_piece
+        piece_rows = {}
+        for x, y in piece.blocks:
+            if 0 <= y < board.height and 0 <= x < board.width:
+                piece_rows.setdefault(y, set()).add(x)
+
+        row_cache = self._row_cache
+        if len(row_cache) > ROW_CACHE_SIZE:
+            row_cache.clear()
+        for y, row in enumerate(board.grid):
+            piece_cells = piece_rows.get(y)
+            if piece_cells is None:
+                # Rows without the falling piece rarely change: reuse their text
+                key = tuple(row)
+                text = row_cache.get(key)
+                if text is None:
+                    text = row_cache[key] = self._row_text(row, piece, ())
+                lines.append(text)
+            else:
+                lines.append(self._row_text(row, piece, piece_cells))
+
+        lines.append(border)
+        lines.append(f"Score: {game.score}")
+        lines.append(f"Level: {game.level}")
+        lines.append(f"Lines: {game.lines_cleared}")
+        if game.game_over:
+            lines.append("GAME OVER!")
+
+        next_piece = game.next_piece
+        lines.append(f"Next Piece: {next_piece.shape_name}")
+        block = _COLOR_CODES.get(next_piece.color, "") + BLOCK + RESET
+        for shape_row in next_piece.shape:
+            lines.append("".join(block if cell else "  " for cell in shape_row))
+        return lines
+
+    @staticmethod
+    def _row_text(row, piece, piece_cells):
+        ''' One board row as text, with the piece drawn into piece_cells '''
+        parts = ["|"]
+        color = 0  # Colour currently switched on in this line (0 = none)
+        for x, cell in enumerate(row):
+            if x in piece_cells:
+                cell = piece.color
+            if cell != color:
+                parts.append(_COLOR_CODES.get(cell, "") if cell else RESET)
+                color = cell
+            parts.append(BLOCK if cell else "  ")
+        if color:
+            parts.append(RESET)
+        parts.append("|")
+        return "".join(parts)
+
+    def render(self, game):
+        '''
+        Write the game to the stream with a single write call
+
+        Args:
+            game (Game): The game to draw
+        '''
+        lines = self.build_lines(game)
+        last = self._last_lines
+        parts = self._parts
+        parts.clear()
+
+        if last is None or not self.diff:
+            parts.append(CLEAR_SCREEN)
+            for line in lines:
+                parts.append(line)
+                parts.append(ERASE_LINE + "\n")
+        else:
+            for y, line in enumerate(lines):
+                if y >= len(last) or line != last[y]:
+                    parts.append(_move_to(y))
+                    parts.append(line)
+                    parts.append(ERASE_LINE)
+            # Lines the previous frame had but this one doesn't (e.g. GAME OVER moved)
+            for y in range(len(lines), len(last)):
+                parts.append(_move_to(y))
+                parts.append(ERASE_LINE)
+            if parts:
+                parts.append(_move_to(len(lines)))  # Park the cursor below the frame
+
+        self._last_lines = lines
+        if parts:
+            self.stream.write("".join(parts))
+            self.stream.flush()
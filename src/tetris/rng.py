@@ -0,0 +1,75 @@
+'''
+Small-state random number generator for the piece sequence
+
+random.Random (Mersenne Twister) carries about 2.5 KB of state, which makes
+saving and restoring it the most expensive part of a game snapshot.
+SplitMix64 keeps a single 64-bit integer instead, so its state is cheap to
+copy, hash and store, while still passing the usual statistical tests.
+
+It subclasses random.Random, so choice(), shuffle(), randrange() and the
+rest of the familiar API work unchanged.
+'''
+import hashlib
+import os
+import random
+
+_MASK64 = (1 << 64) - 1
+
+
+class SplitMix64(random.Random):
+    '''
+    random.Random with a single 64-bit integer as its whole state
+
+    getstate() returns that integer, so snapshots of it are tiny and hashable.
+    '''
+
+    def __init__(self, seed=None):
+        self._state = 0
+        super().__init__(seed)
+
+    def seed(self, a=None, version=2):
+        '''
+        Reset the generator from a seed
+
+        Args:
+            a: int, str, bytes or None (None = seed from os.urandom)
+        '''
+        if a is None:
+            a = int.from_bytes(os.urandom(8), 'big')
+        elif not isinstance(a, int):
+            if isinstance(a, str):
+                a = a.encode()
+            a = int.from_bytes(hashlib.sha256(bytes(a)).digest()[:8], 'big')
+        self._state = a & _MASK64
+        self.gauss_next = None
+
+    def _next(self):
+        ''' Advance the state and return the next 64-bit output '''
+        self._state = state = (self._state + 0x9E3779B97F4A7C15) & _MASK64
+        state = ((state ^ (state >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        state = ((state ^ (state >> 27)) * 0x94D049BB133111EB) & _MASK64
+        return state ^ (state >> 31)
+
+    def random(self):
+        ''' Float in [0.0, 1.0) from the top 53 bits of one output '''
+        return (self._next() >> 11) * (1.0 / (1 << 53))
+
+    def getrandbits(self, k):
+        ''' Integer with k random bits '''
+        if k <= 64:
+            return self._next() >> (64 - k)
+        value = 0
+        bits = 0
+        while bits < k:
+            value = (value << 64) | self._next()
+            bits += 64
+        return value >> (bits - k)
+
+    def getstate(self):
+        ''' The whole generator state as one int '''
+        return self._state
+
+    def setstate(self, state):
+        ''' Restore a state returned by getstate() '''
+        self._state = state
+        self.gauss_next = None
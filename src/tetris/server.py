@@ -0,0 +1,380 @@
+'''
+Multiplayer game server: many Game sessions on one asyncio event loop
+
+Every connection gets its own headless Game. Nothing blocks and nothing
+polls. Player input arrives as lines on the socket, and each session's
+gravity is a timer on the event loop, re-armed after every drop with the
+game's current drop interval. One process (one core) can serve hundreds
+of sessions this way instead of running one Game.run busy loop per player.
+
+Protocol (ASCII, one message per line):
+    client -> server
+        left | right | rotate | drop | hard_drop   apply an action
+        state                                     ask for the current state
+        quit                                      end the session
+    server -> client
+        hello <session id> <seed>
+        state <score> <level> <lines> <pieces> <piece> <rotation> <x> <y>
+              <next> <game over 0/1> <rows>
+        error <message>
+        over <score>
+
+<rows> is the board as Board.rows bitmasks in hex, top to bottom,
+separated by commas. A state line is sent after every change, whether it
+came from the player or from gravity. Gravity states are skipped while a
+slow player still has more than MAX_WRITE_BUFFER bytes unsent; the next
+state after that carries the whole board anyway. When the game ends the server sends
+the final state, then "over", and closes the connection. With a high-score
+store, the final score is queued there too (the loop never waits on disk).
+
+Usage:
+    python -m tetris.server --port 7777
+    python -m tetris.server --unix /tmp/tetris.sock --seed 42
+    python -m tetris.server --scores /srv/tetris/scores
+'''
+import argparse
+import asyncio
+from collections import namedtuple
+
+from .game import ACTIONS, Game
+from .highscores import HighScoreStore, score_from_game
+from .rng import SplitMix64
+
+# Pending connections the listening socket queues (the default of 100 makes
+# a burst of hundreds of players wait on SYN retries)
+LISTEN_BACKLOG = 1024
+
+# Unsent bytes above which a session stops pushing gravity states to its
+# player, so a client that doesn't read can't make the server buffer
+# without limit
+MAX_WRITE_BUFFER = 64 * 1024
+
+# A decoded "state" line
+StateMessage = namedtuple('StateMessage', [
+    'score', 'level', 'lines', 'pieces',
+    'piece', 'rotation', 'x', 'y', 'next_piece', 'game_over',
+    'rows',
+])
+
+
+def encode_state(game):
+    ''' The "state" line for a game (without the newline) '''
+    piece = game.current_piece
+    rows = ','.join(format(mask, 'x') for mask in game.board.rows)
+    return (f"state {game.score} {game.level} {game.lines_cleared} {game.pieces_placed} "
+            f"{piece.shape_name} {piece.rotation} {piece.x} {piece.y} "
+            f"{game.next_piece.shape_name} {int(game.game_over)} {rows}")
+
+
+def decode_state(line):
+    '''
+    Parse a line written by encode_state
+
+    Returns:
+        StateMessage: The decoded state
+
+    Raises:
+        ValueError: if the line is not a well-formed state message
+    '''
+    fields = line.split()
+    if len(fields) != 12 or fields[0] != 'state':
+        raise ValueError(f"Not a state message: {line!r}")
+    score, level, lines, pieces = (int(value) for value in fields[1:5])
+    rotation, x, y = (int(value) for value in fields[6:9])
+    rows = tuple(int(mask, 16) for mask in fields[11].split(','))
+    return StateMessage(score, level, lines, pieces, fields[5], rotation, x, y,
+                        fields[9], fields[10] == '1', rows)
+
+
+class Session:
+    '''
+    One player's game, driven by socket input and an event-loop timer
+
+    Attributes:
+        session_id (int): Number of the session on its server
+        seed (int): Seed of the game's piece generator
+        game (Game): The headless game being played
+        skipped_states (int): Gravity states not sent because the player
+                              was too slow to read them
+    '''
+
+    def __init__(self, session_id, seed, writer, loop, speed=1.0, scores=None):
+        '''
+        Args:
+            session_id (int): Number of the session on its server
+            seed (int): Seed for the game's RNG
+            writer (asyncio.StreamWriter): Connection to the player
+            loop: Event loop that runs the gravity timer
+            speed (float): Gravity speed factor (2.0 = pieces fall twice as fast)
+            scores (HighScoreStore): Where finished games are recorded (None = nowhere)
+        '''
+        self.session_id = session_id
+        self.seed = seed
+        self.game = Game(rng=SplitMix64(seed))
+        self.writer = writer
+        self.loop = loop
+        self.speed = speed
+        self.scores = scores
+        self.skipped_states = 0
+        self._gravity_timer = None
+
+    def start(self):
+        ''' Greet the player, send the first state and start gravity '''
+        self.send(f"hello {self.session_id} {self.seed}")
+        self.send(encode_state(self.game))
+        self._schedule_gravity()
+
+    def stop(self):
+        ''' Cancel the gravity timer '''
+        if self._gravity_timer is not None:
+            self._gravity_timer.cancel()
+            self._gravity_timer = None
+
+    def send(self, line):
+        ''' Queue one line for the player (flushed by the loop) '''
+        self.writer.write(line.encode('ascii') + b"\n")
+
+    def _schedule_gravity(self):
+        self._gravity_timer = self.loop.call_later(
+            self.game.drop_interval / self.speed, self._on_gravity)
+
+    def _on_gravity(self):
+        ''' Timer callback: one gravity drop, then re-arm the timer '''
+        self._gravity_timer = None
+        self.game.gravity_drop()
+        if self.game.game_over:
+            self.send(encode_state(self.game))
+            self._finish()
+            return
+        if self.writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            self.skipped_states += 1
+        else:
+            self.send(encode_state(self.game))
+        self._schedule_gravity()
+
+    def _finish(self):
+        self.stop()
+        self.send(f"over {self.game.score}")
+        self.writer.close()
+        if self.scores is not None:
+            self.scores.submit(score_from_game(self.game, self.seed))
+
+    def handle(self, command):
+        '''
+        Apply one command line from the player
+
+        Args:
+            command (str): The line, without its newline
+
+        Returns:
+            bool: False when the session is over
+        '''
+        if self.game.game_over:
+            return False
+        if command == 'quit':
+            return False
+        if command == 'state':
+            self.send(encode_state(self.game))
+        elif command in ACTIONS:
+            self.game.apply_action(command)
+            self.send(encode_state(self.game))
+            if self.game.game_over:
+                self._finish()
+                return False
+        elif command:
+            self.send(f"error unknown command {command}")
+        return True
+
+
+class GameServer:
+    '''
+    Accepts connections and runs one Session per connection
+
+    Attributes:
+        sessions (dict): Open sessions by session id
+        server (asyncio.AbstractServer): The listening server once started
+    '''
+
+    def __init__(self, seed=None, speed=1.0, scores=None):
+        '''
+        Args:
+            seed (int): Seed that the session seeds are drawn from (None = random)
+            speed (float): Gravity speed factor for every session
+            scores (HighScoreStore): Where finished games are recorded (None = nowhere)
+        '''
+        self.speed = speed
+        self.scores = scores
+        self.sessions = {}
+        self.server = None
+        self._seeds = SplitMix64(seed)
+        self._next_id = 1
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        '''
+        Start listening on a TCP port, or on a Unix socket when path is given
+
+        Args:
+            host (str): Interface to bind for TCP
+            port (int): TCP port (0 = pick a free one, see address())
+            path (str): Unix socket path (overrides host and port)
+        '''
+        if path is not None:
+            self.server = await asyncio.start_unix_server(
+                self._handle_client, path, backlog=LISTEN_BACKLOG)
+        else:
+            self.server = await asyncio.start_server(
+                self._handle_client, host, port, backlog=LISTEN_BACKLOG)
+
+    def address(self):
+        ''' Address the server is listening on ((host, port) or socket path) '''
+        return self.server.sockets[0].getsockname()
+
+    def close(self):
+        ''' Stop accepting connections and end every session '''
+        for session in list(self.sessions.values()):
+            session.stop()
+            session.writer.close()
+        self.sessions.clear()
+        self.server.close()
+
+    async def wait_closed(self):
+        await self.server.wait_closed()
+
+    def _new_session(self, writer):
+        session = Session(self._next_id, self._seeds.getrandbits(32), writer,
+                          asyncio.get_running_loop(), self.speed, self.scores)
+        self.sessions[session.session_id] = session
+        self._next_id += 1
+        return session
+
+    async def _handle_client(self, reader, writer):
+        session = self._new_session(writer)
+        session.start()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break  # The player disconnected
+                if not session.handle(line.decode('ascii', 'replace').strip()):
+                    break
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            session.stop()
+            self.sessions.pop(session.session_id, None)
+            writer.close()
+
+
+class GameClient:
+    '''
+    Minimal client for the server protocol (used by tests and load runs)
+
+    Attributes:
+        session_id (int): Session number from the server's hello
+        seed (int): Seed of the server-side game
+    '''
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.session_id = None
+        self.seed = None
+
+    @classmethod
+    async def connect(cls, host='127.0.0.1', port=0, path=None):
+        '''
+        Connect to a server and read its greeting
+
+        Args:
+            host (str): Server host for TCP
+            port (int): Server port for TCP
+            path (str): Unix socket path (overrides host and port)
+
+        Returns:
+            GameClient: The connected client
+        '''
+        if path is not None:
+            reader, writer = await asyncio.open_unix_connection(path)
+        else:
+            reader, writer = await asyncio.open_connection(host, port)
+        client = cls(reader, writer)
+        kind, fields = await client.read_message()
+        if kind != 'hello':
+            raise ValueError(f"Expected hello, got {kind}")
+        client.session_id, client.seed = int(fields[0]), int(fields[1])
+        return client
+
+    def send(self, command):
+        ''' Send one command line ('left', 'state', 'quit', ...) '''
+        self.writer.write(command.encode('ascii') + b"\n")
+
+    async def read_message(self):
+        '''
+        Read the next line from the server
+
+        Returns:
+            tuple: (kind, payload) where payload is a StateMessage for "state"
+                   lines and the list of remaining words otherwise, or
+                   (None, None) once the server closed the connection
+        '''
+        line = await self.reader.readline()
+        if not line:
+            return None, None
+        line = line.decode('ascii').strip()
+        kind = line.split(' ', 1)[0]
+        if kind == 'state':
+            return kind, decode_state(line)
+        return kind, line.split()[1:]
+
+    async def read_state(self):
+        ''' Skip to the next state message and return it (None when closed) '''
+        while True:
+            kind, payload = await self.read_message()
+            if kind is None or kind == 'state':
+                return payload
+
+    def close(self):
+        self.writer.close()
+
+
+async def serve(host='127.0.0.1', port=7777, path=None, seed=None, scores_path=None):
+    ''' Run a server until cancelled '''
+    scores = HighScoreStore(scores_path) if scores_path else None
+    server = GameServer(seed, scores=scores)
+    await server.start(host, port, path)
+    print(f"Serving Tetris on {server.address()}")
+    try:
+        await asyncio.Event().wait()  # Serve until the task is cancelled
+    finally:
+        server.close()
+        if scores is not None:
+            scores.close()
+
+
+def main(argv=None):
+    ''' Command line entry point '''
+    parser = argparse.ArgumentParser(description="Host Tetris games over a socket")
+    parser.add_argument('--host', default='127.0.0.1', help="interface to listen on")
+    parser.add_argument('--port', type=int, default=7777, help="TCP port")
+    parser.add_argument('--unix', metavar='PATH', default=None,
+                        help="listen on a Unix socket instead of TCP")
+    parser.add_argument('--seed', type=int, default=None,
+                        help="seed that the session seeds are drawn from")
+    parser.add_argument('--scores', metavar='FILE', default=None,
+                        help="record finished games in this high-score file")
+    args = parser.parse_args(argv)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(serve(args.host, args.port, args.unix, args.seed,
+                                          args.scores))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,264 @@
+'''
+Headless, deterministic game simulation
+
+Runs the normal Game logic (Board, Tetromino and Game scoring) without
+curses, printing or sleeping. Time is measured in logical ticks instead of
+seconds (one tick is one Game.tick() frame), and pieces come from a seeded
+RNG, so the same seed and the same inputs always produce the same game.
+
+Usage:
+    python -m tetris.sim --games 10000 --policy random --target 500
+'''
+import argparse
+import random
+import time
+from collections import namedtuple
+
+from .config import FRAMES_PER_SECOND
+from .game import Game, ACTIONS
+from .pieces import RANDOMIZERS, make_randomizer
+from .stats import GameStats, StatsAggregator
+from .rng import SplitMix64
+
+# Logical ticks per second - one tick is one frame of the interactive game
+TICKS_PER_SECOND = FRAMES_PER_SECOND
+
+# Final outcome of one simulated game
+SimResult = namedtuple('SimResult', ['seed', 'score', 'lines', 'level', 'pieces', 'ticks'])
+
+
+class Simulation:
+    '''
+    A single headless game advanced one logical tick at a time
+
+    Attributes:
+        seed: Seed of the piece RNG
+        game (Game): The underlying game (no curses window)
+        tick (int): Number of ticks simulated so far
+    '''
+
+    def __init__(self, seed=None, randomizer='uniform', preview=1):
+        '''
+        Start a new headless game
+
+        Args:
+            seed: Seed for the piece generator (same seed = same pieces)
+            randomizer (str): One of pieces.RANDOMIZERS
+            preview (int): Number of upcoming pieces the game keeps
+        '''
+        self.seed = seed
+        self.game = Game(rng=SplitMix64(seed), randomizer=make_randomizer(randomizer),
+                         preview=preview)
+        self.tick = 0
+
+    def step(self, action=None):
+        '''
+        Advance the game by one tick: apply the action, then Game.tick()
+
+        Args:
+            action (str): A name from game.ACTIONS, or None for no input
+
+        Returns:
+            bool: True while the game is still running
+        '''
+        game = self.game
+        if game.game_over:
+            return False
+
+        if action is not None:
+            game.apply_action(action)
+
+        self.tick += 1
+        game.tick()
+        return not game.game_over
+
+    def result(self):
+        ''' Summarize the game so far as a SimResult '''
+        game = self.game
+        return SimResult(self.seed, game.score, game.lines_cleared, game.level,
+                         game.pieces_placed, self.tick)
+
+
+def simulate(seed, actions=None, policy=None, max_ticks=100000, randomizer='uniform',
+             stats=None):
+    '''
+    Play one game headlessly until game over or max_ticks
+
+    Args:
+        seed: Seed for the piece generator
+        actions (iterable): Actions to apply, one per tick (None = no input).
+                            When the stream runs out only gravity is applied.
+        policy (callable): Called as policy(game) every tick and returns an
+                           action or None. Takes precedence over actions.
+        max_ticks (int): Safety limit on the game length
+        randomizer (str): Piece randomizer, one of pieces.RANDOMIZERS
+        stats (StatsAggregator): Record the game's statistics and fold them in
+
+    Returns:
+        SimResult: Final score, lines, level, pieces placed and ticks
+    '''
+    sim = Simulation(seed, randomizer)
+    if stats is not None:
+        game_stats = GameStats(clock=lambda: sim.tick)
+        game_stats.attach(sim.game)
+    actions = iter(actions) if actions is not None else None
+
+    while sim.tick < max_ticks:
+        if policy is not None:
+            action = policy(sim.game)
+        elif actions is not None:
+            action = next(actions, None)
+        else:
+            action = None
+        if not sim.step(action):
+            break
+
+    if stats is not None:
+        stats.add(game_stats, sim.game.score, sim.game.lines_cleared)
+    return sim.result()
+
+
+class RandomPolicy:
+    '''
+    Presses a random key (or nothing) every tick
+
+    Uses its own seeded RNG so it never disturbs the piece sequence.
+    '''
+
+    def __init__(self, seed=None, idle_weight=3):
+        self.rng = random.Random(seed)
+        # Doing nothing most ticks keeps games from ending after a few hard drops
+        self.choices = list(ACTIONS) + [None] * idle_weight
+
+    def __call__(self, game):
+        return self.rng.choice(self.choices)
+
+
+class GreedyPolicy:
+    '''
+    Places every piece at the best spot found by Board.get_placements
+
+    Each placement is rated once when a new piece appears (more lines,
+    lower landing and fewer covered holes are better), then the policy
+    presses one key per tick: rotate, shift, and finally hard drop.
+    '''
+
+    def __init__(self):
+        self.plan = []
+        self.planned_for = None  # pieces_placed value the plan belongs to
+
+    def _rate(self, board, piece, placement):
+        ''' Higher is better: clear lines, stay low, don't cover holes '''
+        state = piece.rotations[placement.rotation]
+        covered = 0
+        for dx, bottom in state.bottoms:
+            below = placement.y + bottom + 1
+            if below < board.height and not board.rows[below] >> (placement.x + dx) & 1:
+                covered += 1
+        return placement.lines_cleared * 100 + placement.y * 2 - covered * 8
+
+    def _make_plan(self, game):
+        ''' Turn the best placement into a list of key presses '''
+        piece = game.current_piece
+        placements = game.board.get_placements(piece)
+        if not placements:
+            return ['hard_drop']
+        best = max(placements, key=lambda p: self._rate(game.board, piece, p))
+        rotations = (best.rotation - piece.rotation) % 4
+        shift = best.x - piece.x
+        step = 'right' if shift > 0 else 'left'
+        return ['hard_drop'] + [step] * abs(shift) + ['rotate'] * rotations
+
+    def __call__(self, game):
+        if self.planned_for != game.pieces_placed:
+            self.planned_for = game.pieces_placed
+            self.plan = self._make_plan(game)
+        return self.plan.pop() if self.plan else None
+
+
+# Policies available by name to make_policy and the command line tools
+POLICIES = ('idle', 'random', 'greedy')
+
+
+def make_policy(name, seed=None):
+    '''
+    Build a policy by name
+
+    Args:
+        name (str): One of POLICIES - 'idle' (no input), 'random' or 'greedy'
+        seed: Seed for the 'random' policy (the others are deterministic)
+
+    Returns:
+        callable or None: The policy callback (None for 'idle')
+
+    Raises:
+        ValueError: if the policy name is unknown
+    '''
+    if name == 'idle':
+        return None
+    if name == 'random':
+        return RandomPolicy(seed)
+    if name == 'greedy':
+        return GreedyPolicy()
+    raise ValueError(f"Unknown policy: {name}")
+
+
+def run_batch(seeds, policy_name='idle', max_ticks=100000, randomizer='uniform',
+              stats=None):
+    '''
+    Simulate one game per seed
+
+    Args:
+        seeds (iterable): Seeds to play
+        policy_name (str): Policy passed to make_policy for every game
+        max_ticks (int): Safety limit on each game's length
+        randomizer (str): Piece randomizer for every game
+        stats (StatsAggregator): Aggregate the statistics of every game into this
+
+    Yields:
+        SimResult: One result per seed, in order
+    '''
+    for seed in seeds:
+        yield simulate(seed, policy=make_policy(policy_name, seed), max_ticks=max_ticks,
+                       randomizer=randomizer, stats=stats)
+
+
+def main(argv=None):
+    ''' Command line entry point: run a batch and report games per second '''
+    parser = argparse.ArgumentParser(description="Run headless Tetris games")
+    parser.add_argument('--games', type=int, default=1000, help="number of games to play")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first game")
+    parser.add_argument('--policy', default='random', choices=POLICIES)
+    parser.add_argument('--randomizer', default='uniform', choices=RANDOMIZERS)
+    parser.add_argument('--stats', action='store_true',
+                        help="print piece, clear, stack and hole statistics")
+    parser.add_argument('--max-ticks', type=int, default=100000, help="tick limit per game")
+    parser.add_argument('--target', type=float, default=None,
+                        help="required games per second (exit status 1 when missed)")
+    args = parser.parse_args(argv)
+
+    stats = StatsAggregator() if args.stats else None
+    start = time.perf_counter()
+    total_score = 0
+    total_lines = 0
+    for result in run_batch(range(args.seed, args.seed + args.games), args.policy,
+                            args.max_ticks, args.randomizer, stats):
+        total_score += result.score
+        total_lines += result.lines
+    elapsed = time.perf_counter() - start
+
+    games_per_second = args.games / elapsed if elapsed > 0 else float('inf')
+    print(f"Games: {args.games}  Time: {elapsed:.2f}s  Games/s: {games_per_second:.1f}")
+    print(f"Mean score: {total_score / max(1, args.games):.1f}  "
+          f"Mean lines: {total_lines / max(1, args.games):.2f}")
+    if stats is not None:
+        print(stats.report(), end="")
+
+    if args.target is not None and games_per_second < args.target:
+        print(f"Below target of {args.target:.1f} games/s")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
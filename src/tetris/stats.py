@@ -0,0 +1,251 @@
+'''
+Streaming game statistics
+
+GameStats records the events of one game through two hooks: Board.clear_lines
+reports every clear, and Game._lock_piece reports every locked piece. It
+tracks pieces by type, clears by line count, the highest stack, the holes
+under the stack and the ticks each piece took. StatsAggregator folds any
+number of finished games into fixed-size counters and quantile sketches, so
+memory stays the same whether it has seen ten games or ten million.
+
+Nothing is recorded unless a GameStats is attached to a game.
+
+Usage:
+    python -m tetris.sim --games 10000 --policy greedy --stats
+'''
+from .config import TETROMINOS
+from .profiling import BUCKET_COUNT, bucket_index, bucket_upper_bound
+
+SHAPES = tuple(TETROMINOS)
+
+
+class Sketch:
+    '''
+    Fixed-memory quantile sketch for non-negative integers
+
+    Uses the same log-linear buckets as profiling.Histogram, so quantiles
+    are accurate to within 25% at any scale. Sketches merge by adding their
+    buckets.
+
+    Attributes:
+        count (int): Number of recorded values
+        total (int): Sum of all values
+        max (int): Largest value
+    '''
+
+    def __init__(self):
+        self.buckets = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value):
+        ''' Record one value '''
+        self.buckets[bucket_index(value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        ''' Add every value recorded by another sketch '''
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def quantile(self, percent):
+        '''
+        Value below which the given percentage of samples fall
+
+        Args:
+            percent (float): 0-100, e.g. 50 for the median
+
+        Returns:
+            int: Upper edge of the bucket (capped at max), 0 when empty
+        '''
+        if not self.count:
+            return 0
+        rank = max(1, int(self.count * percent / 100.0 + 0.5))
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return min(bucket_upper_bound(index), self.max)
+        return self.max
+
+    def mean(self):
+        ''' Average value '''
+        return self.total / self.count if self.count else 0.0
+
+
+class GameStats:
+    '''
+    Event recorder for a single game
+
+    Attributes:
+        pieces (dict): Shape name -> pieces of that shape locked
+        clears (list): clears[n] = number of clears of exactly n lines
+        max_height (int): Highest the stack has been
+        holes (Sketch): Covered empty cells, sampled after every lock
+        ticks_per_piece (Sketch): Ticks between consecutive locks
+    '''
+
+    def __init__(self, clock=None):
+        '''
+        Args:
+            clock (callable): Returns the current tick (default: RealTimeClock)
+        '''
+        if clock is None:
+            from .replay import RealTimeClock  # replay imports sim, which imports this module
+            clock = RealTimeClock()
+        self.clock = clock
+        self.pieces = dict.fromkeys(SHAPES, 0)
+        self.clears = [0] * 5
+        self.max_height = 0
+        self.holes = Sketch()
+        self.ticks_per_piece = Sketch()
+        self._last_lock = self.clock()
+
+    def attach(self, game):
+        '''
+        Start recording a game by installing the hooks on it and its board
+
+        Args:
+            game (Game): The game to record
+        '''
+        game.stats = self
+        game.board.stats = self
+        self._last_lock = self.clock()
+
+    def lines_cleared(self, count):
+        ''' Board.clear_lines hook: count lines were cleared at once '''
+        self.clears[count] += 1
+
+    def piece_locked(self, board, shape_name):
+        '''
+        Game._lock_piece hook: a piece was locked and lines were cleared
+
+        Args:
+            board (Board): The board after the clear
+            shape_name (str): Shape of the piece that was locked
+        '''
+        self.pieces[shape_name] += 1
+
+        now = self.clock()
+        self.ticks_per_piece.add(now - self._last_lock)
+        self._last_lock = now
+
+        heights = board.heights
+        stack = max(heights)
+        if stack > self.max_height:
+            self.max_height = stack
+        # Every cell under a column's top is either filled or a hole
+        filled = 0
+        for row in board.rows[board.height - stack:]:
+            filled += bin(row).count('1')
+        self.holes.add(sum(heights) - filled)
+
+    def piece_count(self):
+        ''' Total number of locked pieces '''
+        return sum(self.pieces.values())
+
+
+class StatsAggregator:
+    '''
+    Fixed-memory totals, means and quantiles over any number of games
+
+    Attributes:
+        games (int): Number of games folded in
+        pieces (dict): Shape name -> pieces locked over all games
+        clears (list): clears[n] = clears of exactly n lines over all games
+        score, lines, pieces_per_game, max_height (Sketch): One sample per game
+        holes, ticks_per_piece (Sketch): One sample per locked piece
+    '''
+
+    def __init__(self):
+        self.games = 0
+        self.pieces = dict.fromkeys(SHAPES, 0)
+        self.clears = [0] * 5
+        self.score = Sketch()
+        self.lines = Sketch()
+        self.pieces_per_game = Sketch()
+        self.max_height = Sketch()
+        self.holes = Sketch()
+        self.ticks_per_piece = Sketch()
+
+    def add(self, stats, score=0, lines=0):
+        '''
+        Fold in one finished game
+
+        Args:
+            stats (GameStats): The game's recorded events
+            score (int): The game's final score
+            lines (int): The game's total cleared lines
+        '''
+        self.games += 1
+        for shape, count in stats.pieces.items():
+            self.pieces[shape] += count
+        for size, count in enumerate(stats.clears):
+            self.clears[size] += count
+        self.score.add(score)
+        self.lines.add(lines)
+        self.pieces_per_game.add(stats.piece_count())
+        self.max_height.add(stats.max_height)
+        self.holes.merge(stats.holes)
+        self.ticks_per_piece.merge(stats.ticks_per_piece)
+
+    def merge(self, other):
+        ''' Combine with another aggregator (e.g. from a worker process) '''
+        self.games += other.games
+        for shape, count in other.pieces.items():
+            self.pieces[shape] += count
+        for size, count in enumerate(other.clears):
+            self.clears[size] += count
+        for name in ('score', 'lines', 'pieces_per_game', 'max_height',
+                     'holes', 'ticks_per_piece'):
+            getattr(self, name).merge(getattr(other, name))
+
+    def tetris_rate(self):
+        ''' Share of cleared lines that were cleared four at a time '''
+        lines = sum(size * count for size, count in enumerate(self.clears))
+        return 4 * self.clears[4] / lines if lines else 0.0
+
+    def summary(self):
+        '''
+        All aggregates as plain numbers
+
+        Returns:
+            dict: Counts, tetris rate, and mean/p50/p99/max per sketch
+        '''
+        result = {
+            'games': self.games,
+            'pieces': dict(self.pieces),
+            'clears': {size: self.clears[size] for size in range(1, 5)},
+            'tetris_rate': self.tetris_rate(),
+        }
+        for name in ('score', 'lines', 'pieces_per_game', 'max_height',
+                     'holes', 'ticks_per_piece'):
+            sketch = getattr(self, name)
+            result[name] = {'mean': sketch.mean(), 'p50': sketch.quantile(50),
+                            'p99': sketch.quantile(99), 'max': sketch.max}
+        return result
+
+    def report(self):
+        ''' Multi-line text summary '''
+        summary = self.summary()
+        total = sum(self.pieces.values()) or 1
+        lines = [
+            f"Games: {self.games}  Tetris rate: {summary['tetris_rate']:.1%}",
+            "Pieces: " + " ".join(f"{shape} {count / total:.1%}"
+                                  for shape, count in self.pieces.items()),
+            "Clears: " + " ".join(f"{size}x {count}"
+                                  for size, count in summary['clears'].items()),
+            f"{'':<16}{'mean':>10}{'p50':>8}{'p99':>8}{'max':>8}",
+        ]
+        for name in ('score', 'lines', 'pieces_per_game', 'max_height',
+                     'holes', 'ticks_per_piece'):
+            row = summary[name]
+            lines.append(f"{name:<16}{row['mean']:>10.1f}{row['p50']:>8}"
+                         f"{row['p99']:>8}{row['max']:>8}")
+        return "\n".join(lines) + "\n"
@@ -1,57 +1,159 @@
+from collections import namedtuple
+
 from  .config import TETROMINOS, COLORS
 
+# One rotation state of a piece:
+#   shape     - the 4x4 matrix as a tuple of tuples
+#   offsets   - (dx, dy) of every block relative to the piece position
+#   row_masks - (dy, mask) for every non-empty row, bit dx set = block in column dx
+#   min_dx, max_dx - leftmost and rightmost occupied column of the matrix
+#   bottoms   - (dx, dy) of the lowest block in every occupied column
+RotationState = namedtuple('RotationState',
+                           ['shape', 'offsets', 'row_masks', 'min_dx', 'max_dx', 'bottoms'])
+
+
+def _rotate_matrix_clockwise(matrix):
+    ''' Rotate a square matrix 90 degrees clockwise '''
+    # Transpose the matrix, then reverse each row
+    return tuple(tuple(reversed(row)) for row in zip(*matrix))
+
+
+def _build_rotation_state(matrix):
+    ''' Precompute block offsets and row bitmasks for one 4x4 matrix '''
+    offsets = []
+    row_masks = []
+    for y, row in enumerate(matrix):
+        mask = 0
+        for x, cell in enumerate(row):
+            if cell:
+                offsets.append((x, y))
+                mask |= 1 << x
+        if mask:
+            row_masks.append((y, mask))
+    columns = sorted(set(dx for dx, _ in offsets))
+    bottoms = tuple((dx, max(dy for bx, dy in offsets if bx == dx)) for dx in columns)
+    return RotationState(matrix, tuple(offsets), tuple(row_masks),
+                         columns[0], columns[-1], bottoms)
+
+
+def _build_rotation_table():
+    '''
+    Build all four rotation states of every shape in config.TETROMINOS
+
+    Returns:
+        dict: Shape name -> tuple of 4 RotationState (index 0 = spawn state,
+              each next index is one clockwise rotation further)
+    '''
+    table = {}
+    for shape_name, shape in TETROMINOS.items():
+        matrix = tuple(tuple(row) for row in shape)
+        states = []
+        for _ in range(4):
+            states.append(_build_rotation_state(matrix))
+            matrix = _rotate_matrix_clockwise(matrix)
+        table[shape_name] = tuple(states)
+    return table
+
+
+def _find_unique_rotations(states):
+    '''
+    Pick the rotation indexes whose block pattern differs from every earlier
+    one (ignoring where the pattern sits inside the 4x4 matrix)
+
+    Args:
+        states (tuple): The four RotationState of one shape
+
+    Returns:
+        tuple: Rotation indexes, e.g. (0,) for the O piece
+    '''
+    unique = []
+    seen = set()
+    for rotation, state in enumerate(states):
+        left = state.min_dx
+        top = min(dy for _, dy in state.offsets)
+        pattern = frozenset((dx - left, dy - top) for dx, dy in state.offsets)
+        if pattern not in seen:
+            seen.add(pattern)
+            unique.append(rotation)
+    return tuple(unique)
+
+
+# Built once when the module loads and shared by every tetromino
+ROTATIONS = _build_rotation_table()
+
+# Rotations that produce distinct shapes (O has 1, I has 2, ...)
+UNIQUE_ROTATIONS = {name: _find_unique_rotations(states) for name, states in ROTATIONS.items()}
+
+
 class Tetromino:
     '''
     Rrepresents a falling tetromino piece in the game
     Handles the shape, position, rotation and movement of a tetromino
+
+    Instances have no __dict__: the shape data lives in the shared ROTATIONS
+    table, so a piece is just a few references and two coordinates, and
+    reset() lets a finished piece be reused for the next one.
     '''
 
+    __slots__ = ('shape_name', 'rotations', 'rotation', 'color', 'x', 'y')
+
     def __init__(self, shape_name: str):
         '''
         Initialize a new tetromino with the specified shape
-        
+
         Args:
             shape_name (str): The shape type ('I), 'O', 'T', etc.')
         '''
+        self.reset(shape_name)
+
+    def reset(self, shape_name):
+        '''
+        Turn this tetromino into a fresh piece of another shape, in its
+        spawn orientation and starting position
 
+        Args:
+            shape_name (str): The shape type ('I', 'O', 'T', etc.)
+        '''
         self.shape_name = shape_name # Store the shape indentifier
-        self.shape = TETROMINOS[shape_name] # Get the 4x4 matrix for this shape
+        self.rotations = ROTATIONS[shape_name] # Precomputed rotation states
+        self.rotation = 0 # Index into self.rotations (0 = spawn orientation)
         self.color = COLORS[shape_name] # Get the terminal color
         self.x = 3 # Starting X position (centered on a 10-wide board)
         self.y = 0 # Starting Y position (top of the board)
 
+    @property
+    def shape(self):
+        ''' The 4x4 matrix of the current rotation state '''
+        return self.rotations[self.rotation].shape
+
     @property
     def blocks(self):
         '''
         Calculate the current positions of all blocks in this tetromino
         Returns a list of (x, y) coordinates for each block
-        
+
         Returns:
             list: List of tuples representing block positions [(x1, y1), (x2, y2), ...]
         '''
+        x = self.x
+        y = self.y
+        return [(x + dx, y + dy) for dx, dy in self.rotations[self.rotation].offsets]
 
-        blocks = []
-        # Loop through each row in the 4x4 shape matrix
-        for y, row in enumerate(self.shape):
-            # Loop through each column in the current row
-            for x, cell in enumerate(row):
-                if cell: # If this cell contains a block (value is 1)
-                    # Calculate the actual board position by adding the tetromino's position
+    @property
+    def row_masks(self):
+        '''
+        Describe the current shape as one bitmask per occupied row, used by
+        the board for collision checks (bit dx set = block in column dx)
 
-                    blocks.append((self.x + x, self.y + y))
+        Returns:
+            tuple: Tuple of (dy, mask) pairs, one per non-empty row of the shape
+        '''
+        return self.rotations[self.rotation].row_masks
 
-        return blocks
-    
     def rotate_clockwise(self):
         '''Rotate the tetromino 90 degrees clockwise '''
-        # Transpose the matrix (rows become columns)
-        transposed = list(zip(*self.shape))
-        # Reverse each row to complete clockwise rotation
-        self.shape = [list(reversed(row)) for row in transposed]
+        self.rotation = (self.rotation + 1) % 4
 
     def rotate_counter_clockwise(self):
         ''' Rotate the tetromino 90 degrees counter-clockwise '''
-        # Reverse each row first
-        reversed_rows = [list(reversed(row)) for row in self.shape]
-        # Transpose the matrix
-        self.shape = list(zip(*reversed_rows))
\ No newline at end of file
+        self.rotation = (self.rotation - 1) % 4
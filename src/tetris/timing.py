@@ -0,0 +1,145 @@
+'''
+Frame-based timing core
+
+The game advances in logical frames at FRAMES_PER_SECOND (60 Hz). Gravity
+is a per-level number of frames per row (config.GRAVITY_FRAMES), and held
+left/right keys repeat with delayed auto shift in the engine, so neither
+depends on how often the loop wakes up or on the terminal's autorepeat
+rate. The interactive loop maps the monotonic clock onto frame numbers
+with FrameClock; the simulation just counts frames.
+'''
+import time
+
+from .config import (ARR_FRAMES, DAS_FRAMES, FRAMES_PER_SECOND, GRAVITY_FRAMES,
+                     KEY_RELEASE_FRAMES)
+
+# Most frames the interactive loop catches up in one go. After a longer
+# stall (e.g. the process was suspended) the rest are skipped instead of
+# dropping the piece many rows at once.
+MAX_CATCH_UP_FRAMES = FRAMES_PER_SECOND
+
+
+def frames_per_row(level):
+    '''
+    Gravity speed of a level
+
+    Args:
+        level (int): Game level (1 and up)
+
+    Returns:
+        int: Frames between automatic one-row drops
+    '''
+    return GRAVITY_FRAMES[min(max(level, 1), len(GRAVITY_FRAMES)) - 1]
+
+
+class FrameClock:
+    '''
+    Maps the monotonic clock onto frame numbers
+
+    Frame n starts n / fps seconds after the clock was created. Deadlines
+    are computed from that fixed start, so rounding never accumulates.
+    '''
+
+    def __init__(self, fps=FRAMES_PER_SECOND, clock=time.monotonic):
+        '''
+        Args:
+            fps (int): Frames per second
+            clock (callable): Returns seconds (monotonic)
+        '''
+        self.fps = fps
+        self.clock = clock
+        self.start = clock()
+
+    def now(self):
+        ''' Number of the frame in progress '''
+        return int((self.clock() - self.start) * self.fps)
+
+    def seconds_until(self, frame):
+        ''' Seconds until the given frame starts (negative if it has) '''
+        return self.start + frame / self.fps - self.clock()
+
+
+class AutoShift:
+    '''
+    Delayed auto shift and auto repeat for one pair of direction keys
+
+    press() is called for every key event the terminal delivers, including
+    its autorepeats, and tick() once per frame. Every frame number comes
+    from the same FrameClock. A new press shifts at once. While the key is
+    held, the engine shifts again DAS frames after the press and every ARR
+    frames after that. The terminal's repeats only show that the key is
+    still down: an event more than release_frames after the previous one
+    is a new tap.
+
+    Attributes:
+        direction (str): Action of the held key, or None
+    '''
+
+    def __init__(self, das=DAS_FRAMES, arr=ARR_FRAMES, release_frames=KEY_RELEASE_FRAMES):
+        self.das = das
+        self.arr = arr
+        self.release_frames = release_frames
+        self.direction = None
+        self.repeating = False  # The terminal is sending autorepeats
+        self.pressed_at = 0
+        self.last_event = 0
+        self.next_shift = 0
+
+    def _released(self, frame):
+        return frame - self.last_event > self.release_frames
+
+    def press(self, direction, frame):
+        '''
+        A key event for a direction
+
+        Args:
+            direction (str): 'left' or 'right'
+            frame (int): Frame the event arrived in, after tick() has run
+                for it (never earlier than the last ticked frame)
+
+        Returns:
+            bool: True if the piece should shift now (a new press or tap)
+        '''
+        if direction == self.direction and not self._released(frame):
+            # An autorepeat: the key has been down since pressed_at
+            self.last_event = frame
+            self.repeating = True
+            return False
+        # A new press, or another tap of the same key
+        self.direction = direction
+        self.repeating = False
+        self.pressed_at = frame
+        self.last_event = frame
+        self.next_shift = frame + self.das
+        return True
+
+    def release(self):
+        ''' Forget the held key '''
+        self.direction = None
+        self.repeating = False
+
+    def tick(self, frame):
+        '''
+        Advance to a frame
+
+        Args:
+            frame (int): The frame being simulated
+
+        Returns:
+            str: Direction to shift in this frame, or None
+        '''
+        if self.direction is None:
+            return None
+        if self._released(frame):
+            self.release()
+            return None
+        if self.repeating and frame >= self.next_shift:
+            self.next_shift = frame + self.arr
+            return self.direction
+        return None
+
+    def frames_until_shift(self, frame):
+        ''' Frames from frame until the next auto shift (None if none is pending) '''
+        if self.direction is None or not self.repeating:
+            return None
+        return max(0, self.next_shift - frame)
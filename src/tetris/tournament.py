@@ -0,0 +1,166 @@
+'''
+Multi-core tournament runner for bot policies
+
+Plays every seed with every policy on a process pool and streams one
+result row per finished game to a JSONL or CSV file. Workers only receive
+a (seed, policy name) pair and build the game themselves, so nothing
+bigger than a few integers crosses the process boundary.
+
+Usage:
+    python -m tetris.tournament --seeds 1000 --policies greedy random --out results.jsonl
+    python -m tetris.tournament --seeds 200 --policies greedy --scaling
+'''
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from multiprocessing import Pool
+
+from .sim import POLICIES, make_policy, simulate
+
+# Columns of every result row, in file order
+FIELDS = ('seed', 'policy', 'score', 'lines', 'level', 'pieces', 'ticks')
+
+
+def play_game(task):
+    '''
+    Worker function: play one seeded game with one policy
+
+    Args:
+        task (tuple): (seed, policy_name, max_ticks)
+
+    Returns:
+        dict: One result row with the keys in FIELDS
+    '''
+    seed, policy_name, max_ticks = task
+    result = simulate(seed, policy=make_policy(policy_name, seed), max_ticks=max_ticks)
+    return {
+        'seed': seed,
+        'policy': policy_name,
+        'score': result.score,
+        'lines': result.lines,
+        'level': result.level,
+        'pieces': result.pieces,
+        'ticks': result.ticks,
+    }
+
+
+def make_tasks(seeds, policies, max_ticks):
+    ''' Every (seed, policy) combination as a worker task '''
+    return [(seed, policy, max_ticks) for policy in policies for seed in seeds]
+
+
+class ResultWriter:
+    '''
+    Writes result rows as they arrive, flushing after each one so partial
+    results survive an interrupted run
+    '''
+
+    def __init__(self, stream, file_format):
+        self.stream = stream
+        self.file_format = file_format
+        if file_format == 'csv':
+            self._csv = csv.DictWriter(stream, fieldnames=FIELDS)
+            self._csv.writeheader()
+
+    def write(self, row):
+        if self.file_format == 'csv':
+            self._csv.writerow(row)
+        else:
+            self.stream.write(json.dumps(row) + "\n")
+        self.stream.flush()
+
+
+def run_tournament(tasks, workers, writer=None, chunksize=4):
+    '''
+    Play all tasks on a process pool
+
+    Args:
+        tasks (list): Tasks from make_tasks
+        workers (int): Number of worker processes
+        writer (ResultWriter): Receives every row as soon as its game ends
+        chunksize (int): Tasks handed to a worker at a time
+
+    Returns:
+        tuple: (number of games, elapsed seconds)
+    '''
+    start = time.perf_counter()
+    games = 0
+    with Pool(processes=workers) as pool:
+        for row in pool.imap_unordered(play_game, tasks, chunksize=chunksize):
+            games += 1
+            if writer is not None:
+                writer.write(row)
+    return games, time.perf_counter() - start
+
+
+def measure_scaling(tasks, max_workers):
+    '''
+    Play the same tasks with 1, 2, 4, ... workers and report the speedup
+
+    Returns:
+        list: (workers, games per second, speedup vs 1 worker) tuples
+    '''
+    counts = []
+    workers = 1
+    while workers < max_workers:
+        counts.append(workers)
+        workers *= 2
+    counts.append(max_workers)
+
+    report = []
+    base_rate = None
+    for workers in counts:
+        games, elapsed = run_tournament(tasks, workers)
+        rate = games / elapsed if elapsed > 0 else float('inf')
+        base_rate = base_rate or rate
+        report.append((workers, rate, rate / base_rate))
+    return report
+
+
+def main(argv=None):
+    ''' Command line entry point '''
+    parser = argparse.ArgumentParser(description="Evaluate Tetris bot policies on all CPU cores")
+    parser.add_argument('--seeds', type=int, default=100, help="number of seeds per policy")
+    parser.add_argument('--first-seed', type=int, default=0, help="first seed to play")
+    parser.add_argument('--policies', nargs='+', default=['greedy'], choices=POLICIES)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: all cores)")
+    parser.add_argument('--max-ticks', type=int, default=100000, help="tick limit per game")
+    parser.add_argument('--out', default=None, help="result file (default: stdout)")
+    parser.add_argument('--format', choices=['jsonl', 'csv'], default=None,
+                        help="result format (default: from the file extension, else jsonl)")
+    parser.add_argument('--scaling', action='store_true',
+                        help="measure throughput for 1, 2, 4, ... workers instead")
+    args = parser.parse_args(argv)
+
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    tasks = make_tasks(seeds, args.policies, args.max_ticks)
+
+    if args.scaling:
+        print(f"{'workers':>8} {'games/s':>10} {'speedup':>8} {'efficiency':>10}")
+        for workers, rate, speedup in measure_scaling(tasks, args.workers):
+            print(f"{workers:>8} {rate:>10.1f} {speedup:>8.2f} {speedup / workers:>10.0%}")
+        return 0
+
+    file_format = args.format
+    if file_format is None:
+        file_format = 'csv' if args.out and args.out.endswith('.csv') else 'jsonl'
+
+    stream = open(args.out, 'w', newline='') if args.out else sys.stdout
+    try:
+        games, elapsed = run_tournament(tasks, args.workers, ResultWriter(stream, file_format))
+    finally:
+        if args.out:
+            stream.close()
+
+    rate = games / elapsed if elapsed > 0 else float('inf')
+    print(f"Played {games} games with {args.workers} workers in {elapsed:.2f}s "
+          f"({rate:.1f} games/s)", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,128 @@
+'''
+Bounded transposition table for lookahead search
+
+Search often reaches the same stack through different move orders. The
+table remembers results keyed by (board Zobrist hash, current piece,
+next piece) so such positions are evaluated once. Memory is capped: when
+the table is full the least recently used entry is dropped.
+'''
+from collections import OrderedDict, namedtuple
+
+# What the table stores per position
+TableEntry = namedtuple('TableEntry', ['depth', 'value'])
+
+
+class TranspositionTable:
+    '''
+    LRU cache of search results with depth-preferred replacement
+
+    An entry found at a greater search depth is never overwritten by a
+    shallower result for the same key, and lookups can ask for a minimum
+    depth so shallow results don't stand in for deep ones.
+
+    Attributes:
+        capacity (int): Maximum number of entries
+        hits (int): Lookups that found a usable entry
+        misses (int): Lookups that found nothing usable
+        evictions (int): Entries dropped to stay within capacity
+    '''
+
+    # Rough memory cost of one entry: dict slot and link, key tuple with a
+    # 64-bit hash, entry tuple and a small value
+    ENTRY_BYTES = 320
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, entry_bytes=ENTRY_BYTES):
+        '''
+        Args:
+            max_bytes (int): Memory budget for the table
+            entry_bytes (int): Estimated size of one entry, used to turn the
+                               budget into an entry count
+        '''
+        self.capacity = max(1, max_bytes // entry_bytes)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+
+    @staticmethod
+    def make_key(board, current_piece, next_piece):
+        '''
+        Table key for a position
+
+        Args:
+            board (Board): The board (its zobrist hash is used, after any
+                           pending grid edits are applied)
+            current_piece (str): Shape name of the piece to place
+            next_piece (str): Shape name of the piece after it
+        '''
+        return (board.zobrist, current_piece, next_piece)
+
+    def get(self, key, min_depth=0):
+        '''
+        Look up a stored value
+
+        Args:
+            key (tuple): Key from make_key
+            min_depth (int): Ignore entries searched less deeply than this
+
+        Returns:
+            The stored value, or None when there is no usable entry
+        '''
+        entry = self._entries.get(key)
+        if entry is None or entry.depth < min_depth:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def put(self, key, value, depth=0):
+        '''
+        Store a value, keeping an existing deeper result for the same key
+
+        Args:
+            key (tuple): Key from make_key
+            value: The search result to remember
+            depth (int): How deep the search behind the value went
+        '''
+        entries = self._entries
+        existing = entries.get(key)
+        if existing is not None:
+            if existing.depth > depth:
+                entries.move_to_end(key)
+                return
+            entries[key] = TableEntry(depth, value)
+            entries.move_to_end(key)
+            return
+
+        entries[key] = TableEntry(depth, value)
+        if len(entries) > self.capacity:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        ''' Drop all entries (the counters are kept) '''
+        self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def stats(self):
+        '''
+        Counters for tuning the table size
+
+        Returns:
+            dict: size, capacity, hits, misses, hit_rate and evictions
+        '''
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+        }
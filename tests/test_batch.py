@@ -0,0 +1,68 @@
+import unittest
+import random
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.game import ACTIONS
+from tetris.sim import Simulation
+from tetris.batch import BatchEngine, PIECE_NAMES, encode_actions, np
+
+
+@unittest.skipIf(np is None, "NumPy is not installed")
+class TestBatchEngine(unittest.TestCase):
+
+    def assert_lanes_match(self, engine, sims):
+        """Compare every lane with the Simulation that got the same inputs"""
+        for lane, sim in enumerate(sims):
+            game = sim.game
+            with self.subTest(lane=lane, tick=engine.tick):
+                self.assertEqual(engine.boards[lane].tolist(), [list(row) for row in game.board.grid])
+                self.assertEqual(bool(engine.game_over[lane]), game.game_over)
+                self.assertEqual(int(engine.score[lane]), game.score)
+                self.assertEqual(int(engine.lines[lane]), game.lines_cleared)
+                self.assertEqual(int(engine.level[lane]), game.level)
+                self.assertEqual(int(engine.pieces[lane]), game.pieces_placed)
+                if not game.game_over:
+                    piece = game.current_piece
+                    self.assertEqual(PIECE_NAMES[engine.piece[lane]], piece.shape_name)
+                    self.assertEqual(PIECE_NAMES[engine.next_piece[lane]], game.next_piece.shape_name)
+                    self.assertEqual((int(engine.rotation[lane]), int(engine.x[lane]), int(engine.y[lane])),
+                                     (piece.rotation, piece.x, piece.y))
+
+    def test_lanes_stay_in_sync_with_single_games(self):
+        """Test that each lane matches a Simulation fed the same inputs"""
+        seeds = list(range(24))
+        engine = BatchEngine(seeds)
+        sims = [Simulation(seed) for seed in seeds]
+        rng = random.Random(99)
+        choices = list(ACTIONS) + [None] * 4
+
+        for _ in range(1500):
+            actions = [rng.choice(choices) for _ in seeds]
+            engine.step(encode_actions(actions))
+            for sim, action in zip(sims, actions):
+                sim.step(action)
+            if engine.tick % 50 == 0:
+                self.assert_lanes_match(engine, sims)
+        self.assert_lanes_match(engine, sims)
+
+    def test_line_clear_scoring(self):
+        """Test that a filled row is cleared and scored like Game does"""
+        engine = BatchEngine([0, 1])
+        engine.boards[0, 19, :] = 1
+        engine.boards[0, 19, 0] = 0
+        engine.boards[0, 18, 4] = 7
+        # Drop a vertical I into the gap of lane 0
+        engine.piece[:] = PIECE_NAMES.index('I')
+        engine.rotation[:] = 1
+        engine.x[:] = -2
+
+        engine.step(encode_actions(['hard_drop', None]))
+
+        self.assertEqual(engine.lines.tolist(), [1, 0])
+        self.assertEqual(engine.score.tolist(), [40, 0])
+        self.assertEqual(int(engine.boards[0, 19, 4]), 7)
+        self.assertEqual(int(engine.boards[0, 19, 0]), engine._colors[PIECE_NAMES.index('I')])
@@ -5,7 +5,7 @@ import os
 # Add src directory to the Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from tetris.board import Board
+from tetris.board import ZOBRIST_KEYS, Board
 from tetris.tetromino import Tetromino
 
 class TestBoard(unittest.TestCase):
@@ -179,4 +179,180 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(board.grid[17][3], 1)
         self.assertEqual(board.grid[16][3], 0)
         # Block below should stay in place
-        self.assertEqual(board.grid[18][5], 1)
\ No newline at end of file
+        self.assertEqual(board.grid[18][5], 1)
+
+    def test_row_masks_follow_locked_pieces(self):
+        """Test that locking a piece sets the matching bits in the row masks"""
+        board = Board()
+        tetromino = Tetromino('I')
+        tetromino.y = 18
+
+        board.lock_tetromino(tetromino)
+
+        # I-piece covers columns 3-6 of row 19
+        self.assertEqual(board.rows[19], 0b1111000)
+        self.assertEqual(board.grid[19][3:7], [tetromino.color] * 4)
+
+    def test_direct_grid_edits_are_seen_by_collision(self):
+        """Test that writing to board.grid keeps the bitmasks in sync"""
+        board = Board()
+        board.grid[10] = [0] * board.width
+        board.grid[10][0] = 1
+
+        self.assertEqual(board.rows[0], 0)
+        tetromino = Tetromino('I')
+        tetromino.x = 0
+        tetromino.y = 9
+        self.assertTrue(board.has_collision(tetromino))
+        self.assertEqual(board.rows[10], 1)
+
+    def test_clear_lines_keeps_masks_and_grid_aligned(self):
+        """Test that clearing shifts both row masks and colours down"""
+        board = Board()
+        board.grid[19] = [1] * board.width
+        board.grid[18][2] = 5
+
+        self.assertEqual(board.clear_lines(), 1)
+        self.assertEqual(board.rows[19], 0b100)
+        self.assertEqual(board.grid[19][2], 5)
+        self.assertEqual(board.rows[0], 0)
+
+    def test_placements_on_empty_board(self):
+        """Test that symmetric rotations are only enumerated once"""
+        board = Board()
+        counts = {name: len(board.get_placements(Tetromino(name))) for name in 'IOTZ'}
+
+        self.assertEqual(counts['O'], 9)        # one rotation, 9 columns
+        self.assertEqual(counts['I'], 7 + 10)   # horizontal + vertical
+        self.assertEqual(counts['T'], 8 + 9 + 8 + 9)
+        self.assertEqual(counts['Z'], 8 + 9)
+
+    def test_placements_rest_on_stack_and_count_lines(self):
+        """Test that placements land on the stack and report cleared lines"""
+        board = Board()
+        board.grid[19] = [1, 1, 1, 0, 0, 0, 0, 1, 1, 1]
+        tetromino = Tetromino('I')
+
+        placements = board.get_placements(tetromino)
+        # The search itself leaves the piece where it was
+        self.assertEqual((tetromino.rotation, tetromino.x, tetromino.y), (0, 3, 0))
+        clearing = [p for p in placements if p.lines_cleared]
+
+        self.assertEqual(len(clearing), 1)
+        self.assertEqual((clearing[0].rotation, clearing[0].x, clearing[0].y), (0, 3, 18))
+        # Every placement is a legal resting position
+        for placement in placements:
+            tetromino.rotation, tetromino.x, tetromino.y = placement[:3]
+            self.assertFalse(board.has_collision(tetromino))
+            tetromino.y += 1
+            self.assertTrue(board.has_collision(tetromino))
+
+    def test_clear_non_adjacent_lines(self):
+        """Test clearing complete lines with partial rows between them"""
+        board = Board()
+        board.grid[15] = [1] * board.width
+        board.grid[16][1] = 2
+        board.grid[17] = [1] * board.width
+        board.grid[18][8] = 3
+        board.grid[19] = [1] * board.width
+        board.grid[14][0] = 4
+
+        self.assertEqual(board.clear_lines(), 3)
+        self.assertEqual(board.grid[19][8], 3)
+        self.assertEqual(board.grid[18][1], 2)
+        self.assertEqual(board.grid[17][0], 4)
+        self.assertEqual(board.rows[17:], [0b1, 0b10, 0b100000000])
+        self.assertEqual(board.rows[:17], [0] * 17)
+
+    def test_clear_checks_rows_changed_by_locks(self):
+        """Test that a lock completing a row is found and cleared"""
+        board = Board()
+        board.grid[19] = [1, 1, 1, 0, 0, 0, 0, 1, 1, 1]
+        self.assertEqual(board.clear_lines(), 0)
+
+        tetromino = Tetromino('I')
+        tetromino.y = 18
+        board.lock_tetromino(tetromino)
+
+        self.assertEqual(board.clear_lines(), 1)
+        self.assertEqual(board.rows, [0] * 20)
+        # Nothing changed since, so nothing more to clear
+        self.assertEqual(board.clear_lines(), 0)
+
+    def test_drop_distance_matches_stepping(self):
+        """Test that the height-map drop distance equals dropping row by row"""
+        import random
+        rng = random.Random(5)
+        for trial in range(200):
+            board = Board()
+            for y in range(8, 20):
+                board.grid[y] = [1 if rng.random() < 0.5 else 0 for _ in range(board.width)]
+            tetromino = Tetromino(rng.choice('IOTLJSZ'))
+            tetromino.rotation = rng.randrange(4)
+            tetromino.x = rng.randrange(-1, 8)
+            tetromino.y = rng.randrange(0, 14)
+            if board.has_collision(tetromino):
+                continue
+
+            expected = 0
+            while True:
+                tetromino.y += 1
+                if board.has_collision(tetromino):
+                    break
+                expected += 1
+            tetromino.y -= expected + 1
+
+            with self.subTest(trial=trial):
+                self.assertEqual(board.drop_distance(tetromino), expected)
+
+    def test_heights_follow_locks_and_clears(self):
+        """Test that column heights rise on lock and fall on clear"""
+        board = Board()
+        board.grid[19] = [1, 1, 1, 0, 0, 0, 0, 1, 1, 1]
+        board.grid[18][0] = 1
+        self.assertEqual(board.clear_lines(), 0)
+        self.assertEqual(board.heights, [2, 1, 1, 0, 0, 0, 0, 1, 1, 1])
+
+        tetromino = Tetromino('I')
+        tetromino.y = 18
+        board.lock_tetromino(tetromino)
+        self.assertEqual(board.heights, [2, 1, 1, 1, 1, 1, 1, 1, 1, 1])
+
+        board.clear_lines()
+        self.assertEqual(board.heights, [1] + [0] * 9)
+
+    def test_zobrist_hash_tracks_locks_and_clears(self):
+        """Test that the incremental hash always equals a full rehash"""
+        from tetris.sim import Simulation, make_policy
+        sim = Simulation(seed=21)
+        policy = make_policy('greedy')
+        board = sim.game.board
+        seen_clear = False
+
+        while sim.tick < 3000 and sim.step(policy(sim.game)):
+            seen_clear = seen_clear or sim.game.lines_cleared > 0
+            expected = 0
+            for y, row in enumerate(board.grid):
+                for x, cell in enumerate(row):
+                    if cell:
+                        expected ^= ZOBRIST_KEYS[y][x]
+            self.assertEqual(board.zobrist, expected)
+
+        self.assertTrue(seen_clear)
+
+    def test_zobrist_same_stack_same_hash(self):
+        """Test that the same cells reached in a different order hash equal"""
+        first = Board()
+        second = Board()
+        left = Tetromino('O')
+        left.x, left.y = -1, 17
+        right = Tetromino('O')
+        right.x, right.y = 5, 17
+
+        first.lock_tetromino(left)
+        first.lock_tetromino(right)
+        second.lock_tetromino(right)
+        second.lock_tetromino(left)
+
+        self.assertEqual(first.zobrist, second.zobrist)
+        self.assertNotEqual(first.zobrist, Board().zobrist)
@@ -0,0 +1,108 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.env import TetrisEnv, VectorEnv, KEYPRESS_ACTIONS, EMPTY, LOCKED, FALLING
+from tetris.sim import Simulation
+
+
+def expected_observation(game):
+    """Observation built the slow way from the colour grid"""
+    cells = [[LOCKED if cell else EMPTY for cell in row] for row in game.board.grid]
+    if not game.game_over:
+        for x, y in game.current_piece.blocks:
+            if 0 <= y < game.board.height and 0 <= x < game.board.width:
+                cells[y][x] = FALLING
+    return cells
+
+
+class TestTetrisEnv(unittest.TestCase):
+
+    def test_keys_mode_matches_simulation(self):
+        """Test that key steps play exactly like a Simulation with the same seed"""
+        env = TetrisEnv('keys')
+        env.reset(seed=6)
+        sim = Simulation(6)
+        actions = [1, 1, 3, 0, 0, 5, 2, 2, 2, 3, 5] * 4
+
+        for action in actions:
+            obs, reward, done, info = env.step(action)
+            score = sim.game.score
+            sim.step(KEYPRESS_ACTIONS[action])
+            self.assertEqual(reward, sim.game.score - score)
+            self.assertEqual(obs.tolist(), expected_observation(sim.game))
+            if done:
+                break
+
+    def test_placement_mode_places_one_piece_per_step(self):
+        """Test that every legal placement action locks one piece where asked"""
+        env = TetrisEnv('placement')
+        obs = env.reset(seed=2)
+        self.assertEqual(obs.tolist(), expected_observation(env.game))
+
+        for step in range(30):
+            legal = env.legal_actions()
+            obs, reward, done, info = env.step(legal[step % len(legal)])
+            self.assertFalse(info['illegal'])
+            self.assertEqual(info['pieces'], step + 1)
+            self.assertEqual(obs.tolist(), expected_observation(env.game))
+            if done:
+                break
+
+        with self.assertRaises(ValueError):
+            while True:
+                env.step(env.legal_actions()[0])
+
+    def test_illegal_placement_drops_in_place(self):
+        """Test that an unreachable placement is flagged and the piece dropped as is"""
+        env = TetrisEnv('placement')
+        env.reset(seed=3)
+        piece = env.game.current_piece
+        expected = [(x, y + env.game.board.drop_distance(piece)) for x, y in piece.blocks]
+
+        # Spawn rotation with its leftmost block in the last column: through the wall
+        _, _, _, info = env.step(9)
+
+        self.assertTrue(info['illegal'])
+        self.assertEqual(info['pieces'], 1)
+        self.assertTrue(all(env.game.board.grid[y][x] for x, y in expected))
+
+    def test_observation_is_zero_copy(self):
+        """Test that the observation is a view that updates in place"""
+        env = TetrisEnv('placement')
+        obs = env.reset(seed=1)
+        before = obs.tobytes()
+        env.step(env.legal_actions()[0])
+
+        self.assertIsInstance(obs, memoryview)
+        self.assertEqual(obs.shape, (20, 10))
+        self.assertNotEqual(obs.tobytes(), before)
+
+
+class TestVectorEnv(unittest.TestCase):
+
+    def test_steps_all_games_and_autoresets(self):
+        """Test the batched step, shared buffer and automatic reset"""
+        vec = VectorEnv(4, 'placement', max_steps=3)
+        obs = vec.reset(seed=10)
+        self.assertEqual(obs.shape, (4, 20, 10))
+
+        for step in range(3):
+            actions = [env.legal_actions()[0] for env in vec.envs]
+            obs, rewards, dones, infos = vec.step(actions)
+            for env in vec.envs:
+                self.assertEqual(env.observation.tolist(), expected_observation(env.game))
+            self.assertEqual(obs.tobytes(),
+                             b''.join(env.observation.tobytes() for env in vec.envs))
+
+        self.assertEqual(dones, [True] * 4)
+        self.assertEqual([info['final_info']['pieces'] for info in infos], [3] * 4)
+        self.assertEqual([env.game.pieces_placed for env in vec.envs], [0] * 4)
+        self.assertEqual([env.sim.seed for env in vec.envs], [14, 15, 16, 17])
+
+
+if __name__ == '__main__':
+    unittest.main()
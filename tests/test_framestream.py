@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.framestream import FrameEncoder, FrameDecoder, encode_message, F_KEYFRAME
+from tetris.game import Game
+from tetris.rng import SplitMix64
+from tetris.sim import Simulation, make_policy
+
+
+class TestFrameStream(unittest.TestCase):
+
+    def assertMatchesGame(self, decoder, game):
+        piece = game.current_piece
+        self.assertEqual(decoder.grid, [list(row) for row in game.board.grid])
+        self.assertEqual((decoder.piece, decoder.rotation, decoder.x, decoder.y),
+                         (piece.shape_name, piece.rotation, piece.x, piece.y))
+        self.assertEqual(decoder.next_piece, game.next_piece.shape_name)
+        self.assertEqual((decoder.score, decoder.level, decoder.lines, decoder.game_over),
+                         (game.score, game.level, game.lines_cleared, game.game_over))
+
+    def test_decoder_follows_a_whole_game(self):
+        """Test that applying every frame rebuilds the game exactly, line clears included"""
+        sim = Simulation(seed=8)
+        policy = make_policy('greedy')
+        encoder = FrameEncoder(keyframe_interval=50)
+        decoder = FrameDecoder()
+
+        while sim.tick < 4000 and sim.step(policy(sim.game)):
+            decoder.apply(encoder.encode(sim.game))
+            self.assertMatchesGame(decoder, sim.game)
+
+        self.assertGreater(sim.game.lines_cleared, 0)
+
+    def test_one_cell_move_is_a_few_bytes(self):
+        """Test that a piece moving one cell costs only a few bytes"""
+        game = Game(rng=SplitMix64(1))
+        encoder = FrameEncoder()
+        keyframe = encoder.encode(game)
+        game.move_left()
+        delta = encoder.encode(game)
+
+        self.assertTrue(keyframe[0] & F_KEYFRAME)
+        self.assertLessEqual(len(delta), 4)
+        self.assertEqual(encoder.encode(game), b'')
+
+    def test_keyframes_at_intervals_and_on_request(self):
+        """Test that keyframes are sent every interval frames and when requested"""
+        game = Game(rng=SplitMix64(2))
+        encoder = FrameEncoder(keyframe_interval=3)
+        kinds = []
+        for action in ['left', 'right', 'left', 'right', 'left']:
+            game.apply_action(action)
+            kinds.append(bool(encoder.encode(game)[0] & F_KEYFRAME))
+        encoder.request_keyframe()
+        game.apply_action('rotate')
+        kinds.append(bool(encoder.encode(game)[0] & F_KEYFRAME))
+
+        self.assertEqual(kinds, [True, False, False, True, False, True])
+
+    def test_feed_splits_a_byte_stream(self):
+        """Test that length-prefixed frames survive arbitrary chunking"""
+        game = Game(rng=SplitMix64(3))
+        encoder = FrameEncoder()
+        stream = bytearray()
+        for action in ['left', 'rotate', 'hard_drop', 'right', 'drop']:
+            game.apply_action(action)
+            stream += encode_message(encoder.encode(game))
+
+        decoder = FrameDecoder()
+        applied = sum(decoder.feed(stream[i:i + 3]) for i in range(0, len(stream), 3))
+
+        self.assertEqual(applied, 5)
+        self.assertMatchesGame(decoder, game)
+
+    def test_delta_before_keyframe_is_rejected(self):
+        """Test that a decoder refuses deltas until it has seen a keyframe"""
+        game = Game(rng=SplitMix64(4))
+        encoder = FrameEncoder()
+        encoder.encode(game)
+        game.move_right()
+
+        with self.assertRaises(ValueError):
+            FrameDecoder().apply(encoder.encode(game))
+
+
+if __name__ == '__main__':
+    unittest.main()
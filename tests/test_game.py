@@ -1,4 +1,6 @@
 import unittest
+from unittest import mock
+import curses
 import sys
 import os
 
@@ -7,6 +9,7 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from tetris.game import Game
 from tetris.tetromino import Tetromino
+from tetris.timing import FrameClock
 
 class TestGame(unittest.TestCase):
     
@@ -139,3 +142,251 @@ class TestGame(unittest.TestCase):
         # Next piece should become current, and new next piece generated
         self.assertEqual(game.current_piece, original_next_piece)
         self.assertIsNotNone(game.next_piece)
+
+    def test_locked_piece_is_reused(self):
+        """Test that spawning reuses the locked piece object instead of allocating"""
+        game = Game()
+        first, second = game.current_piece, game.next_piece
+
+        game.hard_drop()
+        self.assertIs(game.current_piece, second)
+        self.assertIs(game.next_piece, first)
+        self.assertEqual(game.next_piece.shape_name, game.pieces.peek())
+        self.assertEqual((game.next_piece.rotation, game.next_piece.y), (0, 0))
+
+
+    def test_apply_action(self):
+        """Test that named actions drive the same moves as the keys"""
+        game = Game()
+        original_x = game.current_piece.x
+
+        game.apply_action('right')
+        self.assertEqual(game.current_piece.x, original_x + 1)
+
+        game.apply_action('hard_drop')
+        self.assertEqual(game.pieces_placed, 1)
+
+        with self.assertRaises(ValueError):
+            game.apply_action('jump')
+
+
+class FakeClock:
+    """Monotonic clock that only moves when told to"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class ScriptedWindow:
+    """Fake curses window that returns scripted keys and counts redraws"""
+
+    def __init__(self, keys, clock=None, key_interval=0.0):
+        self.keys = list(keys)
+        self.clock = clock
+        self.key_interval = key_interval  # Seconds that pass before each key
+        self.timeouts = []
+        self.refreshes = 0
+
+    def timeout(self, ms):
+        self.timeouts.append(ms)
+
+    def getch(self):
+        if self.clock is not None:
+            self.clock.now += self.key_interval
+        return self.keys.pop(0) if self.keys else ord('q')
+
+    def getmaxyx(self):
+        return 40, 80
+
+    def addstr(self, y, x, text, attributes=0):
+        pass
+
+    def clear(self):
+        pass
+
+    def noutrefresh(self):
+        self.refreshes += 1
+
+
+class TimedKeyWindow(ScriptedWindow):
+    """Fake curses window with keys at fixed times; getch waits at most the timeout"""
+
+    def __init__(self, timed_keys, clock):
+        super().__init__([], clock)
+        self.timed_keys = list(timed_keys)  # (seconds, key), in order
+
+    def getch(self):
+        if not self.timed_keys:
+            return ord('q')
+        at, key = self.timed_keys[0]
+        wait = self.timeouts[-1] / 1000 if self.timeouts else 0.0
+        if at > self.clock.now + wait:
+            self.clock.now += wait
+            return -1
+        self.clock.now = max(self.clock.now, at)
+        self.timed_keys.pop(0)
+        return key
+
+
+class TestGameLoop(unittest.TestCase):
+
+    @mock.patch('tetris.renderer.curses.doupdate')
+    def test_loop_waits_for_gravity_and_skips_idle_redraws(self, doupdate):
+        """Test that the loop blocks until the drop deadline and only redraws on change"""
+        clock = FakeClock()
+        game = Game()
+        game.frame_clock = FrameClock(clock=clock)
+        game.current_piece = Tetromino('O')
+        # Two no-op wakeups, one tap, then more taps, the last ones into the wall.
+        # 100 ms apart, so each is a separate tap, not autorepeat
+        window = ScriptedWindow([-1, -1, curses.KEY_LEFT] + [curses.KEY_LEFT] * 8,
+                                clock, key_interval=0.1)
+        game.stdscr = window
+
+        game.run()
+
+        # getch waits up to the gravity deadline instead of returning at once
+        self.assertTrue(all(0 < ms <= 801 for ms in window.timeouts))
+        # First frame + each successful move (4 steps left from x=3 to x=-1)
+        # + one gravity drop (48 frames = 0.8 s into the 1.2 s script)
+        self.assertEqual(game.current_piece.x, -1)
+        self.assertEqual(window.refreshes, 1 + 4 + 1)
+
+    @mock.patch('tetris.renderer.curses.doupdate')
+    def test_autorepeat_burst_moves_once(self, doupdate):
+        """Test that the terminal's autorepeat doesn't set the shift rate"""
+        clock = FakeClock()
+        game = Game()
+        game.frame_clock = FrameClock(clock=clock)
+        game.current_piece = Tetromino('O')
+        # Autorepeat delivered faster than any player can tap
+        game.stdscr = ScriptedWindow([curses.KEY_LEFT] * 8, clock, key_interval=0.005)
+
+        game.run()
+
+        self.assertEqual(game.current_piece.x, 2)
+
+    @mock.patch('tetris.renderer.curses.doupdate')
+    def test_separate_taps_move_once_each(self, doupdate):
+        """Test that two taps 0.3-0.7 s apart move exactly two columns, however long getch waited"""
+        for gap in (0.3, 0.35, 0.5, 0.6, 0.7):
+            with self.subTest(gap=gap):
+                clock = FakeClock()
+                game = Game()
+                game.frame_clock = FrameClock(clock=clock)
+                piece = game.current_piece = Tetromino('O')
+                start_x = piece.x
+                game.stdscr = TimedKeyWindow([(0.1, curses.KEY_LEFT),
+                                              (0.1 + gap, curses.KEY_LEFT),
+                                              (0.1 + gap + 0.5, ord('q'))], clock)
+
+                game.run()
+
+                self.assertEqual(start_x - piece.x, 2)
+
+
+class TestFrameTiming(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.game = Game()
+        self.game.frame_clock = FrameClock(clock=self.clock)
+
+    def advance_to(self, frame):
+        """Move the wall clock into the middle of a frame and catch the game up"""
+        self.clock.now = (frame + 0.5) / 60
+        self.game.update()
+
+    def test_gravity_follows_the_level_table(self):
+        """Test that pieces fall once per level-dependent number of frames"""
+        game = self.game
+        start_y = game.current_piece.y
+        self.advance_to(47)
+        self.assertEqual(game.current_piece.y, start_y)
+        self.advance_to(48)
+        self.assertEqual(game.current_piece.y, start_y + 1)
+
+        game.lines_cleared = 289
+        game._update_level(1)  # Level 30: a row every frame
+        self.assertEqual(game.gravity_frames, 1)
+        self.assertEqual(game.drop_interval, 1 / 60)
+
+    def test_held_key_auto_shifts(self):
+        """Test delayed auto shift: one move, then repeats every ARR frames after DAS"""
+        game = self.game
+        game.gravity_frames = 10 ** 6  # Keep the piece still
+        piece = game.current_piece = Tetromino('O')  # Room for 4 moves right
+        start_x = piece.x
+        moves = []
+        for frame in range(0, 30, 2):  # Terminal autorepeat every 2 frames
+            self.advance_to(frame)
+            game.press('right')
+            moves.append(piece.x - start_x)
+
+        self.assertEqual(moves[0], 1)   # The press itself
+        self.assertEqual(moves[7], 1)   # Frame 14: still waiting out DAS
+        self.assertEqual(moves[8], 2)   # Frame 16: DAS
+        self.assertEqual(moves[11], 3)  # Frame 22: DAS + ARR
+        self.assertEqual(moves[14], 4)  # Frame 28: DAS + 2 ARR
+
+        # The repeats stop: the key counts as released
+        self.advance_to(40)
+        self.assertEqual(piece.x - start_x, 4)
+        self.assertIsNone(game.autoshift.direction)
+
+    def test_long_stall_is_skipped(self):
+        """Test that a stalled loop doesn't replay minutes of gravity at once"""
+        game = self.game
+        self.advance_to(60 * 60)
+        self.assertLessEqual(game.current_piece.y, 2)
+        self.assertEqual(game.frame, 60 * 60)
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def play(self, game, moves):
+        for action in moves:
+            if game.game_over:
+                break
+            game.apply_action(action)
+        return game.snapshot()
+
+    def test_restore_replays_identically(self):
+        """Test that restoring a snapshot reproduces the same future"""
+        from tetris.rng import SplitMix64
+        game = Game(rng=SplitMix64(8))
+        self.play(game, ['left', 'hard_drop', 'rotate', 'hard_drop'])
+        saved = game.snapshot()
+
+        moves = ['right', 'right', 'hard_drop', 'rotate', 'left', 'hard_drop'] * 3
+        first = self.play(game, moves)
+        game.restore(saved)
+        self.assertEqual(game.snapshot(), saved)
+        second = self.play(game, moves)
+
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, saved)
+
+    def test_snapshot_is_small_and_hashable(self):
+        """Test that snapshots can be used as dict keys and stay compact"""
+        game = Game()
+        game.hard_drop()
+        state = game.snapshot()
+
+        self.assertEqual({state: 1}[game.snapshot()], 1)
+        size = sys.getsizeof(state.board.rows) + sys.getsizeof(state.board.colors)
+        self.assertLess(size, 600)
+
+    def test_restored_board_is_independent(self):
+        """Test that changing the game after a snapshot leaves it untouched"""
+        game = Game()
+        state = game.snapshot()
+        game.hard_drop()
+
+        game.restore(state)
+        self.assertEqual(game.board.rows, [0] * 20)
+        self.assertTrue(all(cell == 0 for row in game.board.grid for cell in row))
+        self.assertEqual(game.board.heights, [0] * 10)
@@ -0,0 +1,214 @@
+import unittest
+from unittest import mock
+import io
+import multiprocessing
+import shutil
+import sys
+import os
+import tempfile
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.game import Game
+from tetris.highscores import (HEADER, RECORD, HighScore, HighScoreStore,
+                               format_scores, pack_record, score_from_game)
+
+
+def append_scores(path, start, count):
+    """Worker process: append count scores to a shared store"""
+    with HighScoreStore(path) as store:
+        for score in range(start, start + count):
+            store.add(HighScore(score, 0, 1, 0.0, score))
+
+
+class TestHighScoreStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'scores')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_top_scores_are_sorted_and_bounded(self):
+        """Test that only the best K scores are kept, highest first"""
+        with HighScoreStore(self.path, capacity=3) as store:
+            for score in [500, 100, 900, 300, 700]:
+                store.add(HighScore(score, 1, 1, 1000.0 + score, None))
+            self.assertEqual([entry.score for entry in store.top()], [900, 700, 500])
+            self.assertEqual(len(store.top(2)), 2)
+
+    def test_records_round_trip(self):
+        """Test that every field survives the file, including a missing seed"""
+        entries = [HighScore(1200, 4, 2, 1760000000.5, 2 ** 64 - 7),
+                   HighScore(40, 1, 1, 1760000001.0, None)]
+        with HighScoreStore(self.path) as store:
+            for entry in entries:
+                store.add(entry)
+        with HighScoreStore(self.path) as store:
+            self.assertEqual(store.top(), entries)
+
+    def test_ties_rank_the_earlier_score_first(self):
+        """Test that equal scores are ordered by when they were reached"""
+        with HighScoreStore(self.path) as store:
+            store.add(HighScore(100, 0, 1, 20.0, 2))
+            store.add(HighScore(100, 0, 1, 10.0, 1))
+            self.assertEqual([entry.seed for entry in store.top()], [1, 2])
+
+    def test_log_is_append_only_fixed_size_records(self):
+        """Test that the log grows by one record per score and keeps the history"""
+        with HighScoreStore(self.path, capacity=2) as store:
+            for score in range(10):
+                store.add(HighScore(score, 0, 1, 0.0, None))
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + 10 * RECORD.size)
+
+    def test_startup_reads_only_checkpoint_and_tail(self):
+        """Test that history covered by the checkpoint is never parsed again"""
+        with HighScoreStore(self.path, capacity=2) as store:
+            for score in [10, 50, 30]:
+                store.add(HighScore(score, 0, 1, 0.0, None))
+        # Scribble over the checkpointed history: a reader that parsed it
+        # would now see a huge bogus score
+        with open(self.path, 'r+b') as log:
+            log.seek(HEADER.size)
+            log.write(b'\xff' * (3 * RECORD.size))
+        # Records appended after the checkpoint are still picked up
+        with open(self.path, 'ab') as log:
+            log.write(RECORD.pack(40, 0, 1, 0, 0.0, 0))
+
+        with HighScoreStore(self.path, capacity=2) as store:
+            self.assertEqual([entry.score for entry in store.top()], [50, 40])
+
+    def test_automatic_compaction(self):
+        """Test that a checkpoint is written every compact_every appends"""
+        store = HighScoreStore(self.path, compact_every=3)
+        for score in range(3):
+            store.add(HighScore(score, 0, 1, 0.0, None))
+        self.assertTrue(os.path.exists(store.checkpoint_path))
+        store.close()
+
+    def test_missing_checkpoint_rebuilds_from_log(self):
+        """Test that a lost checkpoint only costs a full scan"""
+        with HighScoreStore(self.path) as store:
+            store.add(HighScore(70, 0, 1, 0.0, None))
+        os.remove(self.path + '.top')
+        with HighScoreStore(self.path) as store:
+            self.assertEqual(store.top()[0].score, 70)
+
+    def test_submit_writes_in_the_background(self):
+        """Test that submitted scores are on disk once the store is closed"""
+        store = HighScoreStore(self.path)
+        game = Game()
+        game.score, game.lines_cleared, game.level = 880, 12, 2
+        store.submit(score_from_game(game, seed=99))
+        store.close()
+
+        self.assertEqual(store.top()[0][:3], (880, 12, 2))
+        with HighScoreStore(self.path) as store:
+            self.assertEqual(store.top()[0].seed, 99)
+
+    def test_seeds_are_kept_modulo_2_64(self):
+        """Test that any seed SplitMix64 accepts can be recorded"""
+        with HighScoreStore(self.path) as store:
+            store.add(HighScore(10, 0, 1, 0.0, 2 ** 64 - 1))
+            store.add(HighScore(20, 0, 1, 0.0, -7))
+            self.assertEqual([entry.seed for entry in store.top()], [2 ** 64 - 7, 2 ** 64 - 1])
+
+    def test_failed_submit_does_not_stop_the_writer(self):
+        """Test that one score that can't be written doesn't lose the ones after it"""
+        store = HighScoreStore(self.path)
+        with mock.patch('sys.stderr', new_callable=io.StringIO) as stderr:
+            store.submit(HighScore(-1, 0, 1, 0.0, None))  # No negative scores in a record
+            store.submit(HighScore(500, 0, 1, 0.0, 3))
+            store.close()
+
+        self.assertEqual(store.failed, 1)
+        self.assertIn("Could not record score -1", stderr.getvalue())
+        with HighScoreStore(self.path) as store:
+            self.assertEqual([entry.score for entry in store.top()], [500])
+
+    def test_reads_while_the_writer_appends(self):
+        """Test that top() on the caller's thread never disturbs the background writer"""
+        store = HighScoreStore(self.path, capacity=500, compact_every=50)
+        for score in range(300):
+            store.submit(HighScore(score, 0, 1, 0.0, None))
+        while not store._queue.empty():
+            store.top()
+        store.close()
+
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + 300 * RECORD.size)
+        with HighScoreStore(self.path, capacity=500) as store:
+            self.assertEqual(sorted(entry.score for entry in store.top(500)), list(range(300)))
+
+    def test_other_stores_see_new_scores(self):
+        """Test that a store picks up scores appended through another handle"""
+        with HighScoreStore(self.path) as first, HighScoreStore(self.path) as second:
+            first.add(HighScore(300, 0, 1, 0.0, None))
+            self.assertEqual(second.top()[0].score, 300)
+
+    def test_concurrent_appends_from_processes(self):
+        """Test that appends from several processes neither interleave nor get lost"""
+        HighScoreStore(self.path).close()
+        workers = [multiprocessing.Process(target=append_scores,
+                                           args=(self.path, 1000 * i, 100))
+                   for i in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        with HighScoreStore(self.path, capacity=1000) as store:
+            scores = sorted(entry.score for entry in store.top(1000))
+        self.assertEqual(scores, sorted(1000 * i + n for i in range(4) for n in range(100)))
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + 400 * RECORD.size)
+
+    def test_larger_capacity_ignores_smaller_checkpoint(self):
+        """Test that a checkpoint with fewer than K scores triggers a full scan"""
+        with HighScoreStore(self.path, capacity=1) as store:
+            for score in [10, 20]:
+                store.add(HighScore(score, 0, 1, 0.0, None))
+        with HighScoreStore(self.path, capacity=5) as store:
+            self.assertEqual([entry.score for entry in store.top()], [20, 10])
+
+    def test_torn_record_is_cut_off_on_open(self):
+        """Test that a partial record left by a crashed writer is removed"""
+        with HighScoreStore(self.path) as store:
+            store.add(HighScore(100, 0, 1, 0.0, None))
+        with open(self.path, 'ab') as log:
+            log.write(pack_record(HighScore(900, 0, 1, 0.0, None))[:RECORD.size // 2])
+
+        with HighScoreStore(self.path) as store:
+            self.assertEqual(os.path.getsize(self.path), HEADER.size + RECORD.size)
+            store.add(HighScore(200, 0, 1, 0.0, 7))
+        with HighScoreStore(self.path) as store:
+            self.assertEqual(store.top(), [HighScore(200, 0, 1, 0.0, 7),
+                                           HighScore(100, 0, 1, 0.0, None)])
+
+    def test_append_after_torn_record_stays_aligned(self):
+        """Test that a record torn while a store is open doesn't shift later appends"""
+        with HighScoreStore(self.path) as store:
+            with open(self.path, 'ab') as log:
+                log.write(b'\x01' * 5)
+            store.add(HighScore(300, 0, 1, 0.0, None))
+            self.assertEqual([entry.score for entry in store.top()], [300])
+        self.assertEqual(os.path.getsize(self.path), HEADER.size + RECORD.size)
+
+    def test_rejects_foreign_files(self):
+        """Test that a file that isn't a score log is refused"""
+        with open(self.path, 'wb') as other:
+            other.write(b'not a score file')
+        with self.assertRaises(ValueError):
+            HighScoreStore(self.path)
+
+    def test_format_scores(self):
+        """Test the text table"""
+        text = format_scores([HighScore(1200, 4, 2, 0.0, 42), HighScore(40, 1, 1, 0.0, None)])
+        lines = text.splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertIn("1200", lines[1])
+        self.assertTrue(lines[2].endswith("-"))
+
+
+if __name__ == '__main__':
+    unittest.main()
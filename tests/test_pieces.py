@@ -0,0 +1,90 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.game import Game
+from tetris.pieces import (SHAPES, PieceQueue, BagRandomizer, NESRandomizer,
+                           make_randomizer)
+from tetris.rng import SplitMix64
+
+
+def draw_many(randomizer, count, seed=0):
+    queue = PieceQueue(SplitMix64(seed), randomizer)
+    return [queue.pop() for _ in range(count)]
+
+
+class TestRandomizers(unittest.TestCase):
+
+    def test_uniform_matches_plain_choice(self):
+        """Test that the uniform randomizer draws exactly like rng.choice"""
+        rng = SplitMix64(11)
+        expected = [rng.choice(SHAPES) for _ in range(50)]
+        self.assertEqual(draw_many(make_randomizer('uniform'), 50, seed=11), expected)
+
+    def test_bag_deals_every_shape_once_per_seven(self):
+        """Test that each run of seven pieces holds all seven shapes"""
+        pieces = draw_many(BagRandomizer(), 70)
+        for start in range(0, 70, 7):
+            self.assertEqual(sorted(pieces[start:start + 7]), sorted(SHAPES))
+
+    def test_nes_rerolls_repeats(self):
+        """Test that the NES randomizer repeats shapes far less than 1 in 7"""
+        pieces = draw_many(NESRandomizer(), 7000)
+        repeats = sum(a == b for a, b in zip(pieces, pieces[1:]))
+        self.assertLess(repeats / len(pieces), 0.08)
+        self.assertEqual(set(pieces), set(SHAPES))
+
+    def test_unknown_randomizer(self):
+        with self.assertRaises(ValueError):
+            make_randomizer('tgm')
+
+
+class TestPieceQueue(unittest.TestCase):
+
+    def test_preview_moves_up_as_pieces_are_taken(self):
+        """Test the ring buffer's order across several wrap-arounds"""
+        queue = PieceQueue(SplitMix64(3), size=5)
+        expected = list(queue.preview())
+        for _ in range(12):
+            self.assertEqual(queue.pop(), expected.pop(0))
+            expected.append(queue.peek(4))
+            self.assertEqual(list(queue.preview()), expected)
+        self.assertEqual(queue.peek(), expected[0])
+
+    def test_game_preview_and_sequence(self):
+        """Test that a longer preview shows what comes next without changing it"""
+        short = Game(rng=SplitMix64(9))
+        long = Game(rng=SplitMix64(9), preview=5)
+        upcoming = long.pieces.preview()
+
+        self.assertEqual(upcoming[0], long.next_piece.shape_name)
+        for expected in upcoming[:4]:
+            short.hard_drop()
+            long.hard_drop()
+            self.assertEqual(long.current_piece.shape_name, expected)
+            self.assertEqual(short.current_piece.shape_name, expected)
+
+    def test_snapshot_keeps_the_queue(self):
+        """Test that restoring a snapshot replays the same upcoming pieces"""
+        game = Game(rng=SplitMix64(4), randomizer=BagRandomizer(), preview=3)
+        game.hard_drop()
+        state = game.snapshot()
+        first = []
+        for _ in range(5):
+            game.hard_drop()
+            first.append(game.current_piece.shape_name)
+
+        game.restore(state)
+        second = []
+        for _ in range(5):
+            game.hard_drop()
+            second.append(game.current_piece.shape_name)
+
+        self.assertEqual(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main()
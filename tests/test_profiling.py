@@ -0,0 +1,205 @@
+import unittest
+from unittest import mock
+import curses
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.game import Game
+from tetris.profiling import Histogram, LatencyProbe, Profiler
+from tetris.tetromino import Tetromino
+from tetris.timing import FrameClock
+
+
+class TestHistogram(unittest.TestCase):
+
+    def test_percentiles_within_bucket_width(self):
+        """Test that percentiles land within 25% of the true value"""
+        histogram = Histogram()
+        for micros in range(1, 1001):
+            histogram.add(micros / 1e6)
+
+        self.assertEqual(histogram.count, 1000)
+        self.assertAlmostEqual(histogram.percentile(50) * 1e6, 500, delta=125)
+        self.assertAlmostEqual(histogram.percentile(99) * 1e6, 990, delta=250)
+        self.assertLessEqual(histogram.percentile(100), histogram.max)
+
+    def test_empty_histogram(self):
+        """Test that an empty histogram reports zeros"""
+        histogram = Histogram()
+        self.assertEqual(histogram.percentile(99), 0.0)
+        self.assertEqual(histogram.mean(), 0.0)
+
+    def test_huge_durations_are_capped(self):
+        """Test that very long durations go into the last bucket"""
+        histogram = Histogram()
+        histogram.add(3600.0)
+        self.assertEqual(histogram.buckets[-1], 1)
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_attach_times_game_sections(self):
+        """Test that attached games record each timed call"""
+        game = Game()
+        profiler = Profiler()
+        profiler.attach(game)
+
+        game.update()
+        game.hard_drop()  # Locks the piece
+
+        self.assertIs(game.profiler, profiler)
+        self.assertEqual(profiler.histograms['update'].count, 1)
+        self.assertEqual(profiler.histograms['_lock_piece'].count, 1)
+        self.assertIn("lock", profiler.overlay_line())
+        self.assertIn("_lock_piece", profiler.report())
+
+    def test_nested_sections_are_not_counted_twice(self):
+        """Test that a section's time leaves out the timed sections it calls"""
+        clock = FakeClock()
+
+        class NestedGame:
+            def handle_input(self):
+                clock.now += 1.0
+                self.update()
+
+            def update(self):
+                clock.now += 2.0
+                self._lock_piece()
+
+            def render(self):
+                pass
+
+            def _lock_piece(self):
+                clock.now += 4.0
+
+        game = NestedGame()
+        profiler = Profiler()
+        with mock.patch('tetris.profiling.time.perf_counter', clock):
+            profiler.attach(game)
+        game.handle_input()
+
+        totals = {name: histogram.total for name, histogram in profiler.histograms.items()}
+        self.assertEqual(totals, {'handle_input': 1.0, 'update': 2.0,
+                                  'render': 0.0, '_lock_piece': 4.0})
+
+    def test_disabled_by_default(self):
+        """Test that games are not instrumented unless asked"""
+        game = Game()
+        self.assertIsNone(game.profiler)
+        self.assertNotIn('render', vars(game))
+
+
+class FakeClock:
+    """Clock that only moves when told to"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TimedWindow:
+    """Fake curses window: keys arrive interval apart (100 ms) and every redraw takes 4 ms"""
+
+    def __init__(self, keys, clock, interval=0.1):
+        self.keys = list(keys)
+        self.clock = clock
+        self.interval = interval
+
+    def timeout(self, ms):
+        pass
+
+    def getch(self):
+        self.clock.now += self.interval
+        return self.keys.pop(0) if self.keys else ord('q')
+
+    def getmaxyx(self):
+        return 40, 80
+
+    def addstr(self, y, x, text, attributes=0):
+        pass
+
+    def clear(self):
+        pass
+
+    def noutrefresh(self):
+        self.clock.now += 0.004
+
+
+class TestLatencyProbe(unittest.TestCase):
+
+    def test_counts_latency_drops_and_coalescing(self):
+        """Test the bookkeeping of keys between flushes"""
+        clock = FakeClock()
+        probe = LatencyProbe(clock)
+        probe.input_applied(0.0, True)
+        probe.input_applied(0.01, True)
+        probe.input_applied(0.02, False)
+        clock.now = 0.03
+        probe.flushed()
+        probe.flushed()  # Nothing pending: no samples
+
+        self.assertEqual((probe.inputs, probe.dropped, probe.coalesced), (3, 1, 1))
+        self.assertEqual(probe.latency.count, 2)
+        self.assertAlmostEqual(probe.latency.max, 0.03)
+        self.assertAlmostEqual(probe.rates()['inputs'], 100.0)
+        self.assertIn("Dropped: 1", probe.report())
+        self.assertIn("p99", probe.overlay_line())
+
+    def test_autorepeats_wait_for_the_auto_shift(self):
+        """Test that a held key's repeats are timed to the shift that shows them"""
+        clock = FakeClock()
+        probe = LatencyProbe(clock)
+        probe.input_applied(0.0, False, deferred=True)
+        probe.input_applied(0.01, False, deferred=True)
+        probe.shift_landed()
+        probe.input_applied(0.02, False, deferred=True)
+        clock.now = 0.05
+        probe.flushed()
+        probe.shift_released()
+
+        self.assertEqual((probe.inputs, probe.dropped, probe.coalesced), (3, 1, 1))
+        self.assertAlmostEqual(probe.latency.max, 0.05)
+
+    @mock.patch('tetris.renderer.curses.doupdate')
+    def test_held_key_is_measured(self, doupdate):
+        """Test that autorepeats absorbed by auto shift get samples, not drops"""
+        clock = FakeClock()
+        game = Game()
+        game.frame_clock = FrameClock(clock=clock)
+        clock.now = 0.5 / 60  # Keys arrive mid-frame
+        game.gravity_frames = 10 ** 6
+        game.current_piece = Tetromino('O')
+        probe = LatencyProbe(clock)
+        probe.attach(game)
+        # Terminal autorepeat every 2 frames: frames 2, 4, ..., 24
+        game.stdscr = TimedWindow([curses.KEY_LEFT] * 12, clock, interval=2 / 60)
+
+        game.run()
+
+        # The tap at frame 2, seven repeats shown by the shift at frame 18
+        # and three by the one at frame 24; the last waits for a shift
+        self.assertEqual((probe.inputs, probe.dropped), (12, 0))
+        self.assertEqual(probe.latency.count, 11)
+
+    @mock.patch('tetris.renderer.curses.doupdate')
+    def test_measures_the_game_loop(self, doupdate):
+        """Test that keys are timed from getch() to the flushed frame"""
+        clock = FakeClock()
+        game = Game()
+        game.frame_clock = FrameClock(clock=clock)
+        game.current_piece = Tetromino('O')
+        probe = LatencyProbe(clock)
+        probe.attach(game)
+        # Four moves to the wall, one blocked move, one key that isn't bound
+        game.stdscr = TimedWindow([curses.KEY_LEFT] * 5 + [ord('x')], clock)
+
+        game.run()
+
+        self.assertEqual((probe.inputs, probe.dropped), (5, 1))
+        self.assertEqual(probe.latency.count, 4)
+        self.assertAlmostEqual(probe.latency.mean(), 0.004)
@@ -0,0 +1,166 @@
+import unittest
+from unittest import mock
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.game import Game
+from tetris.tetromino import Tetromino
+from tetris.renderer import CursesRenderer, AnsiRenderer
+from tetris.rng import SplitMix64
+
+
+class FakeWindow:
+    """Minimal stand-in for a curses window that remembers what was drawn"""
+
+    def __init__(self, height=40, width=80):
+        self.height = height
+        self.width = width
+        self.screen = [[" "] * width for _ in range(height)]
+        self.calls = 0
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def clear(self):
+        self.screen = [[" "] * self.width for _ in range(self.height)]
+
+    def addstr(self, y, x, text, attributes=0):
+        self.calls += 1
+        self.screen[y][x:x + len(text)] = list(text)
+
+    def noutrefresh(self):
+        pass
+
+    def line(self, y):
+        return "".join(self.screen[y]).rstrip()
+
+
+@mock.patch('tetris.renderer.curses.doupdate')
+class TestCursesRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.game = Game()
+        self.game.current_piece = Tetromino('O')
+        self.window = FakeWindow()
+        self.renderer = CursesRenderer(self.window)
+
+    def test_first_frame_draws_board(self, doupdate):
+        """Test that the first frame draws header, piece and score"""
+        self.renderer.render(self.game)
+
+        self.assertTrue(self.window.line(0).startswith("TETRIS"))
+        # O-piece blocks are at columns 4-5 of rows 1-2
+        self.assertEqual(self.window.line(3), " |        [][]        |")
+        self.assertEqual(self.window.line(24), "Score:0 Level:1 Lines:0")
+        doupdate.assert_called_once()
+
+    def test_unchanged_frame_writes_nothing(self, doupdate):
+        """Test that redrawing the same state makes no curses writes"""
+        self.renderer.render(self.game)
+        calls = self.window.calls
+
+        self.renderer.render(self.game)
+        self.assertEqual(self.window.calls, calls)
+
+    def test_move_rewrites_only_changed_rows(self, doupdate):
+        """Test that moving the piece touches just the rows it covers"""
+        self.renderer.render(self.game)
+        calls = self.window.calls
+
+        self.game.move_left()
+        self.renderer.render(self.game)
+
+        # O-piece spans 2 rows, plus 2 rows of its landing preview
+        self.assertEqual(self.window.calls - calls, 4)
+        self.assertEqual(self.window.line(3), " |      [][]          |")
+
+    def test_screen_matches_full_redraw(self, doupdate):
+        """Test that incremental frames end up identical to a fresh draw"""
+        for action in ['rotate', 'left', 'hard_drop', 'right', 'drop', 'hard_drop']:
+            self.game.apply_action(action)
+            self.renderer.render(self.game)
+
+        fresh = FakeWindow()
+        CursesRenderer(fresh).render(self.game)
+        self.assertEqual(self.window.screen, fresh.screen)
+
+    def test_ghost_piece_marks_landing_row(self, doupdate):
+        """Test that the landing position of the piece is previewed"""
+        self.renderer.render(self.game)
+
+        # O-piece lands on the floor: rows 18-19 are screen rows 20-21
+        self.assertEqual(self.window.line(20), " |        ::::        |")
+        self.assertEqual(self.window.line(21), " |        ::::        |")
+
+
+class CountingStream:
+    """Text stream that records every write"""
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+    def flush(self):
+        pass
+
+
+class TestAnsiRenderer(unittest.TestCase):
+
+    def setUp(self):
+        self.game = Game(rng=SplitMix64(5))
+        self.stream = CountingStream()
+        self.renderer = AnsiRenderer(self.stream)
+
+    def test_one_write_per_frame(self):
+        """Test that a full frame goes out in a single write with piece colours"""
+        self.renderer.render(self.game)
+
+        self.assertEqual(len(self.stream.writes), 1)
+        frame = self.stream.writes[0]
+        self.assertTrue(frame.startswith("\033[2J\033[H"))
+        self.assertIn(f"\033[{self.game.current_piece.color}m", frame)
+        self.assertIn(f"Next Piece: {self.game.next_piece.shape_name}", frame)
+
+    def test_only_changed_lines_are_sent(self):
+        """Test that a one-row drop rewrites just the rows it touched"""
+        self.renderer.render(self.game)
+        self.renderer.render(self.game)
+        self.assertEqual(len(self.stream.writes), 1)  # Nothing changed
+
+        self.game.current_piece = Tetromino('O')
+        self.renderer.render(self.game)
+        self.game.drop()
+        self.renderer.render(self.game)
+
+        delta = self.stream.writes[-1]
+        # O piece rows 1-2 move to 2-3: board rows 1 and 3 change
+        self.assertEqual(delta.count("\033[K"), 2)
+        self.assertLess(len(delta), len(self.stream.writes[0]) / 3)
+
+    def test_full_redraw_without_diff(self):
+        """Test that diff=False repaints the whole screen every frame"""
+        renderer = AnsiRenderer(self.stream, diff=False)
+        renderer.render(self.game)
+        self.game.move_left()
+        renderer.render(self.game)
+
+        self.assertEqual(len(self.stream.writes), 2)
+        self.assertTrue(self.stream.writes[1].startswith("\033[2J\033[H"))
+
+    def test_lines_show_board_and_piece(self):
+        """Test the text layout: borders, piece blocks and stats"""
+        self.game.board.grid[19][0] = 31
+        lines = self.renderer.build_lines(self.game)
+        board_lines = lines[4:24]
+
+        self.assertEqual(lines[3], "+" + "-" * 20 + "+")
+        self.assertTrue(board_lines[19].startswith("|\033[31m██\033[0m  "))
+        piece_rows = set(y for _, y in self.game.current_piece.blocks)
+        for y in range(20):
+            self.assertEqual("██" in board_lines[y], y in piece_rows or y == 19)
+        self.assertIn(f"Score: {self.game.score}", lines)
@@ -0,0 +1,77 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.sim import Simulation, make_policy
+from tetris.replay import (ReplayRecorder, load_replay, play_headless,
+                           encode_varint, decode_varint)
+
+
+class TestReplay(unittest.TestCase):
+
+    def record_game(self, seed, policy_name, max_ticks=5000):
+        """Play a headless game with a recorder attached"""
+        sim = Simulation(seed)
+        recorder = ReplayRecorder(seed, clock=lambda: sim.tick)
+        sim.game.recorder = recorder
+        policy = make_policy(policy_name, seed)
+        while sim.tick < max_ticks and sim.step(policy(sim.game)):
+            pass
+        return sim.game, recorder
+
+    def test_varint_round_trip(self):
+        """Test that varints decode to the values that were encoded"""
+        data = bytearray()
+        values = [0, 1, 127, 128, 300, 2 ** 40]
+        for value in values:
+            encode_varint(value, data)
+
+        pos = 0
+        decoded = []
+        while pos < len(data):
+            value, pos = decode_varint(data, pos)
+            decoded.append(value)
+        self.assertEqual(decoded, values)
+
+    def test_replay_reproduces_game(self):
+        """Test that playing a replay back gives the same final game"""
+        game, recorder = self.record_game(12, 'greedy')
+        replayed = play_headless(load_replay(recorder.to_bytes()))
+
+        self.assertGreater(game.lines_cleared, 0)
+        self.assertEqual(replayed.score, game.score)
+        self.assertEqual(replayed.lines_cleared, game.lines_cleared)
+        self.assertEqual(replayed.pieces_placed, game.pieces_placed)
+        self.assertEqual(replayed.board.grid, game.board.grid)
+
+    def test_replay_is_compact(self):
+        """Test that events take little more than one byte each"""
+        _, recorder = self.record_game(3, 'random', max_ticks=2000)
+        data = recorder.to_bytes()
+        self.assertLessEqual(len(data), 8 + recorder.event_count * 2)
+
+    def test_negative_seed_and_ticks(self):
+        """Test that the seed and event ticks survive the round trip"""
+        ticks = iter([0, 5, 5, 300])
+        recorder = ReplayRecorder(-42, clock=lambda: next(ticks))
+        for action in ['left', 'gravity', 'rotate', 'hard_drop']:
+            recorder.record(action)
+
+        replay = load_replay(recorder.to_bytes())
+        self.assertEqual(replay.seed, -42)
+        self.assertEqual(replay.events, [(0, 'left'), (5, 'gravity'), (5, 'rotate'), (300, 'hard_drop')])
+
+    def test_reads_20hz_version_2_files(self):
+        """Test that replays recorded before the 60 Hz frame clock keep their pace"""
+        data = b'TTRP' + bytes([2, 14]) + bytes([5 << 3 | 5, 10 << 3 | 4])
+        replay = load_replay(data)
+        self.assertEqual(replay.seed, 7)
+        self.assertEqual(replay.events, [(15, 'gravity'), (45, 'hard_drop')])
+
+    def test_rejects_other_files(self):
+        """Test that random bytes are not accepted as a replay"""
+        with self.assertRaises(ValueError):
+            load_replay(b'not a replay')
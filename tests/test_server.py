@@ -0,0 +1,180 @@
+import unittest
+import asyncio
+import shutil
+import sys
+import os
+import tempfile
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.game import Game
+from tetris.highscores import HighScoreStore
+from tetris.rng import SplitMix64
+from tetris.server import (MAX_WRITE_BUFFER, GameClient, GameServer, Session,
+                           decode_state, encode_state)
+
+
+class FakeTransport:
+    """Transport with a settable amount of unsent data"""
+
+    def __init__(self):
+        self.buffered = 0
+
+    def get_write_buffer_size(self):
+        return self.buffered
+
+
+class FakeWriter:
+    """StreamWriter stand-in that keeps the lines written to it"""
+
+    def __init__(self):
+        self.transport = FakeTransport()
+        self.lines = []
+
+    def write(self, data):
+        self.lines.append(data.decode('ascii').strip())
+
+    def close(self):
+        pass
+
+
+class TestGameServer(unittest.TestCase):
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+
+    def run_with_server(self, scenario, speed=1.0, scores=None):
+        """Start a server on a free port, run scenario(server, port), close it"""
+        async def main():
+            server = GameServer(seed=5, speed=speed, scores=scores)
+            await server.start(port=0)
+            try:
+                return await scenario(server, server.address()[1])
+            finally:
+                server.close()
+                await server.wait_closed()
+        return self.loop.run_until_complete(asyncio.wait_for(main(), 10))
+
+    def test_state_round_trip(self):
+        """Test that a state line decodes back to the game it describes"""
+        game = Game(rng=SplitMix64(3))
+        game.hard_drop()
+        state = decode_state(encode_state(game))
+
+        self.assertEqual(state.rows, tuple(game.board.rows))
+        self.assertEqual((state.piece, state.x, state.y, state.pieces),
+                         (game.current_piece.shape_name, game.current_piece.x,
+                          game.current_piece.y, 1))
+
+    def test_actions_match_local_game(self):
+        """Test that a remote session plays exactly like a local game with its seed"""
+        actions = ['left', 'rotate', 'hard_drop', 'right', 'right', 'hard_drop', 'drop']
+
+        async def scenario(server, port):
+            client = await GameClient.connect(port=port)
+            await client.read_state()
+            states = []
+            for action in actions:
+                client.send(action)
+                states.append(await client.read_state())
+            client.close()
+            return client.seed, states
+
+        seed, states = self.run_with_server(scenario)
+
+        game = Game(rng=SplitMix64(seed))
+        for action, state in zip(actions, states):
+            game.apply_action(action)
+            self.assertEqual(state, decode_state(encode_state(game)))
+
+    def test_gravity_runs_on_a_timer(self):
+        """Test that pieces fall without any input from the player"""
+        async def scenario(server, port):
+            client = await GameClient.connect(port=port)
+            first = await client.read_state()
+            second = await client.read_state()
+            client.close()
+            return first, second
+
+        first, second = self.run_with_server(scenario, speed=100.0)
+        self.assertEqual(second.y, first.y + 1)
+
+    def test_many_concurrent_sessions(self):
+        """Test that one loop serves many players at once"""
+        async def scenario(server, port):
+            clients = await asyncio.gather(
+                *(GameClient.connect(port=port) for _ in range(100)))
+            self.assertEqual(len(server.sessions), 100)
+            for client in clients:
+                client.send('hard_drop')
+            pieces = []
+            for client in clients:
+                await client.read_state()  # Initial state
+                pieces.append((await client.read_state()).pieces)
+                client.close()
+            return clients, pieces
+
+        clients, pieces = self.run_with_server(scenario)
+        self.assertEqual(len({client.session_id for client in clients}), 100)
+        self.assertEqual(pieces, [1] * 100)
+
+    def test_unknown_command_and_quit(self):
+        """Test that bad commands are reported and quit ends the session"""
+        async def scenario(server, port):
+            client = await GameClient.connect(port=port)
+            await client.read_state()
+            client.send('teleport')
+            error = await client.read_message()
+            client.send('quit')
+            closed = await client.read_message()
+            return error, closed
+
+        error, closed = self.run_with_server(scenario)
+        self.assertEqual(error[0], 'error')
+        self.assertEqual(closed, (None, None))
+
+
+    def test_slow_reader_skips_gravity_states(self):
+        """Test that gravity stops queueing states while the player's buffer is full"""
+        writer = FakeWriter()
+        session = Session(1, 7, writer, self.loop)
+        self.addCleanup(session.stop)
+
+        writer.transport.buffered = MAX_WRITE_BUFFER + 1
+        session._on_gravity()
+        self.assertEqual((writer.lines, session.skipped_states), ([], 1))
+
+        writer.transport.buffered = 0
+        session._on_gravity()
+        self.assertEqual(len(writer.lines), 1)
+        self.assertEqual(decode_state(writer.lines[0]).y, session.game.current_piece.y)
+
+    def test_finished_games_are_recorded(self):
+        """Test that a session's final score goes to the high-score store"""
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        scores = HighScoreStore(os.path.join(directory, 'scores'))
+
+        async def scenario(server, port):
+            client = await GameClient.connect(port=port)
+            while True:
+                kind, payload = await client.read_message()
+                if kind == 'over':
+                    return client.seed, int(payload[0])
+                if kind == 'state':
+                    client.send('hard_drop')
+
+        seed, score = self.run_with_server(scenario, scores=scores)
+        scores.close()
+        self.assertEqual([(entry.score, entry.seed) for entry in scores.top()],
+                         [(score, seed)])
+
+
+if __name__ == '__main__':
+    unittest.main()
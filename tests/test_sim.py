@@ -0,0 +1,50 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.sim import Simulation, simulate, make_policy
+
+
+class TestSimulation(unittest.TestCase):
+
+    def test_same_seed_same_game(self):
+        """Test that a seed and policy always replay to the same result"""
+        first = simulate(7, policy=make_policy('random', 7))
+        second = simulate(7, policy=make_policy('random', 7))
+        self.assertEqual(first, second)
+
+    def test_seed_controls_piece_sequence(self):
+        """Test that the piece sequence only depends on the seed"""
+        pieces = []
+        for _ in range(2):
+            sim = Simulation(seed=3)
+            sequence = []
+            for _ in range(5):
+                sequence.append(sim.game.current_piece.shape_name)
+                sim.step('hard_drop')
+            pieces.append(sequence)
+        self.assertEqual(pieces[0], pieces[1])
+
+    def test_gravity_runs_on_ticks(self):
+        """Test that pieces fall once per gravity period without input"""
+        sim = Simulation(seed=1)
+        start_y = sim.game.current_piece.y
+        for _ in range(sim.game.gravity_frames):
+            sim.step()
+        self.assertEqual(sim.game.current_piece.y, start_y + 1)
+
+    def test_idle_game_ends(self):
+        """Test that a game without input tops out and reports its result"""
+        result = simulate(11)
+        self.assertGreater(result.pieces, 0)
+        self.assertEqual(result.score, 0)
+        self.assertEqual(result.level, 1)
+
+    def test_action_stream(self):
+        """Test that actions are applied one per tick"""
+        result = simulate(5, actions=['hard_drop'] * 3, max_ticks=3)
+        self.assertEqual(result.pieces, 3)
+        self.assertEqual(result.ticks, 3)
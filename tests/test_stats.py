@@ -0,0 +1,97 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.sim import Simulation, make_policy, simulate
+from tetris.stats import GameStats, Sketch, StatsAggregator
+
+
+def count_holes(board):
+    """Empty cells with a filled cell somewhere above them, counted cell by cell"""
+    holes = 0
+    for x in range(board.width):
+        covered = False
+        for y in range(board.height):
+            if board.grid[y][x]:
+                covered = True
+            elif covered:
+                holes += 1
+    return holes
+
+
+class TestGameStats(unittest.TestCase):
+
+    def test_hooks_record_every_piece_and_clear(self):
+        """Test that the lock and clear hooks see every event of a game"""
+        sim = Simulation(seed=12)
+        stats = GameStats(clock=lambda: sim.tick)
+        stats.attach(sim.game)
+        policy = make_policy('greedy')
+        holes = []
+        running = True
+        while running and sim.tick < 5000:
+            running = sim.step(policy(sim.game))
+            if stats.holes.count > len(holes):
+                holes.append(count_holes(sim.game.board))
+
+        game = sim.game
+        self.assertEqual(stats.piece_count(), game.pieces_placed)
+        self.assertEqual(sum(size * n for size, n in enumerate(stats.clears)),
+                         game.lines_cleared)
+        self.assertGreater(game.lines_cleared, 0)
+        self.assertEqual(stats.holes.total, sum(holes))
+        self.assertEqual(stats.ticks_per_piece.total, stats._last_lock)
+
+    def test_sketch_quantiles_and_merge(self):
+        """Test that quantiles are within the bucket width and merging adds up"""
+        left, right, both = Sketch(), Sketch(), Sketch()
+        for value in range(1, 1001):
+            (left if value % 2 else right).add(value)
+            both.add(value)
+        left.merge(right)
+
+        self.assertEqual(left.buckets, both.buckets)
+        self.assertEqual((left.count, left.total, left.max), (1000, 500500, 1000))
+        for percent in (50, 90, 99):
+            exact = percent * 10
+            self.assertGreaterEqual(both.quantile(percent), exact)
+            self.assertLessEqual(both.quantile(percent), exact * 1.25)
+
+
+class TestStatsAggregator(unittest.TestCase):
+
+    def test_memory_does_not_grow_with_games(self):
+        """Test that aggregating more games keeps the same fixed-size state"""
+        stats = StatsAggregator()
+        for seed in range(3):
+            simulate(seed, policy=make_policy('random', seed), max_ticks=600, stats=stats)
+        sizes = [len(getattr(stats, name).buckets) for name in ('score', 'holes')]
+        for seed in range(3, 20):
+            simulate(seed, policy=make_policy('random', seed), max_ticks=600, stats=stats)
+
+        self.assertEqual(stats.games, 20)
+        self.assertEqual([len(getattr(stats, name).buckets) for name in ('score', 'holes')],
+                         sizes)
+
+    def test_merge_matches_single_run(self):
+        """Test that aggregators from separate workers merge into the combined result"""
+        single, first, second = StatsAggregator(), StatsAggregator(), StatsAggregator()
+        most_lines = 0
+        for seed in range(6):
+            result = simulate(seed, policy=make_policy('greedy'), max_ticks=1500, stats=single)
+            most_lines = max(most_lines, result.lines)
+            simulate(seed, policy=make_policy('greedy'), max_ticks=1500,
+                     stats=first if seed < 3 else second)
+        first.merge(second)
+
+        self.assertEqual(first.summary(), single.summary())
+        self.assertEqual(single.summary()['lines']['max'], most_lines)
+        self.assertGreater(most_lines, 0)
+        self.assertIn("Tetris rate", single.report())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -85,3 +85,41 @@ class TestTetromino(unittest.TestCase):
                 self.assertEqual(len(final_blocks), 4)
                 # After 4 rotations, should be back to original
                 self.assertEqual(final_blocks, original_blocks)
+
+
+    def test_rotation_table_matches_matrix_rotation(self):
+        """Test that the precomputed states equal rotating the config matrix"""
+        for shape_name, shape in TETROMINOS.items():
+            with self.subTest(shape=shape_name):
+                tetromino = Tetromino(shape_name)
+                matrix = [list(row) for row in shape]
+                for _ in range(4):
+                    self.assertEqual([list(row) for row in tetromino.shape], matrix)
+                    tetromino.rotate_clockwise()
+                    matrix = [list(reversed(row)) for row in zip(*matrix)]
+
+
+    def test_counter_clockwise_undoes_clockwise(self):
+        """Test that counter-clockwise rotation restores the previous state"""
+        tetromino = Tetromino('L')
+        original_blocks = tetromino.blocks
+
+        tetromino.rotate_clockwise()
+        tetromino.rotate_counter_clockwise()
+
+        self.assertEqual(tetromino.rotation, 0)
+        self.assertEqual(tetromino.blocks, original_blocks)
+
+
+    def test_reset_reuses_the_object(self):
+        """Test that reset turns a moved piece into a fresh piece of another shape"""
+        tetromino = Tetromino('L')
+        tetromino.rotate_clockwise()
+        tetromino.x, tetromino.y = 7, 12
+
+        tetromino.reset('S')
+
+        self.assertEqual(tetromino.blocks, Tetromino('S').blocks)
+        self.assertEqual((tetromino.shape_name, tetromino.color),
+                         ('S', Tetromino('S').color))
+        self.assertFalse(hasattr(tetromino, '__dict__'))
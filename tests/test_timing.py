@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.config import GRAVITY_FRAMES
+from tetris.timing import AutoShift, FrameClock, frames_per_row
+
+
+def run_keys(autoshift, events, last_frame):
+    """Feed key event frames to an AutoShift and return the frames that shifted"""
+    events = set(events)
+    shifts = []
+    for frame in range(last_frame + 1):
+        # Like the game loop: the frame runs, then the key read in it
+        if autoshift.tick(frame):
+            shifts.append(frame)
+        if frame in events and autoshift.press('left', frame):
+            shifts.append(frame)
+    return shifts
+
+
+class TestFramesPerRow(unittest.TestCase):
+
+    def test_level_table(self):
+        """Test that levels map onto the NES gravity table"""
+        self.assertEqual(frames_per_row(1), 48)
+        self.assertEqual(frames_per_row(10), 6)
+        self.assertEqual(frames_per_row(len(GRAVITY_FRAMES)), 1)
+        self.assertEqual(frames_per_row(99), 1)
+
+    def test_speed_never_decreases(self):
+        """Test that every level is at least as fast as the one before"""
+        self.assertEqual(list(GRAVITY_FRAMES), sorted(GRAVITY_FRAMES, reverse=True))
+
+
+class TestFrameClock(unittest.TestCase):
+
+    def test_frames_from_a_fixed_start(self):
+        """Test that frame numbers and deadlines come from the start time"""
+        now = [100.0]
+        clock = FrameClock(clock=lambda: now[0])
+        self.assertEqual(clock.now(), 0)
+        now[0] = 101.01
+        self.assertEqual(clock.now(), 60)
+        self.assertAlmostEqual(clock.seconds_until(61), 1 / 60 - 0.01)
+
+
+class TestAutoShift(unittest.TestCase):
+
+    def test_single_press(self):
+        """Test that a press without repeats moves once"""
+        self.assertEqual(run_keys(AutoShift(), [0], 100), [0])
+
+    def test_fast_autorepeat(self):
+        """Test that a held key repeats at DAS then ARR, whatever the terminal's rate"""
+        repeats = range(0, 60, 2)
+        self.assertEqual(run_keys(AutoShift(), repeats, 80), [0, 16, 22, 28, 34, 40, 46, 52, 58])
+
+    def test_terminal_autorepeat_delay(self):
+        """Test that a late first repeat (the terminal's delay) moves like a tap, then DAS runs from it"""
+        # First repeat after 30 frames (500 ms), then every 2 frames
+        events = [0] + list(range(30, 50, 2))
+        self.assertEqual(run_keys(AutoShift(), events, 60), [0, 30, 46, 52])
+
+    def test_separate_taps(self):
+        """Test that taps further apart than the release time each move once"""
+        self.assertEqual(run_keys(AutoShift(), [0, 8, 20, 60], 100), [0, 8, 20, 60])
+
+    def test_taps_never_auto_shift(self):
+        """Test that taps a few hundred milliseconds apart move once each, never repeat"""
+        for gap in (18, 21, 30, 36, 42):
+            with self.subTest(gap=gap):
+                self.assertEqual(run_keys(AutoShift(), [0, gap], 100), [0, gap])
+
+    def test_double_tap_after_das(self):
+        """Test that a second tap later than DAS moves exactly once more"""
+        self.assertEqual(run_keys(AutoShift(), [0, 30], 100), [0, 30])
+
+    def test_direction_change(self):
+        """Test that pressing the other direction starts a new press"""
+        autoshift = AutoShift()
+        self.assertTrue(autoshift.press('left', 0))
+        self.assertTrue(autoshift.press('right', 1))
+        self.assertEqual(autoshift.direction, 'right')
+
+
+if __name__ == '__main__':
+    unittest.main()
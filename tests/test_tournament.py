@@ -0,0 +1,35 @@
+import unittest
+import io
+import json
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.sim import simulate, make_policy
+from tetris.tournament import play_game, make_tasks, run_tournament, ResultWriter, FIELDS
+
+
+class TestTournament(unittest.TestCase):
+
+    def test_worker_matches_simulation(self):
+        """Test that a worker result equals playing the game directly"""
+        row = play_game((4, 'greedy', 2000))
+        result = simulate(4, policy=make_policy('greedy', 4), max_ticks=2000)
+
+        self.assertEqual(set(row), set(FIELDS))
+        self.assertEqual((row['score'], row['lines'], row['pieces']),
+                         (result.score, result.lines, result.pieces))
+
+    def test_streams_one_row_per_game(self):
+        """Test that every seed/policy pair is written exactly once"""
+        stream = io.StringIO()
+        tasks = make_tasks(range(3), ['idle', 'random'], 500)
+
+        games, _ = run_tournament(tasks, workers=2, writer=ResultWriter(stream, 'jsonl'))
+
+        rows = [json.loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(games, 6)
+        self.assertEqual(sorted((r['policy'], r['seed']) for r in rows),
+                         sorted((policy, seed) for seed, policy, _ in tasks))
@@ -0,0 +1,60 @@
+import unittest
+import sys
+import os
+
+# Add the src directory to the Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from tetris.board import Board
+from tetris.transposition import TranspositionTable
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_hits_and_misses_are_counted(self):
+        """Test that lookups update the hit/miss counters"""
+        table = TranspositionTable()
+        key = TranspositionTable.make_key(Board(), 'T', 'I')
+
+        self.assertIsNone(table.get(key))
+        table.put(key, 42)
+        self.assertEqual(table.get(key), 42)
+        self.assertEqual(table.stats()['hits'], 1)
+        self.assertEqual(table.stats()['misses'], 1)
+        self.assertEqual(table.stats()['hit_rate'], 0.5)
+
+    def test_key_follows_grid_edits(self):
+        """Test that cells written through board.grid change the key"""
+        table = TranspositionTable()
+        board = Board()
+        table.put(TranspositionTable.make_key(board, 'T', 'I'), 'empty')
+        board.grid[19][0] = 1
+
+        key = TranspositionTable.make_key(board, 'T', 'I')
+        self.assertIsNone(table.get(key))
+        table.put(key, 'one cell')
+        self.assertEqual(table.get(TranspositionTable.make_key(board, 'T', 'I')), 'one cell')
+
+    def test_memory_cap_evicts_least_recently_used(self):
+        """Test that the table never grows past its capacity"""
+        table = TranspositionTable(max_bytes=3 * 100, entry_bytes=100)
+        for key in 'abc':
+            table.put(key, key)
+        table.get('a')  # 'b' is now the oldest
+        table.put('d', 'd')
+
+        self.assertEqual(len(table), 3)
+        self.assertNotIn('b', table)
+        self.assertIn('a', table)
+        self.assertEqual(table.evictions, 1)
+
+    def test_deeper_results_are_kept(self):
+        """Test depth-preferred replacement and minimum-depth lookups"""
+        table = TranspositionTable()
+        table.put('k', 'deep', depth=3)
+        table.put('k', 'shallow', depth=1)
+
+        self.assertEqual(table.get('k'), 'deep')
+        self.assertEqual(table.get('k', min_depth=4), None)
+        table.put('k', 'deeper', depth=4)
+        self.assertEqual(table.get('k', min_depth=4), 'deeper')